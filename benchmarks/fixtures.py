@@ -0,0 +1,208 @@
+'''Synthetic v3 payloads shaped like recorded ESPN responses
+
+``make_league(teams)`` returns every view a League requests, keyed like
+tests/test_league_v3.json, for a league of any even size.
+'''
+import random
+
+from espnff.boxCodes import nflTeams
+
+
+ROSTER = [(1, 0, [0, 7, 20, 21]),
+          (2, 2, [2, 3, 23, 20, 21]),
+          (2, 2, [2, 3, 23, 20, 21]),
+          (3, 4, [3, 4, 23, 20, 21]),
+          (3, 4, [3, 4, 23, 20, 21]),
+          (4, 6, [5, 6, 23, 20, 21]),
+          (2, 23, [2, 3, 23, 20, 21]),
+          (16, 16, [16, 20, 21]),
+          (5, 17, [17, 20, 21])]
+BENCH = [(1, [0, 7, 20, 21]), (2, [2, 3, 23, 20, 21]), (3, [3, 4, 23, 20, 21]),
+         (4, [5, 6, 23, 20, 21]), (2, [2, 3, 23, 20, 21]), (3, [3, 4, 23, 20, 21]),
+         (16, [16, 20, 21])]
+LINEUP_SLOT_COUNTS = {'0': 1, '2': 2, '4': 2, '6': 1, '16': 1, '17': 1, '20': 7, '21': 1, '23': 1}
+SCORING_ITEMS = [{'statId': 3, 'points': 0.04, 'pointsOverrides': {}},
+                 {'statId': 4, 'points': 4.0},
+                 {'statId': 20, 'points': -2.0},
+                 {'statId': 24, 'points': 0.1},
+                 {'statId': 25, 'points': 6.0},
+                 {'statId': 42, 'points': 0.1},
+                 {'statId': 43, 'points': 6.0},
+                 {'statId': 53, 'points': 1.0, 'pointsOverrides': {'16': 2.0}}]
+PRO_TEAMS = sorted(team for team in nflTeams if team > 0)
+KICKOFF = 1536500000000
+WEEK_MS = 604800000
+
+
+def make_league(teams=8, weeks=13, free_agents=300, year=2018, league_id=1, seed=0):
+    '''Returns {view: payload} for a league of ``teams`` teams
+
+    Weeks 1 to ``weeks`` have boxscores; the last one is still in progress.
+    '''
+    if teams % 2:
+        raise ValueError('teams must be even')
+    rng = random.Random(seed)
+    rosters, players = _players(teams, free_agents, rng)
+    schedule = _round_robin(teams, weeks)
+    boxscores, scores = _boxscores(schedule, rosters, weeks, year, rng)
+    return {'mTeam': _league(teams, weeks, year, league_id),
+            'players_wl': players,
+            'proTeamSchedules': _pro_teams(weeks),
+            'mBoxscore': {'id': league_id, 'seasonId': year, 'scoringPeriodId': weeks,
+                          'schedule': boxscores},
+            'mDraftDetail': _draft(rosters),
+            'kona_playercard': _transactions(teams, players[-free_agents:], weeks, rng),
+            'mSettings': _settings(teams, weeks, year, league_id),
+            'mMatchupScore': {'id': league_id, 'seasonId': year, 'scoringPeriodId': weeks,
+                              'schedule': scores}}
+
+
+def _league(teams, weeks, year, league_id):
+    members = []
+    league_teams = []
+    for i in range(1, teams + 1):
+        member = '{MEMBER-%d}' % (i, )
+        members.append({'id': member, 'firstName': 'Owner', 'lastName': str(i),
+                        'displayName': 'owner%d' % (i, )})
+        league_teams.append({'id': i, 'abbrev': 'T%d' % (i, ), 'location': 'Team',
+                             'nickname': str(i), 'owners': [member], 'waiverRank': i,
+                             'transactionCounter': {'acquisitionBudgetSpent': i,
+                                                    'trades': i % 3,
+                                                    'matchupAcquisitionTotals': {'1': i % 4}}})
+    return {'id': league_id, 'seasonId': year, 'scoringPeriodId': weeks,
+            'members': members, 'teams': league_teams}
+
+
+def _players(teams, free_agents, rng):
+    players = []
+    rosters = {}
+
+    def player(position, slots):
+        player_id = 1000 + len(players)
+        players.append({'id': player_id, 'fullName': "Player O'%d" % (player_id, ),
+                        'defaultPositionId': position, 'proTeamId': PRO_TEAMS[player_id % len(PRO_TEAMS)],
+                        'eligibleSlots': slots})
+        return players[-1]
+
+    for team in range(1, teams + 1):
+        rosters[team] = ([(player(position, slots), slot) for position, slot, slots in ROSTER] +
+                         [(player(position, slots), 20) for position, slots in BENCH])
+    for i in range(free_agents):
+        position, slots = BENCH[i % len(BENCH)]
+        player(position, slots)
+    return rosters, players
+
+
+def _pro_teams(weeks):
+    pro_teams = []
+    for i, team in enumerate(PRO_TEAMS):
+        games = {}
+        for week in range(1, weeks + 1):
+            games[str(week)] = [{'id': week * 100 + team,
+                                 'date': KICKOFF + (week - 1) * WEEK_MS + (team % 3) * 10800000,
+                                 'homeProTeamId': team, 'awayProTeamId': PRO_TEAMS[(i + 1) % len(PRO_TEAMS)],
+                                 'scoringPeriodId': week}]
+        pro_teams.append({'id': team, 'abbrev': 'P%d' % (team, ), 'byeWeek': 4 + team % 10,
+                          'proGamesByScoringPeriod': games})
+    pro_teams.append({'id': 0, 'abbrev': 'FA', 'byeWeek': 0})
+    return {'settings': {'proTeams': pro_teams}}
+
+
+def _round_robin(teams, weeks):
+    '''Returns {week: [(home, away), ...]} using the circle method'''
+    order = list(range(1, teams + 1))
+    schedule = {}
+    for week in range(1, weeks + 1):
+        schedule[week] = [(order[i], order[-1 - i]) for i in range(teams // 2)]
+        order = [order[0], order[-1]] + order[1:-1]
+    return schedule
+
+
+def _stats(week, year, points, rng):
+    return [{'scoringPeriodId': week, 'seasonId': year, 'statSourceId': 0, 'statSplitTypeId': 1,
+             'appliedTotal': points,
+             'stats': {'3': round(points * 10, 1), '24': round(points * 3, 1),
+                       '42': round(points * 2, 1), '53': float(rng.randint(0, 4))}},
+            {'scoringPeriodId': week, 'seasonId': year, 'statSourceId': 1, 'statSplitTypeId': 1,
+             'appliedTotal': round(points * 0.9, 2),
+             'stats': {'3': round(points * 9, 1), '24': round(points * 2.5, 1)}},
+            {'scoringPeriodId': 0, 'seasonId': year, 'statSourceId': 0, 'statSplitTypeId': 0,
+             'appliedTotal': round(points * week, 2),
+             'stats': {'3': round(points * 10 * week, 1), '24': round(points * 3 * week, 1)}}]
+
+
+def _side(team, roster, week, year, rng):
+    entries = []
+    for player, slot in roster:
+        points = round(rng.uniform(0, 25), 2)
+        entries.append({'lineupSlotId': slot, 'playerId': player['id'],
+                        'playerPoolEntry': {'appliedStatTotal': points, 'player': dict(
+                            player, injuryStatus='ACTIVE', stats=_stats(week, year, points, rng))}})
+    total = round(sum(e['playerPoolEntry']['appliedStatTotal'] for e in entries
+                      if e['lineupSlotId'] != 20), 2)
+    return {'teamId': team, 'totalPoints': total,
+            'rosterForCurrentScoringPeriod': {'appliedStatTotal': total, 'entries': entries}}
+
+
+def _boxscores(schedule, rosters, weeks, year, rng):
+    boxscores = []
+    scores = []
+    for week in sorted(schedule):
+        for home, away in schedule[week]:
+            matchup = {'id': len(boxscores) + 1, 'matchupPeriodId': week,
+                       'home': _side(home, rosters[home], week, year, rng),
+                       'away': _side(away, rosters[away], week, year, rng)}
+            if week == weeks:
+                matchup['winner'] = 'UNDECIDED'
+            elif matchup['home']['totalPoints'] >= matchup['away']['totalPoints']:
+                matchup['winner'] = 'HOME'
+            else:
+                matchup['winner'] = 'AWAY'
+            boxscores.append(matchup)
+            scores.append({'id': matchup['id'], 'matchupPeriodId': week, 'winner': matchup['winner'],
+                           'home': {'teamId': home, 'totalPoints': matchup['home']['totalPoints']},
+                           'away': {'teamId': away, 'totalPoints': matchup['away']['totalPoints']}})
+    return boxscores, scores
+
+
+def _draft(rosters):
+    picks = []
+    rounds = len(ROSTER) + len(BENCH)
+    teams = sorted(rosters)
+    for round_id in range(1, rounds + 1):
+        order = teams if round_id % 2 else teams[::-1]
+        for team in order:
+            picks.append({'roundId': round_id, 'overallPickNumber': len(picks) + 1, 'teamId': team,
+                          'playerId': rosters[team][round_id - 1][0]['id']})
+    return {'draftDetail': {'drafted': True, 'picks': picks}}
+
+
+def _transactions(teams, free_agents, weeks, rng):
+    players = []
+    for i, player in enumerate(free_agents[:teams * weeks]):
+        team = i % teams + 1
+        players.append({'player': {'id': player['id'], 'fullName': player['fullName'],
+                                   'proTeamId': player['proTeamId']},
+                        'transactions': [{'id': 'tran-%d' % (i, ), 'bidAmount': rng.randint(0, 20),
+                                          'scoringPeriodId': i % weeks + 1, 'status': 'EXECUTED',
+                                          'subOrder': 0, 'type': 'WAIVER', 'teamId': team,
+                                          'proposedDate': KICKOFF + i * 3600000,
+                                          'items': [{'fromTeamId': 0, 'toTeamId': team,
+                                                     'overallPickNumber': 0,
+                                                     'playerId': player['id'], 'type': 'ADD'}]}]})
+    return {'players': players}
+
+
+def _settings(teams, weeks, year, league_id):
+    return {'id': league_id, 'seasonId': year, 'scoringPeriodId': weeks,
+            'status': {'currentMatchupPeriod': weeks, 'isActive': True, 'latestScoringPeriod': weeks},
+            'settings': {'name': 'Benchmark League', 'size': teams,
+                         'draftSettings': {'keeperCount': 0},
+                         'tradeSettings': {'deadlineDate': KICKOFF + 9 * WEEK_MS, 'vetoVotesRequired': 2},
+                         'rosterSettings': {'isUsingUndroppableList': True,
+                                            'lineupSlotCounts': LINEUP_SLOT_COUNTS},
+                         'scheduleSettings': {'matchupPeriodCount': weeks,
+                                              'playoffTeamCount': min(6, teams // 2),
+                                              'playoffSeedingRule': 'TOTAL_POINTS_SCORED'},
+                         'scoringSettings': {'matchupTieRule': 'NONE', 'playoffMatchupTieRule': 'NONE',
+                                             'scoringItems': SCORING_ITEMS}}}
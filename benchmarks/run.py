@@ -0,0 +1,209 @@
+'''Offline benchmarks of League against a local stub server
+
+    python -m benchmarks.run --teams 8 16 32 --output results.json
+    python -m benchmarks.run --teams 8 --compare results.json
+
+Payloads come from benchmarks.fixtures and are served over HTTP by
+tests.stub_server, so the numbers include the socket, JSON decoding and
+record building but not ESPN's latency.
+'''
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from espnff.league import League
+from espnff.rankings import np
+from espnff.registry import player_registry, pro_team_registry
+from espnff.transport import Transport
+from espnff.utils import two_step_dominance
+from benchmarks.fixtures import make_league
+from tests.stub_server import StubServer
+
+
+YEAR = 2018
+LEAGUE_ID = 1
+SEASON_PATH = '/apis/v3/games/ffl/seasons/%d/' % (YEAR, )
+LEAGUE_PATH = SEASON_PATH + 'segments/0/leagues/%d' % (LEAGUE_ID, )
+
+
+def serve(data):
+    '''Builds a StubServer answering every view a League requests'''
+    server = StubServer()
+    server.route(SEASON_PATH + 'players', 'players_wl', data['players_wl'])
+    server.route(SEASON_PATH, 'proTeamSchedules', data['proTeamSchedules'])
+    for view in ('mTeam', 'mDraftDetail', 'mSettings', 'mMatchupScore'):
+        server.route(LEAGUE_PATH, view, data[view])
+
+    def boxscore(query, headers):
+        '''Serves one matchup period, like ESPN does'''
+        week = int(query['matchupPeriodId'][0])
+        schedule = [m for m in data['mBoxscore']['schedule'] if m['matchupPeriodId'] == week]
+        return dict(data['mBoxscore'], schedule=schedule)
+
+    def transactions(query, headers):
+        filters = json.loads(headers['x-fantasy-filter'])['players']
+        players = data['kona_playercard']['players']
+        return {'players': players[filters['offset']:filters['offset'] + filters['limit']]}
+
+    server.route(LEAGUE_PATH, 'mBoxscore', boxscore)
+    server.route(LEAGUE_PATH, 'kona_playercard', transactions)
+    return server
+
+
+def stub_league(server):
+    '''Returns a League class whose endpoints point at the stub server'''
+    base = server.url + '/apis/v3/games/ffl/seasons/%d/'
+    return type('StubLeague', (League, ), {'ENDPOINT': base + 'segments/0/leagues/%d',
+                                           'PLAYER_ENDPOINT': base + 'players',
+                                           'TEAM_ENDPOINT': base})
+
+
+def percentile(values, p):
+    '''Nearest-rank percentile of a list of values'''
+    values = sorted(values)
+    index = max(0, min(len(values) - 1, int(round(p / 100.0 * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+def measure(func, iterations):
+    '''Times func() iterations times, then traces one more call for its peak memory'''
+    func()
+    latencies = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'iterations': iterations,
+            'throughput': iterations / sum(latencies),
+            'mean': sum(latencies) / iterations,
+            'p50': percentile(latencies, 50),
+            'p90': percentile(latencies, 90),
+            'p99': percentile(latencies, 99),
+            'max': max(latencies),
+            'peakMemory': peak}
+
+
+def benchmarks(league_class, transport, data, path):
+    '''Returns {name: callable} for one league size; path is used for a snapshot'''
+    def cold_league():
+        player_registry.clear()
+        pro_team_registry.clear()
+        return league_class(LEAGUE_ID, YEAR, transport=transport)
+
+    def restore():
+        player_registry.clear()
+        pro_team_registry.clear()
+        return league_class.from_snapshot(path, transport=transport)
+
+    league = cold_league()
+    weeks = range(1, league.current_week + 1)
+    league.snapshot(path)
+    teams = sorted(team['teamId'] for team in league.teams.records() if team['teamId'] != 99)
+    wins = [[0] * len(teams) for team in teams]
+    for matchup in data['mMatchupScore']['schedule']:
+        if matchup['winner'] != 'UNDECIDED':
+            home, away = matchup['home']['teamId'] - 1, matchup['away']['teamId'] - 1
+            winner, loser = (home, away) if matchup['winner'] == 'HOME' else (away, home)
+            wins[winner][loser] += 1
+
+    cases = {
+        'league_cold': cold_league,
+        'league_warm': lambda: league_class(LEAGUE_ID, YEAR, transport=transport),
+        'league_snapshot': restore,
+        'boxscores_week': lambda: [league.boxscores(week) for week in weeks],
+        'boxscores_week_lean': lambda: [league.boxscores(week, lean=True) for week in weeks],
+        'draft': league.draftData,
+        'transactions': league.transactions,
+        'two_step_dominance_py': lambda: two_step_dominance(wins),
+    }
+    if np is not None:
+        cases['power_rankings'] = lambda: league.analytics().power_rankings().rank(teams)
+    return cases
+
+
+def run(sizes, iterations, only=None):
+    results = {}
+    for size in sizes:
+        data = make_league(size, year=YEAR, league_id=LEAGUE_ID)
+        transport = Transport()
+        directory = tempfile.mkdtemp()
+        with serve(data) as server:
+            cases = benchmarks(stub_league(server), transport, data, os.path.join(directory, 'league.snap'))
+            results[str(size)] = {}
+            for name in sorted(cases):
+                if only and name not in only:
+                    continue
+                results[str(size)][name] = measure(cases[name], iterations)
+                print('%3d teams  %-22s p50 %8.2f ms  p99 %8.2f ms  %8.1f/s  peak %7.1f KiB' % (
+                    size, name, results[str(size)][name]['p50'] * 1000,
+                    results[str(size)][name]['p99'] * 1000, results[str(size)][name]['throughput'],
+                    results[str(size)][name]['peakMemory'] / 1024.0))
+        transport.close()
+        shutil.rmtree(directory)
+    player_registry.clear()
+    pro_team_registry.clear()
+    return results
+
+
+def compare(baseline, results, threshold):
+    '''Prints p50 and peak memory ratios against a baseline; returns the regressions'''
+    regressions = []
+    for size, cases in sorted(results.items(), key=lambda item: int(item[0])):
+        for name, current in sorted(cases.items()):
+            old = baseline.get('results', {}).get(size, {}).get(name)
+            if old is None:
+                continue
+            time_ratio = current['p50'] / old['p50'] if old['p50'] else float('inf')
+            memory_ratio = current['peakMemory'] / float(old['peakMemory']) if old['peakMemory'] else 1.0
+            flag = ''
+            if time_ratio > threshold or memory_ratio > threshold:
+                flag = '  REGRESSION'
+                regressions.append((size, name))
+            print('%3s teams  %-22s p50 x%.2f  peak x%.2f%s' % (size, name, time_ratio, memory_ratio, flag))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--teams', type=int, nargs='+', default=[8, 16, 32])
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--only', nargs='+', help='benchmark names to run')
+    parser.add_argument('--output', help='write results to this JSON file')
+    parser.add_argument('--label', default='', help='stored with the results, e.g. a version')
+    parser.add_argument('--compare', help='baseline results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help='ratio over the baseline counted as a regression')
+    args = parser.parse_args(argv)
+
+    results = run(args.teams, args.iterations, args.only)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'meta': {'label': args.label,
+                                'created': datetime.utcnow().isoformat(),
+                                'python': platform.python_version(),
+                                'platform': platform.platform(),
+                                'iterations': args.iterations},
+                       'results': results}, f, indent=1, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(baseline, results, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,21 +1,49 @@
 __all__ = ['ESPNFF',
+           'AsyncESPNFF',
            'League',
+           'AsyncLeague',
            'Team',
            'Settings',
            'Matchup',
+           'Player',
+           'RosterEntry',
+           'StatLine',
+           'Transport',
+           'ResponseCache',
+           'RateLimiter',
+           'Stats',
+           'ScoringEngine',
+           'SeasonAnalytics',
+           'LeagueStore',
+           'LiveScoreboard',
+           'Query',
+           'PlayerFilter',
            'ESPNFFException',
            'PrivateLeagueException',
            'InvalidLeagueException',
-           'UnknownLeagueException'
+           'UnknownLeagueException',
+           'SnapshotException'
            ]
 
 from .league import League
-from .client import ESPNFF
+from .async_league import AsyncLeague
+from .client import ESPNFF, AsyncESPNFF
 from .team import Team
 from .settings import Settings
 from .matchup import Matchup
+from .player import Player, RosterEntry, StatLine
+from .transport import Transport
+from .cache import ResponseCache
+from .ratelimit import RateLimiter
+from .stats import Stats
+from .scoring import ScoringEngine
+from .analytics import SeasonAnalytics
+from .store import LeagueStore
+from .live import LiveScoreboard
+from .query import Query, PlayerFilter
 from .exception import (ESPNFFException,
                         PrivateLeagueException,
                         InvalidLeagueException,
-                        UnknownLeagueException, )
+                        UnknownLeagueException,
+                        SnapshotException, )
 from .boxCodes import *
@@ -0,0 +1,89 @@
+from .rankings import PowerRankings, np, _require_numpy
+
+
+class SeasonAnalytics(object):
+    '''All-play, head-to-head, margin of victory and luck for a season
+
+    ``scores`` is a (weeks, teams) array of points and ``opponents`` a
+    (weeks, teams) array holding the column of each team's opponent, or -1
+    for a bye. Running totals are kept so ``add_week`` only does the work
+    of the new week.
+    '''
+    def __init__(self, teams, scores=(), opponents=()):
+        _require_numpy()
+        self.teams = list(teams)
+        n = len(self.teams)
+        self.weeks = 0
+        self._scores = []
+        self._opponents = []
+        self._wins = []
+        self.all_play_wins = np.zeros(n)
+        self.all_play_ties = np.zeros(n)
+        self.all_play_games = 0
+        self.win_matrix = np.zeros((n, n))
+        self.games = np.zeros(n)
+        for week_scores, week_opponents in zip(scores, opponents):
+            self.add_week(week_scores, week_opponents)
+
+    def __repr__(self):
+        return 'SeasonAnalytics(%s weeks, %s teams)' % (self.weeks, len(self.teams), )
+
+    def add_week(self, scores, opponents):
+        '''Adds one week of scores and opponents to the running totals'''
+        scores = np.asarray(scores, dtype=float)
+        opponents = np.asarray(opponents, dtype=int)
+        n = len(self.teams)
+
+        # all-play: every team against every other team's score this week
+        beats = scores[:, None] > scores[None, :]
+        ties = scores[:, None] == scores[None, :]
+        self.all_play_wins += beats.sum(axis=1)
+        self.all_play_ties += ties.sum(axis=1) - 1
+        self.all_play_games += n - 1
+
+        wins = np.zeros((n, n))
+        played = np.flatnonzero(opponents >= 0)
+        wins[played, opponents[played]] = scores[played] > scores[opponents[played]]
+        self.win_matrix += wins
+        self.games[played] += 1
+
+        self.weeks += 1
+        self._scores.append(scores)
+        self._opponents.append(opponents)
+        self._wins.append(wins)
+
+    @property
+    def scores(self):
+        '''(weeks, teams) array of points'''
+        return np.array(self._scores).reshape(self.weeks, len(self.teams))
+
+    def mov(self):
+        '''(weeks, teams) margin of victory; 0 on a bye'''
+        scores = self.scores
+        opponents = np.array(self._opponents, dtype=int).reshape(self.weeks, len(self.teams))
+        opponent_scores = np.take_along_axis(scores, np.maximum(opponents, 0), axis=1)
+        return np.where(opponents >= 0, scores - opponent_scores, 0.0)
+
+    def weekly_wins(self):
+        '''(weeks, teams, teams) head-to-head wins of each week'''
+        return np.array(self._wins).reshape(self.weeks, len(self.teams), len(self.teams))
+
+    def all_play(self):
+        '''Returns {team: (wins, losses, ties)} against every team every week'''
+        losses = self.all_play_games - self.all_play_wins - self.all_play_ties
+        return {team: (float(w), float(l), float(t)) for team, w, l, t in
+                zip(self.teams, self.all_play_wins, losses, self.all_play_ties)}
+
+    def all_play_pct(self):
+        '''All-play winning percentage of each team, ties counting half'''
+        if not self.all_play_games:
+            return np.zeros(len(self.teams))
+        return (self.all_play_wins + self.all_play_ties * 0.5) / self.all_play_games
+
+    def luck(self):
+        '''Actual wins minus the wins expected from the all-play percentage'''
+        return self.win_matrix.sum(axis=1) - self.all_play_pct() * self.games
+
+    def power_rankings(self):
+        '''PowerRankings over the weeks added so far'''
+        return PowerRankings(self.weekly_wins(), self.scores, self.mov())
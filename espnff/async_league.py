@@ -0,0 +1,199 @@
+import asyncio
+import time
+
+from . import lineup
+from .backfill import AsyncBackfill
+from .league import League, _lean, _newer, _newest_first, _response_data
+from .settings import Settings
+from .query import Query
+from .scoring import ScoringEngine
+from .transport import get_async_transport
+
+
+class AsyncLeague(League):
+    '''Creates a League instance whose requests are awaited concurrently
+
+    Build one with ``await AsyncLeague.create(league_id, year)``. Every
+    public League method that makes requests is a coroutine or an async
+    generator here.
+    '''
+    def __init__(self, league_id, year, espn_s2=None, swid=None, transport=None,
+                 stream_players=False, hooks=None, stats=None, keep_boxscores=False):
+        if transport is None:
+            transport = get_async_transport()
+        self._setup(league_id, year, espn_s2, swid, transport, stream_players, hooks, stats,
+                    keep_boxscores)
+
+    def __repr__(self):
+        return 'AsyncLeague(%s, %s)' % (self.league_id, self.year, )
+
+    @classmethod
+    async def create(cls, league_id, year, espn_s2=None, swid=None, transport=None,
+                     stream_players=False, hooks=None, stats=None, keep_boxscores=False):
+        '''Creates and loads an AsyncLeague'''
+        league = cls(league_id, year, espn_s2, swid, transport, stream_players, hooks, stats,
+                     keep_boxscores)
+        await league.load()
+        return league
+
+    @classmethod
+    async def from_snapshot(cls, path, espn_s2=None, swid=None, transport=None, mmap=False,
+                            max_age=None, hooks=None, stats=None, keep_boxscores=None):
+        '''Restores an AsyncLeague saved by ``snapshot``; see League.from_snapshot'''
+        if transport is None:
+            transport = get_async_transport()
+        league = cls._restore(path, espn_s2, swid, transport, mmap, hooks, stats, keep_boxscores)
+        if max_age is not None:
+            await league.refresh(max_age=max_age)
+        return league
+
+    async def load(self):
+        '''Fetches league, players and pro teams at the same time
+
+        Players and pro teams are downloaded once per season, however many
+        leagues of the season load at once.
+        '''
+        r, self.nflTeams, self.players = await asyncio.gather(
+            self._get_league_view(Query('mTeam')),
+            self.pro_team_registry.get_async(self.year, self._load_teams),
+            self.player_registry.get_async(self.year, self._load_players))
+        self._timed(self._parse_league, r)
+        now = time.time()
+        self.fetched.update(league=now, players=now, nflTeams=now)
+
+    async def _load_players(self):
+        r = await self._get_players()
+        return await self.transport.run(self._timed, self._parse_players, r)
+
+    async def _load_teams(self):
+        return self._timed(self._parse_teams, await self._get_teams())
+
+    async def refresh_players(self):
+        players = await self._load_players()
+        self.players = self.player_registry.refresh(self.year, lambda: players)
+        self.fetched['players'] = time.time()
+
+    async def refresh(self, sections=None, max_age=3600):
+        if sections is None:
+            sections = self.stale_sections(max_age)
+        if 'league' in sections:
+            self._timed(self._parse_league, await self._get_league_view(Query('mTeam')))
+            self.fetched['league'] = time.time()
+        if 'players' in sections:
+            await self.refresh_players()
+        if 'nflTeams' in sections:
+            nflTeams = await self._load_teams()
+            self.nflTeams = self.pro_team_registry.refresh(self.year, lambda: nflTeams)
+            self.fetched['nflTeams'] = time.time()
+        if 'settings' in sections:
+            await self.fetch_settings()
+        if 'boxscores' in sections:
+            await asyncio.gather(*[self.boxscores(week) for week, (final, boxscores)
+                                   in sorted(self.boxscore_cache.items()) if not final])
+        return list(sections)
+
+    async def transactions(self):
+        return _newest_first([tranData async for tranData in self.iter_transactions()])
+
+    async def iter_transactions(self, since=None, page_size=50):
+        offset = 0
+        while True:
+            r = await self._get_league_view(self._transactions_query(offset, page_size))
+            transList, count = self._timed(self._parse_transactions, r)
+            newer = _newer(transList, since)
+            for tranData in newer:
+                yield tranData
+            if count < page_size or (transList and not newer):
+                return
+            offset += page_size
+
+    async def boxscore(self, week, team, lean=False, stats=None):
+        r = await self._get_league_view(self._boxscore_query(week, team), self._week_ttl(week))
+        return self._timed(self._parse_boxscore, r, week, team, _lean(week, lean, stats))
+
+    async def boxscores(self, week, lean=False, stats=None):
+        lean = _lean(week, lean, stats)
+        kept = self._kept_boxscores(week, lean)
+        if kept is not None:
+            return kept
+        r = await self._get_league_view(self._boxscore_query(week), self._week_ttl(week))
+        return self._keep(week, lean, self._timed(self._parse_boxscores, r, week, lean))
+
+    async def season_boxscores(self, start_week, end_week, lean=False, stats=None):
+        weeks = range(start_week, end_week + 1)
+        results = await asyncio.gather(*[self.boxscores(week, lean, stats) for week in weeks])
+        return dict(zip(weeks, results))
+
+    @property
+    def settings(self):
+        '''League settings, once fetch_settings() has been awaited'''
+        return self._settings
+
+    async def fetch_settings(self):
+        r = await self._get_league_view(Query('mSettings'))
+        self._settings = Settings(self._timed(_response_data, r))
+        self.fetched['settings'] = time.time()
+        return self._settings
+
+    async def scoring_engine(self):
+        if self._settings is None:
+            await self.fetch_settings()
+        return ScoringEngine.from_settings(self._settings)
+
+    async def lineup_efficiency(self, start_week=1, end_week=None):
+        if end_week is None:
+            end_week = self.current_week or 1
+        if self._settings is None:
+            await self.fetch_settings()
+        boxscores = await self.season_boxscores(start_week, end_week, lean=True)
+        return lineup.season_efficiency(boxscores, self._settings.roster_slots)
+
+    async def playoff_odds(self, n_sims=10000, processes=None, seed=None):
+        if self._settings is None:
+            await self.fetch_settings()
+        r = await self._get_league_view(Query('mMatchupScore'))
+        return await self.transport.run(self._timed, self._playoff_odds, r, n_sims, processes, seed)
+
+    async def analytics(self, end_week=None):
+        if end_week is None and self._settings is None:
+            await self.fetch_settings()
+        r = await self._get_league_view(Query('mMatchupScore'))
+        return self._timed(self._analytics, r, end_week)
+
+    async def fetch(self, query, ttl=None):
+        r = await self._get_league_view(query, ttl)
+        return self._timed(_response_data, r)
+
+    async def draftData(self):
+        r = await self._get_league_view(Query('mDraftDetail'), self._season_ttl())
+        return self._timed(self._parse_draft, r)
+
+    def backfill(self, weeks=None, include=('boxscore', 'draft', 'transactions'),
+                 max_workers=8, host_limit=4, progress=None):
+        '''Fetches historical data concurrently; read the results with ``async for``'''
+        engine = AsyncBackfill(max_workers, host_limit, progress)
+        self.backfill_tasks(engine, weeks, include)
+        return engine.run()
+
+    def backfill_tasks(self, engine, weeks=None, include=('boxscore', 'draft', 'transactions')):
+        '''Queues this league's backfill fetches on an AsyncBackfill engine'''
+        if not isinstance(engine, AsyncBackfill):
+            raise TypeError('AsyncLeague.backfill_tasks() needs an AsyncBackfill engine')
+        League.backfill_tasks(self, engine, weeks, include)
+
+    async def freeAgents(self, week=None, position=None, status=('FREEAGENT', 'WAIVERS'),
+                         sort='percentOwned', limit=25):
+        return [player async for player in self.iter_free_agents(week, position, status, sort, limit)]
+
+    async def iter_free_agents(self, week=None, position=None, status=('FREEAGENT', 'WAIVERS'),
+                               sort='percentOwned', limit=None, page_size=50):
+        offset = 0
+        while limit is None or offset < limit:
+            size = page_size if limit is None else min(page_size, limit - offset)
+            r = await self._get_league_view(self._free_agent_query(week, position, status, sort, offset, size))
+            players = self._timed(_response_data, r)['players']
+            for player in players:
+                yield self._free_agent(player)
+            if len(players) < size:
+                return
+            offset += size
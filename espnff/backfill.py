@@ -0,0 +1,130 @@
+import asyncio
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+BackfillResult = namedtuple('BackfillResult', ['key', 'result', 'error'])
+
+
+class Backfill(object):
+    '''Runs fetch tasks on a bounded thread pool
+
+    ``host_limit`` caps how many tasks hit the same host at once, and
+    ``progress(done, total, result)`` is called as each task finishes.
+    '''
+    def __init__(self, max_workers=8, host_limit=4, progress=None):
+        self.max_workers = max_workers
+        self.host_limit = host_limit
+        self.progress = progress
+        self.done = 0
+        self.total = 0
+        self._queue = []
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def __repr__(self):
+        return 'Backfill(%s/%s)' % (self.done, self.total, )
+
+    def add(self, key, host, func, *args):
+        '''Queues func(*args) under key; tasks may be added while running'''
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = threading.BoundedSemaphore(self.host_limit)
+            self._queue.append((key, host, func, args))
+            self.total += 1
+
+    def _call(self, key, host, func, args):
+        with self._hosts[host]:
+            try:
+                return BackfillResult(key, func(*args), None)
+            except Exception as e:
+                return BackfillResult(key, None, e)
+
+    def _submit(self, executor):
+        with self._lock:
+            queued, self._queue = self._queue, []
+        return set(executor.submit(self._call, *task) for task in queued)
+
+    def run(self):
+        '''Yields a BackfillResult for each task as it completes
+
+        Tasks that have not started are cancelled when the caller stops
+        early, so only the ones already running are waited for.
+        '''
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = self._submit(executor)
+            try:
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        result = future.result()
+                        self.done += 1
+                        if self.progress is not None:
+                            self.progress(self.done, self.total, result)
+                        yield result
+                    pending |= self._submit(executor)
+            finally:
+                for future in pending:
+                    future.cancel()
+
+
+class AsyncBackfill(object):
+    '''Runs coroutine fetch tasks on the running event loop
+
+    Like Backfill, but ``func(*args)`` returns an awaitable and results
+    are read with ``async for result in engine.run()``. At most
+    ``max_workers`` tasks run at once and ``host_limit`` per host.
+    '''
+    def __init__(self, max_workers=8, host_limit=4, progress=None):
+        self.max_workers = max_workers
+        self.host_limit = host_limit
+        self.progress = progress
+        self.done = 0
+        self.total = 0
+        self._queue = []
+        self._hosts = {}
+        self._workers = None
+
+    def __repr__(self):
+        return 'AsyncBackfill(%s/%s)' % (self.done, self.total, )
+
+    def add(self, key, host, func, *args):
+        '''Queues func(*args) under key; tasks may be added while running'''
+        self._queue.append((key, host, func, args))
+        self.total += 1
+
+    async def _call(self, key, host, func, args):
+        async with self._workers, self._hosts[host]:
+            try:
+                return BackfillResult(key, await func(*args), None)
+            except Exception as e:
+                return BackfillResult(key, None, e)
+
+    def _submit(self):
+        queued, self._queue = self._queue, []
+        tasks = set()
+        for key, host, func, args in queued:
+            # semaphores are made here, inside the loop that awaits them
+            if host not in self._hosts:
+                self._hosts[host] = asyncio.Semaphore(self.host_limit)
+            tasks.add(asyncio.ensure_future(self._call(key, host, func, args)))
+        return tasks
+
+    async def run(self):
+        '''Yields a BackfillResult for each task as it completes'''
+        self._workers = asyncio.Semaphore(self.max_workers)
+        pending = self._submit()
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    self.done += 1
+                    if self.progress is not None:
+                        self.progress(self.done, self.total, result)
+                    yield result
+                pending |= self._submit()
+        finally:
+            for task in pending:
+                task.cancel()
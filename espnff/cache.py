@@ -0,0 +1,126 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+PERMANENT = -1
+
+
+class ResponseCache(object):
+    '''SQLite-backed cache of successful GET responses
+
+    Entries are keyed by url, query params, the ``x-fantasy-filter``
+    header and the request cookies, so a private league's body is only
+    served to callers sending the same credentials. An entry stored with ``ttl=PERMANENT`` never expires; any
+    other entry is revalidated with ETag/Last-Modified once it is stale.
+    '''
+    def __init__(self, path=':memory:', ttl=300):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('''CREATE TABLE IF NOT EXISTS responses (
+                                key TEXT PRIMARY KEY,
+                                url TEXT,
+                                body BLOB,
+                                content_type TEXT,
+                                etag TEXT,
+                                last_modified TEXT,
+                                expires REAL)''')
+        self._db.commit()
+
+    def __repr__(self):
+        return 'ResponseCache(%s)' % (self.path, )
+
+    def key(self, url, params=None, headers=None, cookies=None):
+        '''Returns the cache key of a request'''
+        prepared = requests.Request('GET', url, params=sorted((params or {}).items())).prepare()
+        fantasy_filter = (headers or {}).get('x-fantasy-filter')
+        cookies = sorted(dict(cookies or {}).items())
+        return hashlib.sha1(json.dumps([prepared.url, fantasy_filter, cookies]).encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        '''Returns a stored entry or None'''
+        with self._lock:
+            row = self._db.execute('SELECT url, body, content_type, etag, last_modified, expires '
+                                   'FROM responses WHERE key = ?', (key, )).fetchone()
+        if row is None:
+            return None
+        return CacheEntry(*row)
+
+    def put(self, key, response, ttl=None):
+        '''Stores a response under key for ttl seconds'''
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                             (key, response.url, response.content,
+                              response.headers.get('Content-Type'),
+                              response.headers.get('ETag'),
+                              response.headers.get('Last-Modified'),
+                              self._expires(ttl)))
+            self._db.commit()
+
+    def touch(self, key, ttl=None):
+        '''Renews the expiry of an entry the server reported unchanged'''
+        with self._lock:
+            self._db.execute('UPDATE responses SET expires = ? WHERE key = ?',
+                             (self._expires(ttl), key))
+            self._db.commit()
+
+    def clear(self):
+        '''Removes every entry'''
+        with self._lock:
+            self._db.execute('DELETE FROM responses')
+            self._db.commit()
+
+    def _expires(self, ttl):
+        if ttl is None:
+            ttl = self.ttl
+        if ttl == PERMANENT:
+            return None
+        return time.time() + ttl
+
+
+class CacheEntry(object):
+    '''A stored response'''
+    __slots__ = ('url', 'body', 'content_type', 'etag', 'last_modified', 'expires')
+
+    def __init__(self, url, body, content_type, etag, last_modified, expires):
+        self.url = url
+        self.body = body
+        self.content_type = content_type
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires = expires
+
+    def __repr__(self):
+        return 'CacheEntry(%s)' % (self.url, )
+
+    @property
+    def fresh(self):
+        return self.expires is None or self.expires > time.time()
+
+    def validators(self):
+        '''Returns the conditional request headers for this entry'''
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def response(self):
+        '''Rebuilds a requests.Response from the entry'''
+        r = requests.Response()
+        r.status_code = 200
+        r.url = self.url
+        r._content = bytes(self.body)
+        r._content_consumed = True
+        r.encoding = 'utf-8'
+        r.headers = CaseInsensitiveDict({'Content-Type': self.content_type or 'application/json'})
+        r.from_cache = True
+        return r
@@ -1,14 +1,27 @@
-import requests
+from collections import OrderedDict
+from urllib.parse import urlparse
+
 from espnff import League
 from espnff.exception import AuthorizationError
+from espnff.async_league import AsyncLeague
+from espnff.backfill import Backfill, AsyncBackfill
+from espnff.transport import Transport, AsyncTransport
 
 
 class ESPNFF:
-    def __init__(self, username=None, password=None, swid = None, s2=None):
+    def __init__(self, username=None, password=None, swid = None, s2=None,
+                 transport=None, stream_players=False, hooks=None, stats=None,
+                 **transport_options):
         self.__username = username
         self.__password = password
         self.__auth_swid = swid
         self.__auth_s2 = s2
+        self.stream_players = stream_players
+        self.hooks = list(hooks or ())
+        self.stats = stats
+        if transport is None:
+            transport = Transport(**transport_options)
+        self.transport = transport
 
     def authorize(self):
         x = 0
@@ -17,4 +30,83 @@ class ESPNFF:
         #self.__auth_swid = 'AEBdtvvK%2F7HwrYzxOASS4zkjta3llBEO9ePglR1sg8upF%2Bhb9nhL7HYC80YRF%2B3Z%2F3Y1dfoDEtZiI2ExoY606OITOxWeBs0Pp%2F1xD5TJn8Xpf1tQ9%2FQBQPBZ3YnAYBWlm1alX755pr5R9te6vqGBvBh330USgJgk%2FSx4YdgeDwnA%2FK%2BX3DC%2FFoY5t4FWe%2B8LkiVE3afeg2wUr31rLFD%2FKMYvTkvYJ1jVOeHciTBEPAKwQWeghd3A7BZpBuc6%2Bhecrdp0ZLfhr%2FIZ3ISNxDNurwLN'
         
     def get_league(self, league_id, year):
-        return League(league_id, year, self.__auth_s2, self.__auth_swid)
+        return League(league_id, year, self.__auth_s2, self.__auth_swid,
+                      transport=self.transport, stream_players=self.stream_players,
+                      hooks=self.hooks, stats=self.stats)
+
+    def get_leagues(self, leagues, max_workers=8, progress=None):
+        '''Builds many leagues on a bounded thread pool
+
+        ``leagues`` holds (league_id, year) pairs. Players and pro team
+        schedules are fetched once per season and shared. Yields a
+        BackfillResult keyed by (league_id, year) as each league finishes;
+        a league that fails, e.g. with PrivateLeagueException, is yielded
+        with its error instead of stopping the batch.
+        '''
+        engine = Backfill(max_workers, max_workers, progress)
+        host = urlparse(League.ENDPOINT).netloc
+        for league_id, year in OrderedDict.fromkeys(leagues):
+            engine.add((league_id, year), host, self.get_league, league_id, year)
+        return engine.run()
+
+    def backfill(self, league_id, years, weeks=None,
+                 include=('boxscore', 'draft', 'transactions'),
+                 max_workers=8, host_limit=4, progress=None):
+        '''Backfills several seasons of a league on one bounded thread pool
+
+        Yields a BackfillResult for each season's League as it is built,
+        then for each of that season's fetches.
+        '''
+        engine = Backfill(max_workers, host_limit, progress)
+        for year in years:
+            engine.add((league_id, year, 'league'), urlparse(League.ENDPOINT).netloc,
+                       self.get_league, league_id, year)
+        for result in engine.run():
+            if result.key[-1] == 'league' and result.error is None:
+                result.result.backfill_tasks(engine, weeks, include)
+            yield result
+
+    def _credentials(self):
+        return self.__auth_s2, self.__auth_swid
+
+
+class AsyncESPNFF(ESPNFF):
+    def __init__(self, username=None, password=None, swid = None, s2=None,
+                 transport=None, stream_players=False, max_workers=None, hooks=None,
+                 stats=None, **transport_options):
+        ESPNFF.__init__(self, username, password, swid, s2, transport,
+                        stream_players, hooks, stats, **transport_options)
+        self.async_transport = AsyncTransport(self.transport, max_workers)
+
+    async def get_league(self, league_id, year):
+        espn_s2, swid = self._credentials()
+        return await AsyncLeague.create(league_id, year, espn_s2, swid,
+                                        transport=self.async_transport,
+                                        stream_players=self.stream_players,
+                                        hooks=self.hooks, stats=self.stats)
+
+    async def get_leagues(self, leagues, max_workers=8, progress=None):
+        '''Builds many leagues concurrently; use ``async for`` over the results
+
+        Like ESPNFF.get_leagues, with at most max_workers leagues loading
+        at once on the event loop.
+        '''
+        engine = AsyncBackfill(max_workers, max_workers, progress)
+        host = urlparse(League.ENDPOINT).netloc
+        for league_id, year in OrderedDict.fromkeys(leagues):
+            engine.add((league_id, year), host, self.get_league, league_id, year)
+        async for result in engine.run():
+            yield result
+
+    async def backfill(self, league_id, years, weeks=None,
+                       include=('boxscore', 'draft', 'transactions'),
+                       max_workers=8, host_limit=4, progress=None):
+        '''Backfills several seasons of a league concurrently; use ``async for``'''
+        engine = AsyncBackfill(max_workers, host_limit, progress)
+        for year in years:
+            engine.add((league_id, year, 'league'), urlparse(League.ENDPOINT).netloc,
+                       self.get_league, league_id, year)
+        async for result in engine.run():
+            if result.key[-1] == 'league' and result.error is None:
+                result.result.backfill_tasks(engine, weeks, include)
+            yield result
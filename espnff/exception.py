@@ -13,5 +13,9 @@ class InvalidLeagueException(ESPNFFException):
 class UnknownLeagueException(ESPNFFException):
     pass
 
+
+class SnapshotException(ESPNFFException):
+    pass
+
 class AuthorizationError(Exception):
     pass
@@ -0,0 +1,71 @@
+from collections import defaultdict
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+
+class RecordIndex(Mapping):
+    '''One copy of each record, reachable under several keys
+
+    Behaves like the dicts League used to build, where every record was
+    stored once per key, but each record is held only once.
+    '''
+    def __init__(self):
+        self._records = []
+        self._keys = {}
+
+    def __repr__(self):
+        return 'RecordIndex(%s records)' % (len(self._records), )
+
+    def __getitem__(self, key):
+        return self._keys[key]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, record, *keys):
+        '''Stores record under every key'''
+        self._records.append(record)
+        for key in keys:
+            self._keys[key] = record
+        return record
+
+    def records(self):
+        '''Returns each record once'''
+        return list(self._records)
+
+    def replace(self, other):
+        '''Takes over another index's records, so every holder sees them'''
+        self._records, self._keys = list(other._records), dict(other._keys)
+
+
+class ScheduleIndex(object):
+    '''Matchups of a schedule indexed by (matchupPeriodId, teamId)'''
+    def __init__(self, schedule):
+        self._by_team = {}
+        self._by_period = defaultdict(list)
+        for matchup in schedule:
+            period = matchup['matchupPeriodId']
+            self._by_period[period].append(matchup)
+            for side in ('home', 'away'):
+                if side in matchup:
+                    self._by_team[(period, matchup[side]['teamId'])] = matchup
+
+    def __repr__(self):
+        return 'ScheduleIndex(%s periods)' % (len(self._by_period), )
+
+    def get(self, period, team):
+        '''Returns the matchup a team played in a period'''
+        return self._by_team[(period, team)]
+
+    def period(self, period):
+        '''Returns every matchup of a period'''
+        return list(self._by_period.get(period, []))
+
+    def periods(self):
+        return sorted(self._by_period)
@@ -1,12 +1,25 @@
-import requests
-import json
+import time
+from datetime import date
+from urllib.parse import urlparse
 
 from .utils import (two_step_dominance,
                     power_points, )
 from .team import Team
 from .settings import Settings
 from .matchup import Matchup
-from .player import Player
+from .player import Player, RosterEntry
+from .backfill import Backfill
+from .cache import PERMANENT
+from .registry import player_registry, pro_team_registry
+from .stream import iter_json_array
+from .index import RecordIndex, ScheduleIndex
+from . import simulate
+from .query import Query
+from .scoring import ScoringEngine
+from . import lineup
+from .analytics import SeasonAnalytics
+from .transport import get_transport
+from .snapshot import SECTIONS, Snapshot, write_snapshot
 from .exception import (PrivateLeagueException,
                         InvalidLeagueException,
                         UnknownLeagueException, )
@@ -21,14 +34,16 @@ from .boxCodes import (lineupSlots,
 
 class League(object):
     '''Creates a League instance for Public ESPN league'''
-    def __init__(self, league_id, year, espn_s2=None, swid=None):
-
-        self.league_id = league_id
-        self.year = year
-        self.ENDPOINT = "http://fantasy.espn.com/apis/v3/games/ffl/seasons/%d/segments/0/leagues/%d"
-        self.teams = []
-        self.espn_s2 = espn_s2
-        self.swid = swid
+    ENDPOINT = "http://fantasy.espn.com/apis/v3/games/ffl/seasons/%d/segments/0/leagues/%d"
+    PLAYER_ENDPOINT = 'https://fantasy.espn.com/apis/v3/games/ffl/seasons/%d/players'
+    TEAM_ENDPOINT = 'https://fantasy.espn.com/apis/v3/games/ffl/seasons/%d/'
+    player_registry = player_registry
+    pro_team_registry = pro_team_registry
+
+    def __init__(self, league_id, year, espn_s2=None, swid=None, transport=None,
+                 stream_players=False, hooks=None, stats=None, keep_boxscores=False):
+        self._setup(league_id, year, espn_s2, swid, transport, stream_players, hooks, stats,
+                    keep_boxscores)
         self._fetch_league()
         self._fetch_players()
         self._fetch_teams()
@@ -36,122 +51,217 @@ class League(object):
     def __repr__(self):
         return 'League(%s, %s)' % (self.league_id, self.year, )
 
-    def _fetch_league(self):
-        
-        params = {
-           'view':'mTeam'
-        }
+    def _setup(self, league_id, year, espn_s2, swid, transport, stream_players=False,
+               hooks=None, stats=None, keep_boxscores=False):
+        '''Sets the league attributes shared by the sync and async leagues
 
-        cookies = None
+        Each callable in ``hooks`` is called with the RequestTiming of every
+        request once its response is parsed; a ``stats`` object is added to
+        the hooks and kept as ``self.stats``. With ``keep_boxscores`` full
+        boxscores are kept in ``boxscore_cache`` (see ``boxscores``).
+        '''
+        self.league_id = league_id
+        self.year = year
+        self.stream_players = stream_players
+        self.teams = []
+        self.current_week = None
+        self._settings = None
+        self.fetched = {}
+        self.keep_boxscores = keep_boxscores
+        self.boxscore_cache = {}
+        self.espn_s2 = espn_s2
+        self.swid = swid
+        self.cookies = None
+        self.hooks = list(hooks or ())
+        self.stats = stats
+        if stats is not None:
+            self.hooks.append(stats)
+        self.transport = transport if transport is not None else get_transport()
         if self.espn_s2 and self.swid:
             self.cookies = {
                 'espn_s2': self.espn_s2,
                 'SWID': self.swid
             }
-        r = requests.get(self.ENDPOINT % (self.year, self.league_id), cookies=self.cookies, params = params)
-        ##r = requests.get('%sleagueSettings' % (self.ENDPOINT, ), params=params, cookies=cookies)
 
-        self.status = r.status_code
-        
-        data = r.json()
-        self.teams = {}
-        memberData = data['members']
-        for team in data['members']:
-            teamData = list(filter(lambda d: team['id'] in d['owners'] ,
-                                   data['teams']))
-            self.teams[team['id']] = {
-                    'teamName' : ('Billy' if team['firstName'] == 'Bill' else team['firstName']) + ' ' + team['lastName'],
-                    'teamKey' : team['id'],
-                    'teamId' : teamData[0]['id'],
-                    'nickName' : teamData[0]['location'] + ' ' + teamData[0]['nickname'],
-                    'waiverRank' : teamData[0]['waiverRank'],
-                    'budgetSpent' : teamData[0]['transactionCounter']['acquisitionBudgetSpent'],
-                    'trades' : teamData[0]['transactionCounter']['trades'],
-                    'acquisitions' : teamData[0]['transactionCounter']['matchupAcquisitionTotals']
-                }
+    def _get_league_view(self, query, ttl=None):
+        '''Requests a Query of the league endpoint'''
+        params, headers = query.build()
+        return self.transport.get(self.ENDPOINT % (self.year, self.league_id), cookies=self.cookies, params = params,
+                                  ttl=ttl, headers=headers)
+
+    def _get_players(self):
+        '''Requests the active player pool for the season'''
+        query = Query('players_wl')
+        query.filter.active()
+        params, headers = query.build()
+        return self.transport.get(self.PLAYER_ENDPOINT % (self.year), params = params, headers=headers,
+                                  stream=self.stream_players)
+
+    def _get_teams(self):
+        '''Requests the pro team schedules for the season'''
+        params, headers = Query('proTeamSchedules').build()
+        return self.transport.get(self.TEAM_ENDPOINT % (self.year), params = params, headers=headers,
+                                  ttl=self._season_ttl())
+
+    def fetch(self, query, ttl=None):
+        '''Returns the decoded response to a Query of the league endpoint
+
+        Use it to request only the views and players a job needs, e.g.
+        ``query = Query('mRoster'); query.players.ids(3139477)``.
+        '''
+        return self._timed(_response_data, self._get_league_view(query, ttl))
+
+    def _timed(self, parse, r, *args):
+        '''Runs parse(r, *args) and reports the request's timing to the hooks'''
+        start = time.perf_counter()
+        try:
+            return parse(r, *args)
+        finally:
+            timing = getattr(r, 'timing', None)
+            if timing is not None and self.hooks:
+                timing.transform = max(0.0, time.perf_counter() - start - timing.decode)
+                timing.league_id = self.league_id
+                timing.year = self.year
+                for hook in self.hooks:
+                    hook(timing)
+
+    def _season_ttl(self):
+        '''Cache expiry for season data, which is final once the season is over'''
+        return PERMANENT if self.year < _current_season() else None
+
+    def _week_ttl(self, week):
+        '''Cache expiry for a week's data, which is final once the week is over'''
+        if self.current_week and week < self.current_week:
+            return PERMANENT
+        return self._season_ttl()
 
-            self.teams[teamData[0]['id']] = {
-                    'teamName' : ('Billy' if team['firstName'] == 'Bill' else team['firstName']) + ' ' + team['lastName'],
-                    'teamKey' : team['id'],
-                    'teamId' : teamData[0]['id'],
-                    'nickName' : teamData[0]['location'] + ' ' + teamData[0]['nickname'],
-                    'waiverRank' : teamData[0]['waiverRank'],
-                    'budgetSpent' : teamData[0]['transactionCounter']['acquisitionBudgetSpent'],
-                    'trades' : teamData[0]['transactionCounter']['trades'],
-                    'acquisitions' : teamData[0]['transactionCounter']['matchupAcquisitionTotals']
-                }
-            self.teams[99] = {
-                'teamId' : 99,
-                'teamName' : 'Bye'
-                }
+    def _fetch_league(self):
+        r = self._get_league_view(Query('mTeam'))
+        self._timed(self._parse_league, r)
+        self.fetched['league'] = time.time()
 
+    def _fetch_players(self):
+        self.players = self.player_registry.get(self.year, self._load_players)
+        self.fetched['players'] = time.time()
 
+    def _load_players(self):
+        return self._timed(self._parse_players, self._get_players())
 
-    def _fetch_players(self):
-        params = {
-            'view':'players_wl'
-            }
-        playerEndpoint = 'https://fantasy.espn.com/apis/v3/games/ffl/seasons/%d/players'
-        filters = {"filterActive":{"value":True}}
-        headers = {'x-fantasy-filter': json.dumps(filters)}
-        r = requests.get(playerEndpoint % (self.year), params = params, headers=headers)
-
-        self.players = {}
-
-        for player in r.json():
-            self.players[player['id']] = {
-                'playerId' : player['id'],
-                'player' : player['fullName'].replace("'","_"),
-                'position' : player['defaultPositionId'],
-                'team' : player['proTeamId'],
-                'slots' : player['eligibleSlots']
-                }
+    def refresh_players(self):
+        '''Re-downloads the season's player pool for every league sharing it'''
+        self.players = self.player_registry.refresh(self.year, self._load_players)
+        self.fetched['players'] = time.time()
 
     def _fetch_teams(self):
-        params = {
-            'view':'proTeamSchedules'
-            }
-
-        teamEndpoint = 'https://fantasy.espn.com/apis/v3/games/ffl/seasons/%d/'
+        self.nflTeams = self.pro_team_registry.get(self.year, self._load_teams)
+        self.fetched['nflTeams'] = time.time()
 
+    def _load_teams(self):
+        return self._timed(self._parse_teams, self._get_teams())
 
-        r = requests.get(teamEndpoint % (self.year), params = params)
-        teamData = r.json()['settings']['proTeams']
-        self.nflTeams = {}
+    def _parse_league(self, r):
+        self.status = r.status_code
+        
+        data = _response_data(r)
+        self.current_week = data.get('scoringPeriodId')
+        self.teams = RecordIndex()
+        owners = {}
+        for teamData in data['teams']:
+            for owner in teamData['owners']:
+                owners[owner] = teamData
+        for team in data['members']:
+            if team['id'] not in owners:
+                continue
+            teamData = owners[team['id']]
+            self.teams.add({
+                    'teamName' : ('Billy' if team['firstName'] == 'Bill' else team['firstName']) + ' ' + team['lastName'],
+                    'teamKey' : team['id'],
+                    'teamId' : teamData['id'],
+                    'nickName' : teamData['location'] + ' ' + teamData['nickname'],
+                    'waiverRank' : teamData['waiverRank'],
+                    'budgetSpent' : teamData['transactionCounter']['acquisitionBudgetSpent'],
+                    'trades' : teamData['transactionCounter']['trades'],
+                    'acquisitions' : teamData['transactionCounter']['matchupAcquisitionTotals']
+                }, team['id'], teamData['id'])
+        self.teams.add({
+            'teamId' : 99,
+            'teamName' : 'Bye'
+            }, 99)
+
+
+
+    def _parse_players(self, r):
+        if r.status_code != 200:
+            _response_data(r)
+        if self.stream_players:
+            pool = iter_json_array(r.iter_content(chunk_size=65536))
+        else:
+            pool = _decode(r)
+        players = {}
+
+        try:
+            for player in pool:
+                players[player['id']] = Player(player)
+        finally:
+            r.close()
+        return players
+
+    def _parse_teams(self, r):
+        teamData = _response_data(r)['settings']['proTeams']
+        nflTeams = RecordIndex()
         for team in teamData:
             if 'proGamesByScoringPeriod' in team:
                 sched = team['proGamesByScoringPeriod']
             else:
                 sched = []
-            self.nflTeams[team['id']] = {
-                    'id' : team['id'],
-                    'abbrev' : team['abbrev'],
-                    'games' : sched,
-                    'byeWeek' : team['byeWeek']
-                }
-            self.nflTeams[team['abbrev']] = {
+            nflTeams.add({
                     'id' : team['id'],
                     'abbrev' : team['abbrev'],
                     'games' : sched,
                     'byeWeek' : team['byeWeek']
-                }
+                }, team['id'], team['abbrev'])
+        return nflTeams
         
 
         
 
 
     def transactions(self):
-        params = {
-            'view' : 'kona_playercard'
-            }
-
-
-        r = requests.get(self.ENDPOINT % (self.year, self.league_id), cookies=self.cookies, params = params)
-        
-        trans = r.json()['players']
+        '''Returns every transaction, newest first'''
+        return _newest_first(self.iter_transactions())
+
+    def iter_transactions(self, since=None, page_size=50):
+        '''Yields transactions one page of players at a time
+
+        Players are requested by their latest transaction date, newest
+        first, and each page is yielded newest first; a player's older
+        transactions still come with that player, so use transactions()
+        for one sorted list. With ``since`` (a ``tranDate``) only newer
+        transactions are yielded, and paging stops at the first page whose
+        transactions are all that old or older.
+        '''
+        offset = 0
+        while True:
+            r = self._get_league_view(self._transactions_query(offset, page_size))
+            transList, count = self._timed(self._parse_transactions, r)
+            newer = _newer(transList, since)
+            for tranData in newer:
+                yield tranData
+            if count < page_size or (transList and not newer):
+                return
+            offset += page_size
+
+    def _transactions_query(self, offset, page_size):
+        query = Query('kona_playercard')
+        query.players.sort('transactionDate').page(page_size, offset)
+        return query
+
+    def _parse_transactions(self, r):
+        '''Returns a page's transactions, newest first, and its player count'''
+        trans = _response_data(r)['players']
 
         transList = []
-        for player in trans[:50]:
+        for player in trans:
             playerInfo = player['player']
             playerName = playerInfo['fullName']
             playerTeam = playerInfo['proTeamId']
@@ -167,6 +277,8 @@ class League(object):
                         'transubOrder' : tran['subOrder'],
                         'tranType' : tran['type'],
                         'leageTeam' : self.teams[tran['teamId']]['teamName'],
+                        'tranId' : tran.get('id'),
+                        'tranDate' : tran.get('proposedDate', 0),
                         'tranParts' : []
                     }
                 for item in tran['items']:
@@ -175,87 +287,105 @@ class League(object):
                         'toTeam' : 'None' if item['toTeamId']==0 else self.teams[item['toTeamId']]['teamName'],
                         'pickNumber' : item['overallPickNumber'],
                         'playerId' : item['playerId'],
-                        'player' : self.players[item['playerId']]['player'],
-                        'position' : self.players[item['playerId']]['position'],
-                        'team' : self.players[item['playerId']]['team'],
+                        'player' : self.players[item['playerId']].name,
+                        'position' : self.players[item['playerId']].position,
+                        'team' : self.players[item['playerId']].pro_team,
                         'type' : item['type']
                         })
                 transList.append(tranData)
+        transList.sort(key=lambda tranData: tranData['tranDate'], reverse=True)
+        return transList, len(trans)
 
         
 
 
-    def boxscore(self,week,team):
-        params = {
-            'view':'mBoxscore',
-            'leagueId': self.league_id,
-            'seasonId': self.year,
-            'scoringPeriodId': week,
-            'matchupPeriodId': week,
-            'forTeamId' : team
-        }
-        r = requests.get(self.ENDPOINT % (self.year, self.league_id), cookies=self.cookies, params = params)
-        data = r.json()
-        if self.status == 401:
-            raise PrivateLeagueException(data['error'][0]['message'])
-
-        elif self.status == 404:
-            raise InvalidLeagueException(data['error'][0]['message'])
-
-        elif self.status != 200:
-            raise UnknownLeagueException('Unknown %s Error' % self.status)
-
-        boxscoreData = data['schedule']
-        def checkAwayKey(obj):
-            if 'away' in list(obj.keys()):
-                return obj['away']['teamId']
-            else:
-                return 99
-        boxscoreData = list(filter(lambda d: (d['matchupPeriodId'] == week and
-                                     (d['home']['teamId'] == team or
-                                      checkAwayKey(d) == team
-                                      )), boxscoreData))
-
-        if boxscoreData[0]['home']['teamId'] == team:
+    def boxscore(self, week, team, lean=False, stats=None):
+        '''Returns a team's boxscore for a week
+
+        With ``lean=True`` each player's ``stats`` holds only the week's
+        actual StatLines; ``stats=[statId, ...]`` also keeps only those stat ids.
+        '''
+        r = self._get_league_view(self._boxscore_query(week, team), self._week_ttl(week))
+        return self._timed(self._parse_boxscore, r, week, team, _lean(week, lean, stats))
+
+    def boxscores(self, week, lean=False, stats=None):
+        '''Returns the boxscore of every team for a week from one request
+
+        A league built with ``keep_boxscores=True`` keeps full boxscores in
+        ``boxscore_cache`` as {week: (final, boxscores)} and returns a week
+        that was already over when it was fetched without a request.
+        '''
+        lean = _lean(week, lean, stats)
+        kept = self._kept_boxscores(week, lean)
+        if kept is not None:
+            return kept
+        r = self._get_league_view(self._boxscore_query(week), self._week_ttl(week))
+        return self._keep(week, lean, self._timed(self._parse_boxscores, r, week, lean))
+
+    def _kept_boxscores(self, week, lean):
+        '''Returns the kept boxscores of a finished week, or None'''
+        if lean is None and self.keep_boxscores:
+            final, boxscores = self.boxscore_cache.get(week, (False, None))
+            if final:
+                return boxscores
+        return None
+
+    def _keep(self, week, lean, boxscores):
+        if lean is None and self.keep_boxscores:
+            final = bool(self.current_week) and week < self.current_week
+            self.boxscore_cache[week] = (final, boxscores)
+        return boxscores
+
+    def season_boxscores(self, start_week, end_week, lean=False, stats=None):
+        '''Returns {week: {teamId: boxscore}} for an inclusive range of weeks'''
+        return {week: self.boxscores(week, lean, stats) for week in range(start_week, end_week + 1)}
+
+    def _boxscore_query(self, week, team=None):
+        return Query('mBoxscore',
+                     leagueId=self.league_id,
+                     seasonId=self.year,
+                     scoringPeriodId=week,
+                     matchupPeriodId=week,
+                     forTeamId=team)
+
+    def _boxscore_data(self, r):
+        return _response_data(r)
+
+    def _parse_boxscore(self, r, week, team, lean=None):
+        schedule = ScheduleIndex(self._boxscore_data(r)['schedule'])
+        return self._boxscore_result(schedule.get(week, team), week, team, lean)
+
+    def _parse_boxscores(self, r, week, lean=None):
+        results = {}
+        schedule = ScheduleIndex(self._boxscore_data(r)['schedule'])
+        for matchup in schedule.period(week):
+            for side in ('home', 'away'):
+                if side in matchup:
+                    team = matchup[side]['teamId']
+                    results[team] = self._boxscore_result(matchup, week, team, lean)
+        return results
+
+    def _boxscore_result(self, matchup, week, team, lean=None):
+        '''Builds the boxscore of one side of a matchup
+
+        ``lean`` is the (periods, stat_ids) projection of the player stats, if any.
+        '''
+        if matchup['home']['teamId'] == team:
             d = 'home'
             e = 'away'
         else:
             d = 'away'
             e = 'home'
-        teamData = boxscoreData[0][d]
-        if checkAwayKey(boxscoreData[0]) == 99:
+        teamData = matchup[d]
+        if _away_team_id(matchup) == 99:
             oppTeam = {'teamId' : 99, 'totalPoints' : 0}
         else:
-            oppTeam = boxscoreData[0][e]
+            oppTeam = matchup[e]
         players = teamData['rosterForCurrentScoringPeriod']['entries']
-        playerList = []
-        for player in players:
-            if 'player' in player['playerPoolEntry']:
-                playerInfo = player['playerPoolEntry']['player']
-                
-                if 'appliedStatTotal' not in player['playerPoolEntry']:
-                    playerPoints = 0
-                else:
-                    playerPoints = player['playerPoolEntry']['appliedStatTotal']
-                playerData = {'playerName' : playerInfo['fullName'],
-                              'playerId' : playerInfo['id'],
-                              'playerTeam' : nflTeams[playerInfo['proTeamId']],
-                              'slot' : lineupSlots[player['lineupSlotId']],
-                              'healthStatus' : 'empty',
-                              'stats' : playerInfo['stats'],
-                              'playerPos' : playerPos[playerInfo['defaultPositionId']],
-                              'Points' : playerPoints
-                              }
-            else:
-                playerData = {'playerName' : 'empty',
-                              'playerId' : 'empty',
-                              'playerTeam' : 'empty',
-                              'slot' : lineupSlots[player['lineupSlotId']],
-                              'healthStatus' : 'empty',
-                              'stats': 'empty',
-                              'playerPos' : 'empty',
-                              'Points' : 0}
-            playerList.append(playerData)
+        if lean is None:
+            playerList = [RosterEntry(player) for player in players]
+        else:
+            playerList = [RosterEntry(player, *lean) for player in players]
         result = {'teamId' : teamData['teamId'],
                   'season' : self.year,
                   'week' : week,
@@ -269,21 +399,259 @@ class League(object):
         return result
 
 
-    def freeAgents(self, week=None):
-
-        params = {
-            'scoringPeriodId':week,
-            'view':'kona_player_info'
-        }
+    @property
+    def settings(self):
+        '''League settings, fetched from the mSettings view on first use'''
+        if self._settings is None:
+            self._settings = Settings(self.fetch(Query('mSettings')))
+            self.fetched['settings'] = time.time()
+        return self._settings
+
+    def snapshot(self, path):
+        '''Saves teams, players, pro teams, settings and kept boxscores to path
+
+        Restore it with ``League.from_snapshot(path)``. Settings are only
+        saved once they have been fetched, and boxscores only if the league
+        keeps them (``keep_boxscores=True``).
+        '''
+        sections = {'league': {'currentWeek': self.current_week,
+                               'status': getattr(self, 'status', None),
+                               'teams': self.teams},
+                    'players': self.players,
+                    'nflTeams': self.nflTeams,
+                    'boxscores': self.boxscore_cache}
+        if self._settings is not None:
+            sections['settings'] = self._settings
+        saved = dict(self.fetched, boxscores=time.time())
+        write_snapshot(path, self.league_id, self.year, sections, saved)
+
+    @classmethod
+    def from_snapshot(cls, path, espn_s2=None, swid=None, transport=None, mmap=False,
+                      max_age=None, hooks=None, stats=None, keep_boxscores=None):
+        '''Restores a League saved by ``snapshot`` without any request
+
+        The season's players and pro teams go to the registries unless
+        another league already loaded them. ``keep_boxscores`` defaults to
+        whether the snapshot holds boxscores. With ``max_age`` (seconds),
+        sections ``stale_sections`` reports are fetched again right away.
+        '''
+        league = cls._restore(path, espn_s2, swid, transport, mmap, hooks, stats, keep_boxscores)
+        if max_age is not None:
+            league.refresh(max_age=max_age)
+        return league
+
+    @classmethod
+    def _restore(cls, path, espn_s2, swid, transport, mmap, hooks, stats, keep_boxscores):
+        snapshot = Snapshot(path, mmap)
+        try:
+            league = cls.__new__(cls)
+            league._setup(snapshot.league_id, snapshot.year, espn_s2, swid, transport,
+                          hooks=hooks, stats=stats)
+            data = snapshot.load('league')
+            league.current_week = data['currentWeek']
+            league.status = data['status']
+            league.teams = data['teams']
+            league.players = league.player_registry.get(league.year, lambda: snapshot.load('players'))
+            league.nflTeams = league.pro_team_registry.get(league.year, lambda: snapshot.load('nflTeams'))
+            if 'settings' in snapshot:
+                league._settings = snapshot.load('settings')
+            if 'boxscores' in snapshot:
+                league.boxscore_cache = snapshot.load('boxscores')
+            if keep_boxscores is None:
+                keep_boxscores = bool(league.boxscore_cache)
+            league.keep_boxscores = keep_boxscores
+            league.fetched = {name: snapshot.saved(name) for name in SECTIONS if name in snapshot}
+        finally:
+            snapshot.close()
+        return league
+
+    def stale_sections(self, max_age=3600):
+        '''Names of the sections to fetch again
+
+        Sections of a season that is over never go stale. Otherwise a
+        section is stale once it is older than max_age seconds, and
+        boxscores are stale while a cached week was still in progress.
+        '''
+        if self._season_ttl() is PERMANENT:
+            return []
+        now = time.time()
+        stale = [name for name in ('league', 'players', 'nflTeams', 'settings')
+                 if name in self.fetched and now - self.fetched[name] > max_age]
+        if any(not final for final, boxscores in self.boxscore_cache.values()):
+            stale.append('boxscores')
+        return stale
+
+    def refresh(self, sections=None, max_age=3600):
+        '''Fetches sections again, by default the stale ones; returns their names'''
+        if sections is None:
+            sections = self.stale_sections(max_age)
+        if 'league' in sections:
+            self._fetch_league()
+        if 'players' in sections:
+            self.refresh_players()
+        if 'nflTeams' in sections:
+            self.nflTeams = self.pro_team_registry.refresh(self.year, self._load_teams)
+            self.fetched['nflTeams'] = time.time()
+        if 'settings' in sections:
+            self._settings = None
+            self.settings
+        if 'boxscores' in sections:
+            for week, (final, boxscores) in sorted(self.boxscore_cache.items()):
+                if not final:
+                    self.boxscores(week)
+        return list(sections)
+
+    def scoring_engine(self):
+        '''ScoringEngine for the league's scoring rules; requires numpy'''
+        return ScoringEngine.from_settings(self.settings)
+
+    def lineup_efficiency(self, start_week=1, end_week=None):
+        '''Optimal lineup and bench points lost of every team for a range of weeks
+
+        Returns {week: {teamId: efficiency dict}}; see lineup.lineup_efficiency.
+        '''
+        if end_week is None:
+            end_week = self.current_week or 1
+        boxscores = self.season_boxscores(start_week, end_week, lean=True)
+        return lineup.season_efficiency(boxscores, self.settings.roster_slots)
+
+    def analytics(self, end_week=None):
+        '''SeasonAnalytics of the finished weeks through end_week
+
+        ``end_week`` defaults to the last week of the regular season.
+        '''
+        r = self._get_league_view(Query('mMatchupScore'))
+        return self._timed(self._analytics, r, end_week)
+
+    def _analytics(self, r, end_week):
+        if end_week is None:
+            end_week = self.settings.reg_season_count
+        teams = sorted(team['teamId'] for team in self.teams.records() if team['teamId'] != 99)
+        column = {team: i for i, team in enumerate(teams)}
+        weeks = {}
+        for matchup in _response_data(r)['schedule']:
+            week = matchup['matchupPeriodId']
+            if week > end_week or matchup['winner'] == 'UNDECIDED':
+                continue
+            scores, opponents = weeks.setdefault(week, ([0.0] * len(teams), [-1] * len(teams)))
+            home = column[matchup['home']['teamId']]
+            scores[home] = matchup['home']['totalPoints']
+            if 'away' in matchup:
+                away = column[matchup['away']['teamId']]
+                scores[away] = matchup['away']['totalPoints']
+                opponents[home] = away
+                opponents[away] = home
+        analytics = SeasonAnalytics(teams)
+        for week in sorted(weeks):
+            analytics.add_week(*weeks[week])
+        return analytics
+
+    def playoff_odds(self, n_sims=10000, processes=None, seed=None):
+        '''Simulates the rest of the regular season n_sims times
+
+        Returns {teamId: {'playoffs': probability, 'seeds': [probability, ...]}}.
+        Requires numpy.
+        '''
+        r = self._get_league_view(Query('mMatchupScore'))
+        return self._timed(self._playoff_odds, r, n_sims, processes, seed)
+
+    def _playoff_odds(self, r, n_sims, processes, seed):
+        settings = self.settings
+        played = []
+        remaining = []
+        for matchup in _response_data(r)['schedule']:
+            if matchup['matchupPeriodId'] > settings.reg_season_count or 'away' not in matchup:
+                continue
+            home = matchup['home']['teamId']
+            away = matchup['away']['teamId']
+            if matchup['winner'] == 'UNDECIDED':
+                remaining.append((home, away))
+            else:
+                played.append((home, away, matchup['home']['totalPoints'], matchup['away']['totalPoints']))
+        teams = sorted(team['teamId'] for team in self.teams.records() if team['teamId'] != 99)
+        return simulate.playoff_odds(teams, played, remaining, settings.playoff_team_count,
+                                     settings.playoff_seed_tie_rule, n_sims, processes, seed)
+
+    def backfill(self, weeks=None, include=('boxscore', 'draft', 'transactions'),
+                 max_workers=8, host_limit=4, progress=None):
+        '''Fetches historical data on a thread pool, yielding results as they complete'''
+        engine = Backfill(max_workers, host_limit, progress)
+        self.backfill_tasks(engine, weeks, include)
+        return engine.run()
+
+    def backfill_tasks(self, engine, weeks=None, include=('boxscore', 'draft', 'transactions')):
+        '''Queues this league's backfill fetches on a Backfill engine'''
+        host = urlparse(self.ENDPOINT).netloc
+        key = (self.league_id, self.year)
+        if 'boxscore' in include:
+            if weeks is None:
+                weeks = range(1, (self.current_week or 1) + 1)
+            for week in weeks:
+                engine.add(key + ('boxscore', week), host, self.boxscores, week)
+        if 'draft' in include:
+            engine.add(key + ('draft', ), host, self.draftData)
+        if 'transactions' in include:
+            engine.add(key + ('transactions', ), host, self.transactions)
+
+    def freeAgents(self, week=None, position=None, status=('FREEAGENT', 'WAIVERS'),
+                   sort='percentOwned', limit=25):
+        '''Returns up to limit available players, best first'''
+        return list(self.iter_free_agents(week, position, status, sort, limit))
+
+    def iter_free_agents(self, week=None, position=None, status=('FREEAGENT', 'WAIVERS'),
+                         sort='percentOwned', limit=None, page_size=50):
+        '''Yields available players page by page, filtered and sorted by ESPN
+
+        ``position`` is a lineup slot name or id (e.g. 'RB' or 2), ``sort`` is
+        'percentOwned' or 'projectedPoints'. No further pages are requested
+        once ``limit`` players have been yielded.
+        '''
+        offset = 0
+        while limit is None or offset < limit:
+            size = page_size if limit is None else min(page_size, limit - offset)
+            r = self._get_league_view(self._free_agent_query(week, position, status, sort, offset, size))
+            players = self._timed(_response_data, r)['players']
+            for player in players:
+                yield self._free_agent(player)
+            if len(players) < size:
+                return
+            offset += size
+
+    def _free_agent_query(self, week, position, status, sort, offset, size):
+        query = Query('kona_player_info', scoringPeriodId=week)
+        players = query.players.status(*status).page(size, offset)
+        if position is not None:
+            players.slots(_slot_id(position))
+        if sort == 'percentOwned':
+            players.sort('percentOwned')
+        elif sort == 'projectedPoints':
+            # statSourceId 1 (projected), split 1 (week) or 0 (season), season, period
+            if week is None:
+                value = '10%d' % (self.year, )
+            else:
+                value = '11%d%d' % (self.year, week)
+            players.sort('appliedTotal', value=value)
+        else:
+            raise ValueError('Unknown sort %r' % (sort, ))
+        return query
+
+    def _free_agent(self, player):
+        playerInfo = player['player']
+        return {
+            'playerId' : playerInfo['id'],
+            'playerName' : playerInfo['fullName'],
+            'playerTeam' : nflTeams[playerInfo['proTeamId']],
+            'playerPos' : playerPos[playerInfo['defaultPositionId']],
+            'status' : player.get('status'),
+            'percentOwned' : playerInfo.get('ownership', {}).get('percentOwned', 0)
+            }
 
     def draftData(self):
-        params = {
-            'view':'mDraftDetail'
-        }
+        r = self._get_league_view(Query('mDraftDetail'), self._season_ttl())
+        return self._timed(self._parse_draft, r)
 
-        r = requests.get(self.ENDPOINT % (self.year, self.league_id), cookies=self.cookies, params = params)
-        
-        data = r.json()
+    def _parse_draft(self, r):
+        data = _response_data(r)
         draftData = data['draftDetail']['picks']
 
 
@@ -297,11 +665,92 @@ class League(object):
                 'pick' : pick['overallPickNumber'],
                 'teamId' : self.teams[pick['teamId']]['teamName'],
                 'playerId' : pick['playerId'],
-                'playerName' : playerData['player'],
-                'nflTeam' : self.nflTeams[playerData['team']]['abbrev'],
-                'playerPosition' : playerPos[playerData['position']]
+                'playerName' : playerData.name,
+                'nflTeam' : self.nflTeams[playerData.pro_team]['abbrev'],
+                'playerPosition' : playerPos[playerData.position]
 
                 }
 
             draftPicks.append(pickData)
         return draftPicks
+
+
+def _response_data(r):
+    '''Decodes a response, raising the exception for its own status'''
+    if r.status_code == 200:
+        return _decode(r)
+    try:
+        data = _decode(r)
+    except ValueError:
+        data = {}
+    _raise_for_status(r.status_code, data)
+
+
+def _decode(r):
+    '''Decodes a JSON body, adding the time taken to the response's timing'''
+    start = time.perf_counter()
+    data = r.json()
+    timing = getattr(r, 'timing', None)
+    if timing is not None:
+        timing.decode += time.perf_counter() - start
+    return data
+
+
+def _raise_for_status(status, data):
+    '''Raises the exception for an unsuccessful league response'''
+    if status == 401:
+        raise PrivateLeagueException(_error_message(data, status))
+
+    elif status == 404:
+        raise InvalidLeagueException(_error_message(data, status))
+
+    elif status != 200:
+        raise UnknownLeagueException('Unknown %s Error' % status)
+
+
+def _error_message(data, status):
+    try:
+        return data['error'][0]['message']
+    except (KeyError, IndexError, TypeError):
+        return 'Unknown %s Error' % status
+
+
+def _newer(transList, since):
+    '''Returns the transactions of a page dated after since'''
+    if since is None:
+        return transList
+    return [tranData for tranData in transList if tranData['tranDate'] > since]
+
+
+def _newest_first(transactions):
+    return sorted(transactions, key=lambda tranData: tranData['tranDate'], reverse=True)
+
+
+def _slot_id(position):
+    '''Returns the lineup slot id of a slot name or id'''
+    if position in lineupSlots:
+        return position
+    for slot, name in lineupSlots.items():
+        if name == position:
+            return slot
+    raise ValueError('Unknown position %r' % (position, ))
+
+
+def _lean(week, lean, stats):
+    '''Returns the (periods, stat_ids) boxscore stats projection, or None to keep all stats'''
+    if not lean and stats is None:
+        return None
+    return (week, ), stats
+
+
+def _away_team_id(matchup):
+    if 'away' in matchup:
+        return matchup['away']['teamId']
+    else:
+        return 99
+
+
+def _current_season():
+    '''Returns the latest season that has started or is upcoming'''
+    today = date.today()
+    return today.year if today.month >= 3 else today.year - 1
@@ -0,0 +1,125 @@
+from .boxCodes import lineupSlots
+
+
+BENCH_SLOT_IDS = frozenset([20, 21])
+
+
+def assign(cost):
+    '''Minimum cost assignment of rows to columns (Hungarian algorithm)
+
+    ``cost`` is a list of n rows of m >= n costs. Returns the column of
+    each row. Runs in O(n^2 m) using row and column potentials.
+    '''
+    n = len(cost)
+    if n == 0:
+        return []
+    m = len(cost[0])
+    if m < n:
+        raise ValueError('Need at least as many columns as rows')
+    inf = float('inf')
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    match = [0] * (m + 1)
+    way = [0] * (m + 1)
+    for row in range(1, n + 1):
+        match[0] = row
+        column = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while match[column]:
+            used[column] = True
+            i = match[column]
+            delta = inf
+            nxt = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    reduced = cost[i - 1][j - 1] - u[i] - v[j]
+                    if reduced < minv[j]:
+                        minv[j] = reduced
+                        way[j] = column
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        nxt = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[match[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            column = nxt
+        while column:
+            previous = way[column]
+            match[column] = match[previous]
+            column = previous
+
+    result = [None] * n
+    for j in range(1, m + 1):
+        if match[j]:
+            result[match[j] - 1] = j - 1
+    return result
+
+
+def lineup_slots(roster_slots):
+    '''Expands Settings.roster_slots into one slot id per starting spot'''
+    slots = []
+    for slot in sorted(roster_slots):
+        if slot not in BENCH_SLOT_IDS:
+            slots.extend([slot] * roster_slots[slot])
+    return slots
+
+
+def optimal_lineup(entries, roster_slots):
+    '''Best possible starting lineup from a boxscore playerList
+
+    Each starting spot of ``roster_slots`` (including flex slots) is
+    filled by a player eligible for it, maximizing total points. Returns
+    (points, [(slot name, RosterEntry or None), ...]).
+    '''
+    slots = lineup_slots(roster_slots)
+    players = [entry for entry in entries if entry.player_id != 'empty']
+    if not slots:
+        return 0, []
+    # one free "empty" column per slot keeps every slot fillable, so the
+    # ineligible cost is never part of an optimal assignment
+    ineligible = sum(abs(entry.points) for entry in players) + 1
+    cost = []
+    for slot in slots:
+        row = [-entry.points if slot in entry.eligible_slots else ineligible for entry in players]
+        cost.append(row + [0] * len(slots))
+    lineup = []
+    points = 0
+    for slot, column in zip(slots, assign(cost)):
+        entry = players[column] if column < len(players) else None
+        if entry is not None:
+            points += entry.points
+        lineup.append((lineupSlots.get(slot, slot), entry))
+    return points, lineup
+
+
+def lineup_efficiency(boxscore, roster_slots):
+    '''Compares a boxscore's started lineup with its optimal lineup
+
+    Returns a dict with the started ``points``, ``optimalPoints``,
+    ``benchPointsLost`` and ``efficiency`` (points / optimalPoints).
+    '''
+    entries = boxscore['playerList']
+    points = sum(entry.points for entry in entries
+                 if entry.slot not in ('Bench', 'IR'))
+    optimal, lineup = optimal_lineup(entries, roster_slots)
+    return {'teamId': boxscore['teamId'],
+            'week': boxscore['week'],
+            'points': points,
+            'optimalPoints': optimal,
+            'benchPointsLost': optimal - points,
+            'efficiency': points / optimal if optimal else 1.0,
+            'optimalLineup': lineup}
+
+
+def season_efficiency(boxscores, roster_slots):
+    '''Runs lineup_efficiency over League.season_boxscores() output
+
+    Returns {week: {teamId: efficiency dict}}.
+    '''
+    return {week: {team: lineup_efficiency(boxscore, roster_slots)
+                   for team, boxscore in teams.items()}
+            for week, teams in boxscores.items()}
@@ -0,0 +1,118 @@
+import hashlib
+import time
+
+from .league import _lean
+
+
+class LiveScoreboard(object):
+    '''Polls a week's boxscores and tells subscribers what changed
+
+    Each poll requests the week's mBoxscore view, which is revalidated
+    instead of downloaded again when the league's transport has a cache,
+    and is only parsed when its body differs from the last parsed poll. Subscribers are called
+    with a list of deltas, one per team total or player whose points
+    changed: {'teamId', 'playerId' (None for the team total),
+    'playerName', 'points', 'delta'}.
+
+    The interval follows the kickoff times in ``League.nflTeams``: every
+    ``fast`` seconds while a game is on, otherwise until the next kickoff,
+    but never longer than ``slow`` seconds.
+    '''
+    def __init__(self, league, week=None, fast=15, slow=600, game_length=4 * 3600,
+                 clock=time.time, sleep=time.sleep):
+        self.league = league
+        self.week = week if week is not None else league.current_week
+        self.fast = fast
+        self.slow = slow
+        self.game_length = game_length
+        self.clock = clock
+        self.sleep = sleep
+        self.polls = 0
+        self.snapshot = {}
+        self._digest = None
+        self._subscribers = []
+        self._kickoffs = sorted(set(game['date'] / 1000.0
+                                    for team in league.nflTeams.records()
+                                    for game in _games(team, self.week)))
+
+    def __repr__(self):
+        return 'LiveScoreboard(%r, week %s)' % (self.league, self.week, )
+
+    def subscribe(self, callback):
+        '''Calls callback(deltas) after every poll that changed points'''
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        self._subscribers.remove(callback)
+
+    def poll(self):
+        '''Fetches the week once and returns the deltas since the last poll'''
+        league = self.league
+        r = league._get_league_view(league._boxscore_query(self.week), ttl=0)
+        self.polls += 1
+        digest = hashlib.sha1(r.content).hexdigest()
+        if digest == self._digest:
+            return []
+        snapshot = _snapshot(league._timed(league._parse_boxscores, r, self.week, _lean(self.week, True, ())))
+        self._digest = digest
+        deltas = _diff(self.snapshot, snapshot)
+        self.snapshot = snapshot
+        if deltas:
+            for callback in list(self._subscribers):
+                callback(deltas)
+        return deltas
+
+    def next_interval(self, now=None):
+        '''Seconds until the next poll, or None once the week's games are over'''
+        now = self.clock() if now is None else now
+        if not self._kickoffs:
+            return None
+        if any(kickoff <= now < kickoff + self.game_length for kickoff in self._kickoffs):
+            return self.fast
+        upcoming = [kickoff for kickoff in self._kickoffs if kickoff > now]
+        if not upcoming:
+            return None
+        return max(self.fast, min(self.slow, upcoming[0] - now))
+
+    def run(self, max_polls=None):
+        '''Polls until the week's last game is over or max_polls is reached'''
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            self.poll()
+            polls += 1
+            interval = self.next_interval()
+            if interval is None:
+                return
+            self.sleep(interval)
+
+
+def _games(team, week):
+    '''Returns a pro team's games of a scoring period'''
+    if not team['games']:
+        return []
+    return team['games'].get(str(week), [])
+
+
+def _snapshot(boxscores):
+    '''Returns {(teamId, playerId): (playerName, points)}; playerId None is the team total'''
+    snapshot = {}
+    for team, boxscore in boxscores.items():
+        snapshot[(team, None)] = (boxscore['teamName'], boxscore['teamPoints'])
+        for entry in boxscore['playerList']:
+            if entry.player_id != 'empty':
+                snapshot[(team, entry.player_id)] = (entry.name, entry.points)
+    return snapshot
+
+
+def _diff(old, new):
+    deltas = []
+    for key, (name, points) in new.items():
+        previous = old.get(key, (name, 0))[1]
+        if points != previous:
+            deltas.append({'teamId': key[0],
+                           'playerId': key[1],
+                           'playerName': name,
+                           'points': points,
+                           'delta': points - previous})
+    return deltas
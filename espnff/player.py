@@ -1,11 +1,167 @@
-class Player(object):
-    def __init__(sef, data):
-        self.data = data
-        self._fetch_player_info()
+from array import array
+from bisect import bisect_left
 
-    def __rep__(self):
-        display = 'Players('
+from .boxCodes import (lineupSlots,
+                       nflTeams,
+                       playerPos)
 
-    def _fetch_player_info(self):
-        return none;
-    
+
+class Record(object):
+    '''Base for compact slotted records
+
+    ``_keys`` maps the dict keys earlier versions returned to attribute
+    names, so ``record['playerId']`` keeps working.
+    '''
+    __slots__ = ()
+    _keys = {}
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, self._keys[key])
+        except KeyError:
+            raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def keys(self):
+        return self._keys.keys()
+
+    def to_dict(self):
+        '''Returns the record in its dict form'''
+        return {key: getattr(self, name) for key, name in self._keys.items()}
+
+
+class Player(Record):
+    '''Player in a season's player pool'''
+    __slots__ = ('player_id', 'name', 'position', 'pro_team', 'eligible_slots')
+    _keys = {'playerId': 'player_id',
+             'player': 'name',
+             'position': 'position',
+             'team': 'pro_team',
+             'slots': 'eligible_slots'}
+
+    def __init__(self, data):
+        self._fetch_player_info(data)
+
+    def __repr__(self):
+        return 'Player(%s)' % (self.name, )
+
+    def _fetch_player_info(self, data):
+        '''Keeps the fields League uses from a players_wl entry'''
+        self.player_id = data['id']
+        self.name = data['fullName'].replace("'", "_")
+        self.position = data['defaultPositionId']
+        self.pro_team = data['proTeamId']
+        self.eligible_slots = tuple(data['eligibleSlots'])
+
+
+class StatLine(Record):
+    '''One stats entry of a player, with stat values held in numeric arrays
+
+    ``stat_ids`` is sorted so ``get`` can bisect it; ``stat_ids`` and
+    ``values`` hold the raw stats without the per-key dict overhead.
+    '''
+    __slots__ = ('period', 'source', 'split', 'applied_total', 'stat_ids', 'values')
+    _keys = {'scoringPeriodId': 'period',
+             'statSourceId': 'source',
+             'statSplitTypeId': 'split',
+             'appliedTotal': 'applied_total',
+             'stats': 'stats'}
+
+    def __init__(self, data, stat_ids=None):
+        self.period = data.get('scoringPeriodId')
+        self.source = data.get('statSourceId')
+        self.split = data.get('statSplitTypeId')
+        self.applied_total = data.get('appliedTotal', 0)
+        stats = sorted((int(stat), value) for stat, value in data.get('stats', {}).items())
+        if stat_ids is not None:
+            stats = [(stat, value) for stat, value in stats if stat in stat_ids]
+        self.stat_ids = array('H', [stat for stat, value in stats])
+        self.values = array('d', [value for stat, value in stats])
+
+    def __repr__(self):
+        return 'StatLine(%s, %s)' % (self.period, self.source, )
+
+    @property
+    def stats(self):
+        '''Stats in the {'statId': value} form of the API'''
+        return {str(stat): value for stat, value in zip(self.stat_ids, self.values)}
+
+    def get(self, stat_id, default=0):
+        '''Returns the value of one stat id'''
+        i = bisect_left(self.stat_ids, stat_id)
+        if i < len(self.stat_ids) and self.stat_ids[i] == stat_id:
+            return self.values[i]
+        return default
+
+
+def lean_stats(stats, periods, stat_ids=None, sources=(0, )):
+    '''Keeps the stats entries of the given periods and sources as StatLines'''
+    stat_ids = frozenset(stat_ids) if stat_ids is not None else None
+    return tuple(StatLine(line, stat_ids) for line in stats
+                 if line.get('scoringPeriodId') in periods and line.get('statSourceId') in sources)
+
+
+class RosterEntry(Record):
+    '''Player in a team's lineup for one week
+
+    With ``periods``, ``stats`` holds only the actual StatLines of those
+    scoring periods, restricted to ``stat_ids`` when given, instead of the
+    player's full stats history.
+    '''
+    __slots__ = ('player_id', 'name', 'pro_team', 'slot', 'health_status',
+                 'stats', 'position', 'points', 'eligible_slots')
+    _keys = {'playerName': 'name',
+             'playerId': 'player_id',
+             'playerTeam': 'pro_team',
+             'slot': 'slot',
+             'healthStatus': 'health_status',
+             'stats': 'stats',
+             'playerPos': 'position',
+             'Points': 'points',
+             'eligibleSlots': 'eligible_slots'}
+
+    def __init__(self, data, periods=None, stat_ids=None):
+        self._fetch_entry_info(data)
+        if periods is not None and self.stats != 'empty':
+            self.stats = lean_stats(self.stats, periods, stat_ids)
+
+    def __repr__(self):
+        return 'RosterEntry(%s, %s)' % (self.name, self.slot, )
+
+    def _fetch_entry_info(self, data):
+        '''Reads a rosterForCurrentScoringPeriod entry'''
+        self.slot = lineupSlots[data['lineupSlotId']]
+        self.health_status = 'empty'
+        if 'player' in data['playerPoolEntry']:
+            playerInfo = data['playerPoolEntry']['player']
+            self.name = playerInfo['fullName']
+            self.player_id = playerInfo['id']
+            self.pro_team = nflTeams[playerInfo['proTeamId']]
+            self.stats = playerInfo['stats']
+            self.position = playerPos[playerInfo['defaultPositionId']]
+            self.points = data['playerPoolEntry'].get('appliedStatTotal', 0)
+            self.eligible_slots = tuple(playerInfo.get('eligibleSlots', ()))
+        else:
+            self.name = 'empty'
+            self.player_id = 'empty'
+            self.pro_team = 'empty'
+            self.stats = 'empty'
+            self.position = 'empty'
+            self.points = 0
+            self.eligible_slots = ()
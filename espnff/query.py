@@ -0,0 +1,155 @@
+import json
+
+
+VIEWS = frozenset([
+    'kona_league_communication',
+    'kona_player_info',
+    'kona_playercard',
+    'mBoxscore',
+    'mDraftDetail',
+    'mLiveScoring',
+    'mMatchup',
+    'mMatchupScore',
+    'mNav',
+    'mPendingTransactions',
+    'mPositionalRatings',
+    'mRoster',
+    'mScoreboard',
+    'mSettings',
+    'mStatus',
+    'mTeam',
+    'mTransactions2',
+    'players_wl',
+    'proTeamSchedules',
+    'proTeamSchedules_wl',
+])
+
+STATUSES = frozenset(['FREEAGENT', 'WAIVERS', 'ONTEAM'])
+
+SORTS = {
+    'percentOwned': 'sortPercOwned',
+    'appliedTotal': 'sortAppliedStatTotal',
+    'draftRank': 'sortDraftRanks',
+    'transactionDate': 'sortTransactionDate',
+}
+
+
+class Query(object):
+    '''Builds the view params and x-fantasy-filter header of one request
+
+    ``players`` filters the player list nested in a league response and
+    ``filter`` filters the top level of the players endpoint:
+
+    >>> query = Query('kona_player_info', scoringPeriodId=3)
+    >>> query.players.status('FREEAGENT').sort('percentOwned').page(25)
+    >>> params, headers = query.build()
+    '''
+    def __init__(self, *views, **params):
+        self.views = []
+        self.params = {}
+        self._players = None
+        self._filter = None
+        self.view(*views)
+        self.param(**params)
+
+    def __repr__(self):
+        return 'Query(%s)' % (', '.join(self.views), )
+
+    def view(self, *views):
+        '''Adds views to the request'''
+        for view in views:
+            if view not in VIEWS:
+                raise ValueError('Unknown view %r' % (view, ))
+            if view not in self.views:
+                self.views.append(view)
+        return self
+
+    def param(self, **params):
+        '''Adds query string params; None values are dropped'''
+        for key, value in params.items():
+            if value is not None:
+                self.params[key] = value
+        return self
+
+    @property
+    def players(self):
+        '''PlayerFilter sent under the "players" key'''
+        if self._players is None:
+            self._players = PlayerFilter()
+        return self._players
+
+    @property
+    def filter(self):
+        '''PlayerFilter sent as the whole header'''
+        if self._filter is None:
+            self._filter = PlayerFilter()
+        return self._filter
+
+    def build(self):
+        '''Returns (params, headers) for Transport.get'''
+        if not self.views:
+            raise ValueError('A query needs at least one view')
+        params = dict(self.params)
+        params['view'] = self.views[0] if len(self.views) == 1 else list(self.views)
+
+        filters = {}
+        if self._filter is not None:
+            filters.update(self._filter.to_dict())
+        if self._players is not None:
+            filters['players'] = self._players.to_dict()
+        headers = None
+        if filters:
+            headers = {'x-fantasy-filter': json.dumps(filters, sort_keys=True)}
+        return params, headers
+
+
+class PlayerFilter(object):
+    '''Validated player filter of an x-fantasy-filter header'''
+    def __init__(self):
+        self._filters = {}
+        self._sorts = 0
+
+    def __repr__(self):
+        return 'PlayerFilter(%s)' % (self._filters, )
+
+    def active(self, active=True):
+        self._filters['filterActive'] = {'value': bool(active)}
+        return self
+
+    def status(self, *statuses):
+        for status in statuses:
+            if status not in STATUSES:
+                raise ValueError('Unknown player status %r' % (status, ))
+        self._filters['filterStatus'] = {'value': list(statuses)}
+        return self
+
+    def slots(self, *slot_ids):
+        '''Keeps players eligible for any of the lineup slots'''
+        self._filters['filterSlotIds'] = {'value': [int(slot) for slot in slot_ids]}
+        return self
+
+    def ids(self, *player_ids):
+        '''Keeps only the given players'''
+        self._filters['filterIds'] = {'value': [int(player) for player in player_ids]}
+        return self
+
+    def sort(self, key, ascending=False, value=None):
+        '''Sorts by key; repeated calls add lower priority sorts'''
+        if key not in SORTS:
+            raise ValueError('Unknown sort %r' % (key, ))
+        self._sorts += 1
+        sort = {'sortPriority': self._sorts, 'sortAsc': ascending}
+        if value is not None:
+            sort['value'] = value
+        self._filters[SORTS[key]] = sort
+        return self
+
+    def page(self, limit, offset=0):
+        if int(limit) < 0 or int(offset) < 0:
+            raise ValueError('limit and offset must not be negative')
+        self._filters['limit'] = int(limit)
+        self._filters['offset'] = int(offset)
+        return self
+
+    def to_dict(self):
+        return dict(self._filters)
@@ -0,0 +1,90 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError('numpy is required for this feature: pip install espnff[numpy]')
+
+
+class PowerRankings(object):
+    '''Vectorized two-step dominance power rankings
+
+    ``wins`` is a (weeks, teams, teams) array where ``wins[w, i, j]`` is 1
+    when team i beat team j in week w, and ``scores`` and ``mov`` are
+    (weeks, teams). Any leading axes, e.g. (leagues, weeks, teams, teams),
+    are treated as independent leagues ranked in the same call.
+
+    Scores use the weights of ``utils.power_points`` (80% dominance, 15%
+    average score, 5% average margin of victory) without string rounding.
+    '''
+    def __init__(self, wins, scores, mov=None):
+        _require_numpy()
+        wins = np.asarray(wins, dtype=float)
+        scores = np.asarray(scores, dtype=float)
+        mov = np.zeros_like(scores) if mov is None else np.asarray(mov, dtype=float)
+        self.weeks = wins.shape[-3]
+        self.wins = wins.sum(axis=-3)
+        self.points = scores.sum(axis=-2)
+        self.margin = mov.sum(axis=-2)
+        self._history = (wins, scores, mov)
+
+    def __repr__(self):
+        return 'PowerRankings(%s weeks, %s teams)' % (self.weeks, self.wins.shape[-1], )
+
+    def add_week(self, wins, scores, mov=None):
+        '''Adds one week of results without recomputing earlier weeks'''
+        wins = np.asarray(wins, dtype=float)
+        scores = np.asarray(scores, dtype=float)
+        mov = np.zeros_like(scores) if mov is None else np.asarray(mov, dtype=float)
+        self.weeks += 1
+        self.wins = self.wins + wins
+        self.points = self.points + scores
+        self.margin = self.margin + mov
+        history_wins, history_scores, history_mov = self._history
+        self._history = (np.concatenate([history_wins, wins[..., None, :, :]], axis=-3),
+                         np.concatenate([history_scores, scores[..., None, :]], axis=-2),
+                         np.concatenate([history_mov, mov[..., None, :]], axis=-2))
+
+    def dominance(self):
+        '''Two-step dominance of each team: row sums of W @ W + W'''
+        return two_step_dominance(self.wins)
+
+    def scores(self):
+        '''Power score of each team through the latest week'''
+        weeks = max(self.weeks, 1)
+        return (self.dominance() * 0.8 + self.points / weeks * 0.15 +
+                self.margin / weeks * 0.05)
+
+    def by_week(self):
+        '''Power scores after every week, shaped (..., weeks, teams)'''
+        wins, scores, mov = self._history
+        weeks = np.arange(1, wins.shape[-3] + 1, dtype=float)[:, None]
+        dominance = two_step_dominance(np.cumsum(wins, axis=-3))
+        return (dominance * 0.8 + np.cumsum(scores, axis=-2) / weeks * 0.15 +
+                np.cumsum(mov, axis=-2) / weeks * 0.05)
+
+    def rank(self, teams=None):
+        '''Returns (score, team) pairs, best first, for a single league'''
+        scores = self.scores()
+        if scores.ndim != 1:
+            raise ValueError('rank() needs a single league; use scores() for batches')
+        if teams is None:
+            teams = range(len(scores))
+        order = np.argsort(-scores, kind='stable')
+        teams = list(teams)
+        return [(float(scores[i]), teams[i]) for i in order]
+
+
+def two_step_dominance(wins):
+    '''Row sums of W @ W + W for any stack of square win matrices
+
+    The row sums of W @ W equal W @ (row sums of W), so only a
+    matrix-vector product is needed.
+    '''
+    _require_numpy()
+    wins = np.asarray(wins, dtype=float)
+    row_sums = wins.sum(axis=-1)
+    return np.matmul(wins, row_sums[..., None])[..., 0] + row_sums
@@ -0,0 +1,89 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+
+class TokenBucket(object):
+    '''Thread-safe token bucket refilled at ``rate`` tokens per second
+
+    Implemented as a virtual schedule: each call reserves the next free
+    send time, so waiting threads are released one interval apart rather
+    than all at once when tokens come back.
+    '''
+    def __init__(self, rate, burst=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self.clock = clock
+        self.sleep = sleep
+        self._interval = 1.0 / self.rate
+        self._tolerance = (self.burst - 1) * self._interval
+        self._next = clock()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return 'TokenBucket(%s/s, burst=%s)' % (self.rate, self.burst, )
+
+    def reserve(self):
+        '''Takes a token and returns the seconds to wait before using it'''
+        with self._lock:
+            now = self.clock()
+            start = max(now, self._next - self._tolerance)
+            self._next = max(self._next, now) + self._interval
+            return start - now
+
+    def acquire(self):
+        '''Blocks until a token is available'''
+        wait = self.reserve()
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+    def pause(self, seconds):
+        '''Holds back every caller for seconds, e.g. after a 429'''
+        with self._lock:
+            self._next = max(self._next, self.clock() + seconds + self._tolerance)
+
+
+class RateLimiter(object):
+    '''Token buckets per host, shared by every thread using a Transport'''
+    def __init__(self, rate=10, burst=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return 'RateLimiter(%s/s per host)' % (self.rate, )
+
+    def bucket(self, url):
+        '''Returns the bucket of a url's host'''
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.burst, self.clock, self.sleep)
+            return self._buckets[host]
+
+    def acquire(self, url):
+        return self.bucket(url).acquire()
+
+    def pause(self, url, seconds):
+        self.bucket(url).pause(seconds)
+
+
+def retry_after(response):
+    '''Seconds a response's Retry-After header asks to wait, or None'''
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
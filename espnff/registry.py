@@ -0,0 +1,118 @@
+import asyncio
+import threading
+from collections import OrderedDict
+
+
+class SeasonRegistry(object):
+    '''Process-wide, season-keyed store of league-independent data
+
+    Every League of a season references the same stored object. At most
+    ``maxsize`` seasons are kept, evicting the least recently used.
+    '''
+    def __init__(self, maxsize=4):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._loading = {}
+        self._tasks = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return 'SeasonRegistry(%s)' % (list(self._entries), )
+
+    def __contains__(self, year):
+        return year in self._entries
+
+    def get(self, year, loader):
+        '''Returns the season's entry, calling loader() once if it is missing'''
+        value = self.peek(year)
+        if value is not None:
+            return value
+        with self._lock:
+            year_lock = self._loading.setdefault(year, threading.Lock())
+        with year_lock:
+            value = self.peek(year)
+            if value is None:
+                value = self.put(year, loader())
+        return value
+
+    async def get_async(self, year, loader):
+        '''Awaits the season's entry, awaiting loader() once if it is missing
+
+        Coroutines asking for a season that is still loading await the
+        same task instead of starting their own download.
+        '''
+        value = self.peek(year)
+        if value is not None:
+            return value
+        key = (asyncio.get_event_loop(), year)
+        with self._lock:
+            task = self._tasks.get(key)
+            if task is None:
+                task = self._tasks[key] = asyncio.ensure_future(self._load_async(key, loader))
+        return await asyncio.shield(task)
+
+    async def _load_async(self, key, loader):
+        try:
+            value = self.peek(key[1])
+            if value is None:
+                value = self.put(key[1], await loader())
+            return value
+        finally:
+            with self._lock:
+                self._tasks.pop(key, None)
+
+    def peek(self, year):
+        '''Returns the season's entry or None without loading it'''
+        with self._lock:
+            if year not in self._entries:
+                return None
+            self._entries.move_to_end(year)
+            return self._entries[year]
+
+    def put(self, year, value):
+        '''Stores a season's entry, evicting the oldest season if full'''
+        with self._lock:
+            self._put(year, value)
+        return value
+
+    def _put(self, year, value):
+        self._entries[year] = value
+        self._entries.move_to_end(year)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def refresh(self, year, loader):
+        '''Reloads a season's entry in place so every holder sees the new data
+
+        Entries with a ``replace`` method, like RecordIndex, take over the
+        new value's contents. A dict entry is updated with the new keys
+        before the missing ones are dropped, so readers on other threads
+        never find it empty.
+        '''
+        value = loader()
+        with self._lock:
+            current = self._entries.get(year)
+            if hasattr(current, 'replace'):
+                current.replace(value)
+                self._entries.move_to_end(year)
+                return current
+            if not isinstance(current, dict):
+                self._put(year, value)
+                return value
+            current.update(value)
+            for key in [key for key in current if key not in value]:
+                del current[key]
+            self._entries.move_to_end(year)
+            return current
+
+    def evict(self, year):
+        with self._lock:
+            self._entries.pop(year, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+player_registry = SeasonRegistry()
+pro_team_registry = SeasonRegistry()
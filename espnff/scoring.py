@@ -0,0 +1,143 @@
+from .player import StatLine
+from .rankings import np, _require_numpy
+
+
+BENCH_SLOTS = frozenset(['Bench', 'IR'])
+
+
+class ScoringEngine(object):
+    '''Computes fantasy points from raw stats with a league's scoring rules
+
+    ``scoring_items`` is ``Settings.scoring_items``: each item gives the
+    points per unit of a stat id and, in ``pointsOverrides``, the points
+    for players eligible for a lineup slot (e.g. {'16': 2.0} for D/ST).
+    Stats of many players and weeks are scored in one matrix product.
+    '''
+    def __init__(self, scoring_items):
+        _require_numpy()
+        self.scoring_items = scoring_items
+        self.stat_ids = np.array(sorted(set(int(item['statId']) for item in scoring_items)), dtype=int)
+        columns = {stat: i for i, stat in enumerate(self.stat_ids)}
+        self.points = np.zeros(len(self.stat_ids))
+        overrides = {}
+        for item in scoring_items:
+            column = columns[int(item['statId'])]
+            self.points[column] = item.get('points', 0)
+            for slot, points in (item.get('pointsOverrides') or {}).items():
+                overrides.setdefault(int(slot), {})[column] = points
+        self.override_slots = sorted(overrides)
+        # row 0 is the default scoring, row i + 1 the scoring of override_slots[i]
+        self.weights = np.tile(self.points, (len(self.override_slots) + 1, 1))
+        for i, slot in enumerate(self.override_slots):
+            for column, points in overrides[slot].items():
+                self.weights[i + 1, column] = points
+
+    def __repr__(self):
+        return 'ScoringEngine(%s stats)' % (len(self.stat_ids), )
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(settings.scoring_items)
+
+    def with_points(self, points=None, overrides=None):
+        '''Returns an engine with changed rules for what-if scoring
+
+        ``points`` maps stat ids to new points per unit and ``overrides``
+        maps stat ids to new {slotId: points} overrides; a stat id not
+        scored yet is added.
+        '''
+        items = {int(item['statId']): dict(item) for item in self.scoring_items}
+        for stat, value in (points or {}).items():
+            items.setdefault(int(stat), {'statId': int(stat)})['points'] = value
+        for stat, value in (overrides or {}).items():
+            items.setdefault(int(stat), {'statId': int(stat), 'points': 0})['pointsOverrides'] = value
+        return ScoringEngine([items[stat] for stat in sorted(items)])
+
+    def stat_matrix(self, lines):
+        '''Returns a (lines, stat_ids) array of the scored stats of each line
+
+        Lines are StatLine records or stats entries of the API; stats the
+        league does not score are dropped.
+        '''
+        rows, stats, values = [], [], []
+        for row, line in enumerate(lines):
+            if isinstance(line, StatLine):
+                ids, line_values = line.stat_ids, line.values
+            else:
+                items = line['stats'].items()
+                ids = [int(stat) for stat, value in items]
+                line_values = [value for stat, value in items]
+            rows.extend([row] * len(ids))
+            stats.extend(ids)
+            values.extend(line_values)
+        matrix = np.zeros((len(lines), len(self.stat_ids)))
+        if not stats:
+            return matrix
+        stats = np.array(stats, dtype=int)
+        columns = np.searchsorted(self.stat_ids, stats)
+        columns[columns == len(self.stat_ids)] = 0
+        scored = self.stat_ids[columns] == stats
+        matrix[np.array(rows)[scored], columns[scored]] = np.array(values, dtype=float)[scored]
+        return matrix
+
+    def score(self, lines, eligible=None):
+        '''Returns the points of each stats line
+
+        ``eligible`` holds each line's eligible lineup slots and selects
+        the overrides to apply; without it the default points are used.
+        '''
+        matrix = self.stat_matrix(lines)
+        if eligible is None or not self.override_slots:
+            return matrix @ self.points
+        rules = np.zeros(len(matrix), dtype=int)
+        for row, slots in enumerate(eligible):
+            for i, slot in enumerate(self.override_slots):
+                if slot in slots:
+                    rules[row] = i + 1
+                    break
+        return np.einsum('ij,ij->i', matrix, self.weights[rules])
+
+    def score_entries(self, entries, week):
+        '''Returns the points of boxscore RosterEntry records for a week
+
+        Only the actual stats of the week are scored; empty slots score 0.
+        '''
+        return self._score_weeks(entries, [week] * len(entries))
+
+    def score_boxscores(self, boxscores):
+        '''Rescores League.season_boxscores() output in one pass
+
+        Returns {week: {teamId: points}} counting players outside the
+        bench and IR slots.
+        '''
+        entries, weeks, teams = [], [], []
+        totals = {}
+        for week, boxscores_by_team in boxscores.items():
+            totals[week] = {}
+            for team, boxscore in boxscores_by_team.items():
+                totals[week][team] = 0.0
+                for entry in boxscore['playerList']:
+                    if entry.slot not in BENCH_SLOTS:
+                        entries.append(entry)
+                        weeks.append(week)
+                        teams.append(team)
+        for week, team, points in zip(weeks, teams, self._score_weeks(entries, weeks)):
+            totals[week][team] += float(points)
+        return totals
+
+    def _score_weeks(self, entries, weeks):
+        '''Scores each entry's actual stats line of the matching week'''
+        lines, eligible, rows = [], [], []
+        for row, (entry, week) in enumerate(zip(entries, weeks)):
+            if entry.stats == 'empty':
+                continue
+            for line in entry.stats:
+                if line['scoringPeriodId'] == week and line['statSourceId'] == 0:
+                    lines.append(line)
+                    eligible.append(entry.eligible_slots)
+                    rows.append(row)
+                    break
+        points = np.zeros(len(entries))
+        if lines:
+            points[rows] = self.score(lines, eligible)
+        return points
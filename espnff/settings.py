@@ -1,6 +1,44 @@
+ROSTER_MAP = {
+    0: 'QB',
+    1: 'TQB',
+    2: 'RB',
+    3: 'RB/WR',
+    4: 'WR',
+    5: 'WR/TE',
+    6: 'TE',
+    7: 'OP',
+    8: 'DT',
+    9: 'DE',
+    10: 'LB',
+    11: 'DL',
+    12: 'CB',
+    13: 'S',
+    14: 'DB',
+    15: 'DP',
+    16: 'D/ST',
+    17: 'K',
+    18: 'P',
+    19: 'HC',
+    20: 'BE',
+    21: 'IR',
+    22: '',
+    23: 'RB/WR/TE'
+}
+
+
 class Settings(object):
-    '''Creates Settings object'''
+    '''Creates Settings object from a leagueSettings (v2) or mSettings (v3) response'''
     def __init__(self, data):
+        if 'leaguesettings' in data:
+            self._fetch_v2_settings(data)
+        else:
+            self._fetch_v3_settings(data)
+
+    def __repr__(self):
+        return 'Settings(%s)' % (self.name)
+
+    def _fetch_v2_settings(self, data):
+        '''Grabs settings from the v2 leagueSettings response'''
         self.reg_season_count = data['leaguesettings']['finalRegularSeasonMatchupPeriodId']
         self.undroppable_list = data['leaguesettings']['usingUndroppableList']
         self.veto_votes_required = data['leaguesettings']['vetoVotesRequired']
@@ -17,42 +55,60 @@ class Settings(object):
         self.status = data['metadata']['status']
         self.year = data['metadata']['seasonId']
         self.server_date = data['metadata']['serverDate']
+        self.scoring_items = data['leaguesettings'].get('scoringItems', [])
         self._fetch_roster_settings(data)
         self._fetch_tie_rules(data)
 
-    def __repr__(self):
-        return 'Settings(%s)' % (self.name)
+    def _fetch_v3_settings(self, data):
+        '''Grabs settings from the v3 mSettings response'''
+        settings = data['settings']
+        schedule = settings['scheduleSettings']
+        roster = settings['rosterSettings']
+        self.reg_season_count = schedule['matchupPeriodCount']
+        self.undroppable_list = roster.get('isUsingUndroppableList')
+        self.veto_votes_required = settings['tradeSettings'].get('vetoVotesRequired')
+        self.team_count = settings['size']
+        periods = [int(period) for period in schedule.get('matchupPeriods', {})]
+        self.final_season_count = max(periods) if periods else self.reg_season_count
+        self.playoff_team_count = schedule['playoffTeamCount']
+        self.id = data['id']
+        self.keeper_count = settings.get('draftSettings', {}).get('keeperCount')
+        self.trade_deadline = settings['tradeSettings'].get('deadlineDate', 'Unknown')
+        self.name = settings['name']
+        self.status = data.get('status', {}).get('isActive')
+        self.year = data['seasonId']
+        self.server_date = None
+        self.scoring_items = settings['scoringSettings']['scoringItems']
+
+        roster_map = ROSTER_MAP
+        self.roster_slots = {int(slot): num for slot, num in roster['lineupSlotCounts'].items()
+                             if num != 0}
+        self.roster = {roster_map[slot]: num for slot, num in self.roster_slots.items()}
+
+        tie_map = {
+                   'NONE': 'None',
+                   'HOME_TEAM_WINS': 'Home Team Wins',
+                   'MOST_BENCH_POINTS': 'Most Bench Points',
+                   'MOST_QB_POINTS': 'Most QB Points',
+                   'MOST_RB_POINTS': 'Most RB Points'
+                  }
+        self.tie_rule = tie_map.get(settings['scoringSettings'].get('matchupTieRule'), 'Unknown')
+
+        playoff_tie_map = {
+                           'H2H_RECORD': 'Head to Head Record',
+                           'TOTAL_POINTS_SCORED': 'Total Points For',
+                           'INTRA_DIVISION_RECORD': 'Intra Division Record',
+                           'TOTAL_POINTS_AGAINST': 'Total Points Against'
+                          }
+        self.playoff_seed_tie_rule = playoff_tie_map.get(schedule.get('playoffSeedingRule'), 'Unknown')
 
     def _fetch_roster_settings(self, data):
         '''Grabs roster settings'''
-        roster_map = {
-                      0: 'QB',
-                      1: 'TQB',
-                      2: 'RB',
-                      3: 'RB/WR',
-                      4: 'WR',
-                      5: 'WR/TE',
-                      6: 'TE',
-                      7: 'OP',
-                      8: 'DT',
-                      9: 'DE',
-                      10: 'LB',
-                      11: 'DL',
-                      12: 'CB',
-                      13: 'S',
-                      14: 'DB',
-                      15: 'DP',
-                      16: 'D/ST',
-                      17: 'K',
-                      18: 'P',
-                      19: 'HC',
-                      20: 'BE',
-                      21: 'IR',
-                      22: '',
-                      23: 'RB/WR/TE'
-                      }
+        roster_map = ROSTER_MAP
 
         roster = data['leaguesettings']['slotCategoryItems']
+        self.roster_slots = {i['slotCategoryId']: i['num'] for i in roster
+                             if i['num'] != 0}
         self.roster = {roster_map[i['slotCategoryId']]: i['num'] for i in roster
                        if i['num'] != 0}
 
@@ -0,0 +1,125 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from .rankings import np, _require_numpy
+
+
+CHUNK_SIZE = 10000
+
+
+def playoff_odds(teams, played, remaining, playoff_team_count,
+                 tie_rule='Total Points For', n_sims=10000, processes=None, seed=None):
+    '''Monte Carlo odds of each team making the playoffs
+
+    ``played`` holds (home, away, home_points, away_points) for finished
+    regular season matchups and ``remaining`` holds (home, away) for the
+    rest. Remaining scores are drawn from a normal distribution fitted to
+    each team's played scores, and seeding is decided by wins and then
+    ``tie_rule`` (a ``Settings.playoff_seed_tie_rule`` value). Division
+    membership is not loaded, so 'Intra Division Record' falls back to
+    points for.
+
+    Returns {team: {'playoffs': probability, 'seeds': [probability, ...]}}.
+    With ``processes``, simulations are split across that many processes.
+    '''
+    _require_numpy()
+    season = _season_arrays(teams, played, remaining)
+    seeds = np.random.SeedSequence(seed)
+    chunks = [CHUNK_SIZE] * (n_sims // CHUNK_SIZE)
+    if n_sims % CHUNK_SIZE:
+        chunks.append(n_sims % CHUNK_SIZE)
+    jobs = [(season, playoff_team_count, tie_rule, size, child)
+            for size, child in zip(chunks, seeds.spawn(len(chunks)))]
+
+    if processes:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            counts = list(executor.map(_simulate_job, jobs))
+    else:
+        counts = [_simulate_job(job) for job in jobs]
+    seed_counts = np.sum(counts, axis=0)
+
+    odds = {}
+    for i, team in enumerate(teams):
+        seeds_odds = seed_counts[i] / float(n_sims)
+        odds[team] = {'playoffs': float(seeds_odds.sum()),
+                      'seeds': [float(p) for p in seeds_odds]}
+    return odds
+
+
+def _season_arrays(teams, played, remaining):
+    '''Converts matchups into the arrays shared by every simulation'''
+    index = {team: i for i, team in enumerate(teams)}
+    n = len(teams)
+    wins = np.zeros(n)
+    points_for = np.zeros(n)
+    points_against = np.zeros(n)
+    head_to_head = np.zeros((n, n))
+    scores = [[] for team in teams]
+    for home, away, home_points, away_points in played:
+        h, a = index[home], index[away]
+        scores[h].append(home_points)
+        scores[a].append(away_points)
+        points_for[h] += home_points
+        points_for[a] += away_points
+        points_against[h] += away_points
+        points_against[a] += home_points
+        result = np.sign(home_points - away_points) * 0.5 + 0.5
+        wins[h] += result
+        wins[a] += 1 - result
+        head_to_head[h, a] += result
+        head_to_head[a, h] += 1 - result
+
+    played_scores = [s for team_scores in scores for s in team_scores]
+    league_std = np.std(played_scores) if len(played_scores) > 1 else 1.0
+    league_mean = np.mean(played_scores) if played_scores else 0.0
+    mean = np.array([np.mean(s) if s else league_mean for s in scores])
+    std = np.array([np.std(s, ddof=1) if len(s) > 1 else league_std for s in scores])
+
+    home = np.array([index[h] for h, a in remaining], dtype=int)
+    away = np.array([index[a] for h, a in remaining], dtype=int)
+    return {'wins': wins, 'points_for': points_for, 'points_against': points_against,
+            'head_to_head': head_to_head, 'mean': mean, 'std': std,
+            'home': home, 'away': away}
+
+
+def _simulate_job(job):
+    season, playoff_team_count, tie_rule, n_sims, seed = job
+    return _simulate(season, playoff_team_count, tie_rule, n_sims, np.random.default_rng(seed))
+
+
+def _simulate(season, playoff_team_count, tie_rule, n_sims, rng):
+    '''Returns a (teams, playoff seeds) array of seed counts'''
+    n = len(season['wins'])
+    home, away = season['home'], season['away']
+    mean, std = season['mean'], season['std']
+    matchups = len(home)
+
+    home_points = rng.normal(mean[home], std[home], size=(n_sims, matchups))
+    away_points = rng.normal(mean[away], std[away], size=(n_sims, matchups))
+    home_wins = np.sign(home_points - away_points) * 0.5 + 0.5
+
+    # one-hot (matchups, teams) matrices turn per-matchup results into per-team totals
+    home_team = np.zeros((matchups, n))
+    home_team[np.arange(matchups), home] = 1
+    away_team = np.zeros((matchups, n))
+    away_team[np.arange(matchups), away] = 1
+
+    wins = season['wins'] + home_wins @ home_team + (1 - home_wins) @ away_team
+    if tie_rule == 'Total Points Against':
+        tiebreak = season['points_against'] + away_points @ home_team + home_points @ away_team
+    else:
+        tiebreak = season['points_for'] + home_points @ home_team + away_points @ away_team
+
+    keys = [-tiebreak]
+    if tie_rule == 'Head to Head Record':
+        head_to_head = (season['head_to_head'] +
+                        np.einsum('sm,mi,mj->sij', home_wins, home_team, away_team) +
+                        np.einsum('sm,mi,mj->sij', 1 - home_wins, away_team, home_team))
+        tied = wins[:, :, None] == wins[:, None, :]
+        keys.append(-(head_to_head * tied).sum(axis=-1))
+    keys.append(-wins)
+
+    order = np.lexsort(keys, axis=-1)[:, :playoff_team_count]
+    counts = np.zeros((n, playoff_team_count))
+    for seed in range(playoff_team_count):
+        counts[:, seed] = np.bincount(order[:, seed], minlength=n)
+    return counts
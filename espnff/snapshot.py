@@ -0,0 +1,95 @@
+import mmap
+import os
+import pickle
+import struct
+import time
+
+from .exception import SnapshotException
+
+
+MAGIC = b'ESPNFFSN'
+VERSION = 1
+SECTIONS = ('league', 'players', 'nflTeams', 'settings', 'boxscores')
+_PREAMBLE = struct.Struct('<8sHQ')
+
+
+def write_snapshot(path, league_id, year, sections, saved):
+    '''Writes pickled sections behind a section table
+
+    ``sections`` maps names to objects and ``saved`` maps names to the time
+    each was fetched. The file is written next to path and renamed over it,
+    so readers never see a partial snapshot.
+    '''
+    blobs = [(name, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)) for name, value in sections.items()]
+    table = {}
+    offset = 0
+    for name, blob in blobs:
+        table[name] = {'offset': offset, 'length': len(blob), 'saved': saved.get(name)}
+        offset += len(blob)
+    header = pickle.dumps({'leagueId': league_id, 'year': year, 'created': time.time(),
+                           'sections': table}, pickle.HIGHEST_PROTOCOL)
+    tmp = '%s.%d.tmp' % (path, os.getpid())
+    with open(tmp, 'wb') as f:
+        f.write(_PREAMBLE.pack(MAGIC, VERSION, len(header)))
+        f.write(header)
+        for name, blob in blobs:
+            f.write(blob)
+    os.replace(tmp, path)
+
+
+class Snapshot(object):
+    '''Read side of a snapshot file
+
+    Only the section table is read when it is opened; each section is
+    unpickled when it is loaded. With ``mmap=True`` the file is mapped
+    instead of read, so sections that are never loaded are never paged in.
+    Snapshots are pickles: only open files you wrote yourself.
+    '''
+    def __init__(self, path, mmap=False):
+        self.path = path
+        with open(path, 'rb') as f:
+            if mmap:
+                self._data = _map(f)
+            else:
+                self._data = f.read()
+        preamble = bytes(self._data[:_PREAMBLE.size])
+        if len(preamble) < _PREAMBLE.size:
+            raise SnapshotException('%s is not a league snapshot' % (path, ))
+        magic, version, length = _PREAMBLE.unpack(preamble)
+        if magic != MAGIC:
+            raise SnapshotException('%s is not a league snapshot' % (path, ))
+        if version != VERSION:
+            raise SnapshotException('Snapshot version %s is not supported (expected %s)' % (version, VERSION))
+        self._start = _PREAMBLE.size + length
+        header = pickle.loads(self._data[_PREAMBLE.size:self._start])
+        self.league_id = header['leagueId']
+        self.year = header['year']
+        self.created = header['created']
+        self.sections = header['sections']
+
+    def __repr__(self):
+        return 'Snapshot(%s, %s, %s)' % (self.league_id, self.year, sorted(self.sections), )
+
+    def __contains__(self, name):
+        return name in self.sections
+
+    def load(self, name):
+        '''Unpickles one section'''
+        section = self.sections[name]
+        start = self._start + section['offset']
+        return pickle.loads(self._data[start:start + section['length']])
+
+    def saved(self, name):
+        '''Time the section's data was fetched'''
+        return self.sections[name]['saved']
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = None
+
+
+def _map(f):
+    if os.fstat(f.fileno()).st_size == 0:
+        return b''
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
@@ -0,0 +1,86 @@
+import threading
+from collections import OrderedDict
+
+
+PHASES = ('connect', 'transfer', 'decode', 'transform')
+
+
+class RequestTiming(object):
+    '''Timing of one request from the socket to parsed records
+
+    ``connect`` is the time until the response headers arrived,
+    ``transfer`` reading the body, ``decode`` JSON decoding and
+    ``transform`` building records from the decoded data, all in seconds.
+    Streamed bodies are read while they are parsed, so their transfer and
+    decode time is counted in ``transform``.
+    '''
+    __slots__ = ('url', 'view', 'status', 'league_id', 'year', 'bytes',
+                 'cache_hit', 'retries', 'connect', 'transfer', 'decode', 'transform')
+
+    def __init__(self, url, view=None, status=None, bytes=0, cache_hit=False,
+                 retries=0, connect=0.0, transfer=0.0):
+        self.url = url
+        self.view = view
+        self.status = status
+        self.league_id = None
+        self.year = None
+        self.bytes = bytes
+        self.cache_hit = cache_hit
+        self.retries = retries
+        self.connect = connect
+        self.transfer = transfer
+        self.decode = 0.0
+        self.transform = 0.0
+
+    def __repr__(self):
+        return 'RequestTiming(%s, %.3fs)' % (self.view or self.url, self.total, )
+
+    @property
+    def total(self):
+        return self.connect + self.transfer + self.decode + self.transform
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Stats(object):
+    '''Hook aggregating RequestTimings per view, league and season
+
+    Pass it as ``stats`` to League or ESPNFF, or add it to ``hooks``.
+    '''
+    def __init__(self):
+        self.timings = []
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return 'Stats(%s requests)' % (len(self.timings), )
+
+    def __call__(self, timing):
+        with self._lock:
+            self.timings.append(timing)
+
+    def clear(self):
+        with self._lock:
+            self.timings = []
+
+    def summary(self, by='view'):
+        '''Totals grouped by a RequestTiming field, e.g. 'view' or 'league_id'
+
+        Returns {key: {'requests', 'bytes', 'cacheHits', 'retries',
+        'connect', 'transfer', 'decode', 'transform', 'total'}}, slowest first.
+        '''
+        with self._lock:
+            timings = list(self.timings)
+        groups = {}
+        for timing in timings:
+            group = groups.setdefault(getattr(timing, by), dict(
+                {'requests': 0, 'bytes': 0, 'cacheHits': 0, 'retries': 0, 'total': 0.0},
+                **{phase: 0.0 for phase in PHASES}))
+            group['requests'] += 1
+            group['bytes'] += timing.bytes or 0
+            group['cacheHits'] += int(timing.cache_hit)
+            group['retries'] += timing.retries
+            for phase in PHASES:
+                group[phase] += getattr(timing, phase)
+            group['total'] += timing.total
+        return OrderedDict(sorted(groups.items(), key=lambda item: item[1]['total'], reverse=True))
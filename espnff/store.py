@@ -0,0 +1,219 @@
+import json
+import sqlite3
+import threading
+import time
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS leagues (
+    league_id INTEGER,
+    year INTEGER,
+    current_week INTEGER,
+    synced REAL,
+    PRIMARY KEY (league_id, year));
+CREATE TABLE IF NOT EXISTS teams (
+    league_id INTEGER,
+    year INTEGER,
+    team_id INTEGER,
+    team_key TEXT,
+    team_name TEXT,
+    nick_name TEXT,
+    PRIMARY KEY (league_id, year, team_id));
+CREATE TABLE IF NOT EXISTS players (
+    year INTEGER,
+    player_id INTEGER,
+    name TEXT,
+    position INTEGER,
+    pro_team INTEGER,
+    PRIMARY KEY (year, player_id));
+CREATE TABLE IF NOT EXISTS weeks (
+    league_id INTEGER,
+    year INTEGER,
+    week INTEGER,
+    final INTEGER,
+    PRIMARY KEY (league_id, year, week));
+CREATE TABLE IF NOT EXISTS matchups (
+    league_id INTEGER,
+    year INTEGER,
+    week INTEGER,
+    team_id INTEGER,
+    opponent_id INTEGER,
+    points REAL,
+    PRIMARY KEY (league_id, year, week, team_id));
+CREATE TABLE IF NOT EXISTS boxscores (
+    league_id INTEGER,
+    year INTEGER,
+    week INTEGER,
+    team_id INTEGER,
+    player_id INTEGER,
+    slot TEXT,
+    position TEXT,
+    pro_team TEXT,
+    points REAL);
+CREATE INDEX IF NOT EXISTS boxscores_week ON boxscores (league_id, year, week, team_id);
+CREATE INDEX IF NOT EXISTS boxscores_player ON boxscores (player_id, year);
+CREATE TABLE IF NOT EXISTS picks (
+    league_id INTEGER,
+    year INTEGER,
+    pick INTEGER,
+    round INTEGER,
+    team_name TEXT,
+    player_id INTEGER,
+    PRIMARY KEY (league_id, year, pick));
+CREATE TABLE IF NOT EXISTS transactions (
+    league_id INTEGER,
+    year INTEGER,
+    tran_id TEXT,
+    player_id INTEGER,
+    tran_date INTEGER,
+    tran_type TEXT,
+    tran_status TEXT,
+    data TEXT,
+    PRIMARY KEY (league_id, year, tran_id, player_id));
+CREATE INDEX IF NOT EXISTS transactions_date ON transactions (league_id, year, tran_date);
+CREATE INDEX IF NOT EXISTS transactions_player ON transactions (player_id);
+'''
+
+
+class LeagueStore(object):
+    '''SQLite archive of leagues, teams, players, matchups and boxscores
+
+    ``sync`` only requests what the archive is missing: weeks that are
+    not stored or were stored while still in progress, the draft until it
+    has picks, and transactions newer than the newest completed one
+    stored (or than the oldest one still pending). Each week and each batch of transactions is written in its
+    own transaction, so an interrupted sync resumes where it stopped.
+    '''
+    def __init__(self, path=':memory:'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._db.commit()
+
+    def __repr__(self):
+        return 'LeagueStore(%s)' % (self.path, )
+
+    def close(self):
+        self._db.close()
+
+    def sync(self, league, include=('boxscore', 'draft', 'transactions')):
+        '''Brings the archive of a league up to date
+
+        Returns {'weeks': [fetched weeks], 'picks': n, 'transactions': n}.
+        '''
+        key = (league.league_id, league.year)
+        self._save_league(league)
+        result = {'weeks': [], 'picks': 0, 'transactions': 0}
+        if 'boxscore' in include:
+            for week in self.missing_weeks(league):
+                self._save_week(key, week, league.boxscores(week, lean=True),
+                                final=week < (league.current_week or 0))
+                result['weeks'].append(week)
+        if 'draft' in include and not self._count('picks', key):
+            picks = league.draftData()
+            self._save_picks(key, picks)
+            result['picks'] = len(picks)
+        if 'transactions' in include:
+            transactions = list(league.iter_transactions(since=self.last_transaction_date(*key)))
+            self._save_transactions(key, transactions)
+            result['transactions'] = len(transactions)
+        return result
+
+    def missing_weeks(self, league):
+        '''Weeks through the current scoring period that are not stored as final'''
+        final = set(week for week, in self._query(
+            'SELECT week FROM weeks WHERE league_id = ? AND year = ? AND final = 1',
+            (league.league_id, league.year)))
+        return [week for week in range(1, (league.current_week or 1) + 1) if week not in final]
+
+    def last_transaction_date(self, league_id, year):
+        '''tranDate a sync fetches newer transactions than, or None for all
+
+        That is the date of the newest stored transaction, or just before
+        the oldest one still pending so its outcome is fetched again.
+        '''
+        newest, pending = self._query(
+            'SELECT MAX(tran_date), MIN(CASE WHEN tran_status = \'PENDING\' THEN tran_date END) '
+            'FROM transactions WHERE league_id = ? AND year = ?', (league_id, year))[0]
+        if pending is not None:
+            return min(newest, pending - 1)
+        return newest
+
+    def matchups(self, league_id, year, week=None):
+        '''Stored matchup rows as dicts'''
+        sql = 'SELECT week, team_id, opponent_id, points FROM matchups WHERE league_id = ? AND year = ?'
+        args = (league_id, year)
+        if week is not None:
+            sql += ' AND week = ?'
+            args += (week, )
+        return [{'week': w, 'teamId': t, 'opponentId': o, 'teamPoints': p}
+                for w, t, o, p in self._query(sql + ' ORDER BY week, team_id', args)]
+
+    def boxscore(self, league_id, year, week, team):
+        '''Stored lineup rows of a team's week as dicts'''
+        rows = self._query('SELECT player_id, slot, position, pro_team, points FROM boxscores '
+                           'WHERE league_id = ? AND year = ? AND week = ? AND team_id = ?',
+                           (league_id, year, week, team))
+        return [{'playerId': p, 'slot': s, 'playerPos': pos, 'playerTeam': pro, 'Points': points}
+                for p, s, pos, pro, points in rows]
+
+    def transactions(self, league_id, year):
+        '''Stored transactions, newest first, in League.transactions() form'''
+        rows = self._query('SELECT data FROM transactions WHERE league_id = ? AND year = ? '
+                           'ORDER BY tran_date DESC', (league_id, year))
+        return [json.loads(data) for data, in rows]
+
+    def _save_league(self, league):
+        teams = [team for team in league.teams.records() if team['teamId'] != 99]
+        players = league.players.values()
+        with self._lock:
+            with self._db:
+                self._db.execute('INSERT OR REPLACE INTO leagues VALUES (?, ?, ?, ?)',
+                                 (league.league_id, league.year, league.current_week, time.time()))
+                self._db.executemany('INSERT OR REPLACE INTO teams VALUES (?, ?, ?, ?, ?, ?)',
+                                     [(league.league_id, league.year, team['teamId'], team['teamKey'],
+                                       team['teamName'], team['nickName']) for team in teams])
+                self._db.executemany('INSERT OR IGNORE INTO players VALUES (?, ?, ?, ?, ?)',
+                                     [(league.year, p.player_id, p.name, p.position, p.pro_team)
+                                      for p in players])
+
+    def _save_week(self, key, week, boxscores, final):
+        rows = []
+        matchups = []
+        for team, boxscore in boxscores.items():
+            matchups.append(key + (week, team, boxscore['opponentId'], boxscore['teamPoints']))
+            for entry in boxscore['playerList']:
+                if entry.player_id != 'empty':
+                    rows.append(key + (week, team, entry.player_id, entry.slot, entry.position,
+                                       entry.pro_team, entry.points))
+        with self._lock:
+            with self._db:
+                self._db.execute('DELETE FROM boxscores WHERE league_id = ? AND year = ? AND week = ?',
+                                 key + (week, ))
+                self._db.executemany('INSERT INTO boxscores VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+                self._db.executemany('INSERT OR REPLACE INTO matchups VALUES (?, ?, ?, ?, ?, ?)', matchups)
+                self._db.execute('INSERT OR REPLACE INTO weeks VALUES (?, ?, ?, ?)',
+                                 key + (week, int(final)))
+
+    def _save_picks(self, key, picks):
+        with self._lock:
+            with self._db:
+                self._db.executemany('INSERT OR REPLACE INTO picks VALUES (?, ?, ?, ?, ?, ?)',
+                                     [key + (pick['pick'], pick['round'], pick['teamId'], pick['playerId'])
+                                      for pick in picks])
+
+    def _save_transactions(self, key, transactions):
+        with self._lock:
+            with self._db:
+                self._db.executemany('INSERT OR REPLACE INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                                     [key + (str(tran['tranId']), tran['playerId'], tran['tranDate'],
+                                             tran['tranType'], tran['tranStatus'], json.dumps(tran))
+                                      for tran in transactions])
+
+    def _count(self, table, key):
+        return self._query('SELECT COUNT(*) FROM %s WHERE league_id = ? AND year = ?' % (table, ), key)[0][0]
+
+    def _query(self, sql, args=()):
+        with self._lock:
+            return self._db.execute(sql, args).fetchall()
@@ -0,0 +1,72 @@
+import codecs
+import json
+
+
+_WHITESPACE = ' \t\r\n'
+
+
+def iter_json_array(chunks):
+    '''Yields the elements of a top-level JSON array as its bytes arrive
+
+    Only one element is decoded at a time, so peak memory is bounded by the
+    largest element rather than by the whole payload.
+    '''
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(chunks)
+    buf = ''
+    pos = 0
+    eof = False
+    expect = '['
+    while True:
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        if pos < len(buf):
+            char = buf[pos]
+            if expect == '[':
+                if char != '[':
+                    raise ValueError('Expected a JSON array')
+                pos += 1
+                expect = 'first'
+                continue
+            if char == ']' and expect in ('first', ','):
+                return
+            if expect == ',':
+                if char != ',':
+                    raise ValueError('Expected "," at position %d' % (pos, ))
+                pos += 1
+                expect = 'value'
+                continue
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except ValueError:
+                if eof:
+                    raise
+                end = None
+            if end is not None and (eof or _complete(buf, end)):
+                yield value
+                pos = end
+                expect = ','
+                continue
+        elif eof:
+            raise ValueError('Truncated JSON array')
+
+        chunk = next(chunks, None)
+        buf = buf[pos:]
+        pos = 0
+        if chunk is None:
+            eof = True
+            buf += text.decode(b'', final=True)
+        else:
+            buf += text.decode(chunk)
+
+
+def _complete(buf, end):
+    '''Is the value ending at end followed by a separator already in buf?
+
+    A number at the edge of a chunk, such as "1" of "1.5", decodes cleanly
+    but may be cut short.
+    '''
+    while end < len(buf) and buf[end] in _WHITESPACE:
+        end += 1
+    return end < len(buf) and buf[end] in ',]'
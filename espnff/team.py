@@ -21,22 +21,26 @@ class Team(object):
         return 'Team(%s)' % (self.team_name, )
 
     def _fetch_schedule(self, data):
-        '''Fetch schedule and scores for team'''
+        '''Fetch schedule, scores and margins of victory for team'''
         matchups = data['scheduleItems']
 
         for matchup in matchups:
             if not matchup['matchups'][0]['isBye']:
                 if matchup['matchups'][0]['awayTeamId'] == self.team_id:
                     score = matchup['matchups'][0]['awayTeamScores'][0]
+                    opponentScore = matchup['matchups'][0]['homeTeamScores'][0]
                     opponentId = matchup['matchups'][0]['homeTeamId']
                 else:
                     score = matchup['matchups'][0]['homeTeamScores'][0]
+                    opponentScore = matchup['matchups'][0]['awayTeamScores'][0]
                     opponentId = matchup['matchups'][0]['awayTeamId']
             else:
                 score = matchup['matchups'][0]['homeTeamScores'][0]
+                opponentScore = score
                 opponentId = matchup['matchups'][0]['homeTeamId']
 
             self.scores.append(score)
+            self.mov.append(score - opponentScore)
             self.schedule.append(opponentId)
 
     def get_roster(self, week):
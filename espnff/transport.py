@@ -0,0 +1,200 @@
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .ratelimit import retry_after
+from .stats import RequestTiming
+
+
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+
+class Transport(object):
+    '''Pooled HTTP transport shared by League and ESPNFF instances
+
+    Responses with a status in RETRY_STATUSES are retried up to
+    ``retries`` times, waiting for the Retry-After header when there is
+    one and ``backoff_factor * 2 ** attempt`` (at most ``max_backoff``)
+    otherwise. With a ``rate_limiter`` every request takes a token from
+    its host's bucket and a backoff holds back all threads on that host.
+    '''
+    def __init__(self, session=None, pool_size=10, keep_alive=True,
+                 retries=3, backoff_factor=0.5, timeout=10, cache=None,
+                 rate_limiter=None, max_backoff=60):
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.max_backoff = max_backoff
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        if session is None:
+            session = requests.Session()
+            self._mount(session)
+        self.session = session
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+
+    def __repr__(self):
+        return 'Transport(pool_size=%s, retries=%s)' % (self.pool_size, self.retries, )
+
+    def _mount(self, session):
+        '''Mounts pooled adapters retrying connection errors on a session
+
+        Statuses are never retried by the adapter, so throttled responses
+        reach _send and wait on the rate limiter instead of inside urllib3.
+        '''
+        retry = Retry(total=self.retries,
+                      status=0,
+                      backoff_factor=self.backoff_factor,
+                      allowed_methods=frozenset(['GET']),
+                      respect_retry_after_header=False,
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=self.pool_size,
+                              pool_maxsize=self.pool_size,
+                              max_retries=retry)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+    def get(self, url, params=None, headers=None, cookies=None, ttl=None, stream=False):
+        '''Sends a GET request over the pooled session
+
+        With a cache, fresh entries are served without a request and stale
+        ones are revalidated; ``ttl`` overrides the cache's default expiry.
+        Streamed responses are read from a fresh entry but never stored.
+        Every response carries a RequestTiming as ``r.timing``.
+        '''
+        if self.cache is None:
+            return self._send(url, params, headers, cookies, stream)
+
+        key = self.cache.key(url, params, headers, cookies)
+        entry = self.cache.get(key)
+        if entry is not None and entry.fresh:
+            r = entry.response()
+            r.timing = RequestTiming(url, _view(params), 200, cache_hit=True)
+            return r
+        if stream:
+            return self._send(url, params, headers, cookies, stream)
+
+        if entry is not None:
+            headers = dict(headers or {}, **entry.validators())
+        r = self._send(url, params, headers, cookies)
+        if r.status_code == 304 and entry is not None:
+            self.cache.touch(key, ttl)
+            timing = r.timing
+            timing.cache_hit = True
+            r = entry.response()
+            r.timing = timing
+            return r
+        if r.status_code == 200:
+            self.cache.put(key, r, ttl)
+        return r
+
+    def _send(self, url, params, headers, cookies, stream=False):
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(url)
+            start = time.perf_counter()
+            r = self.session.get(url, params=params, headers=headers,
+                                 cookies=cookies, timeout=self.timeout,
+                                 stream=stream)
+            if r.status_code not in RETRY_STATUSES or attempt >= self.retries:
+                r.timing = self._timing(r, url, params, stream, attempt, time.perf_counter() - start)
+                return r
+            delay = self._backoff(r, attempt)
+            r.close()
+            if self.rate_limiter is not None:
+                self.rate_limiter.pause(url, delay)
+            else:
+                time.sleep(delay)
+            attempt += 1
+
+    def _timing(self, r, url, params, stream, retries, elapsed):
+        '''Splits a request's time into waiting for headers and reading the body'''
+        connect = r.elapsed.total_seconds()
+        if stream:
+            return RequestTiming(url, _view(params), r.status_code,
+                                 int(r.headers.get('Content-Length') or 0),
+                                 retries=retries, connect=connect)
+        return RequestTiming(url, _view(params), r.status_code, len(r.content),
+                             retries=retries, connect=connect,
+                             transfer=max(0.0, elapsed - connect))
+
+    def _backoff(self, r, attempt):
+        '''Seconds to wait before retrying a throttled or failed response'''
+        delay = retry_after(r)
+        if delay is None:
+            delay = min(self.max_backoff, self.backoff_factor * 2 ** attempt)
+        return delay
+
+    def close(self):
+        '''Closes all pooled connections'''
+        self.session.close()
+
+
+class AsyncTransport(object):
+    '''Awaitable front end for a Transport
+
+    Requests run on a bounded worker pool sized to the connection pool, so
+    any number of coroutines can share one Transport's connections.
+    '''
+    def __init__(self, transport=None, max_workers=None):
+        self.transport = transport if transport is not None else get_transport()
+        self.max_workers = max_workers or self.transport.pool_size
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def __repr__(self):
+        return 'AsyncTransport(%r)' % (self.transport, )
+
+    async def get(self, url, params=None, headers=None, cookies=None, ttl=None, stream=False):
+        '''Sends a GET request without blocking the event loop'''
+        call = functools.partial(self.transport.get, url, params=params,
+                                 headers=headers, cookies=cookies, ttl=ttl,
+                                 stream=stream)
+        return await self.run(call)
+
+    async def run(self, func, *args):
+        '''Runs blocking work, such as reading a streamed body, on the worker pool'''
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args))
+
+    def close(self):
+        '''Shuts down the worker pool'''
+        self.executor.shutdown(wait=False)
+
+
+def _view(params):
+    '''Returns the view names of a request's params'''
+    view = (params or {}).get('view')
+    if isinstance(view, (list, tuple)):
+        return ','.join(view)
+    return view
+
+
+_default_transport = None
+
+
+def get_transport():
+    '''Returns the process-wide default transport'''
+    global _default_transport
+    if _default_transport is None:
+        _default_transport = Transport()
+    return _default_transport
+
+
+_default_async_transport = None
+
+
+def get_async_transport():
+    '''Returns the process-wide default async transport'''
+    global _default_async_transport
+    if _default_async_transport is None:
+        _default_async_transport = AsyncTransport(get_transport())
+    return _default_async_transport
@@ -15,7 +15,11 @@ setup(
 
     author_email='rbart65@gmail.com',
 
-    install_requires=['requests>=2.0.0,<3.0.0'],
+    python_requires='>=3.7',
+
+    install_requires=['requests>=2.0.0,<3.0.0', 'urllib3>=1.26'],
+
+    extras_require={'numpy': ['numpy']},
 
     test_suite='nose.collector',
 
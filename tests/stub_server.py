@@ -0,0 +1,116 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import urlparse, parse_qs
+
+
+class _ThreadingServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class StubServer(object):
+    '''Local HTTP server replaying canned ESPN payloads
+
+    Routes map ``(path, view)`` to a JSON-serializable payload or to a
+    ``(status_code, payload)`` or ``(status_code, payload, headers)``
+    tuple. A callable payload is called with the parsed query string and
+    the request headers and returns the payload to send.
+    '''
+    def __init__(self, routes=None, delay=0):
+        self.routes = dict(routes or {})
+        self.delay = delay
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = _ThreadingServer(('127.0.0.1', 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:%d' % (self._server.server_address[1], )
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def route(self, path, view, payload, status=200, headers=None):
+        self.routes[(path, view)] = (status, payload, headers or {})
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                views = query.get('view', [None])
+                with stub._lock:
+                    stub.requests.append((url.path, query, dict(self.headers)))
+                if stub.delay:
+                    time.sleep(stub.delay)
+                found = stub.routes.get((url.path, views[0]))
+                headers = {}
+                if found is None:
+                    status, payload = 404, {'error': [{'message': 'Not found', 'code': 'functional'}]}
+                elif isinstance(found, tuple):
+                    status, payload = found[:2]
+                    headers = found[2] if len(found) > 2 else {}
+                else:
+                    status, payload = 200, found
+                if callable(payload):
+                    payload = payload(query, dict(self.headers))
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+LEAGUE_URL = 'http://fantasy.espn.com/apis/v3/games/ffl/seasons/2018/segments/0/leagues/1234'
+PLAYERS_URL = 'https://fantasy.espn.com/apis/v3/games/ffl/seasons/2018/players'
+PRO_TEAMS_URL = 'https://fantasy.espn.com/apis/v3/games/ffl/seasons/2018/'
+
+
+def mock_league(m, data):
+    '''Registers the three construction views on a requests_mock Mocker'''
+    m.get(LEAGUE_URL + '?view=mTeam', json=data['mTeam'])
+    m.get(PLAYERS_URL + '?view=players_wl', json=data['players_wl'])
+    m.get(PRO_TEAMS_URL + '?view=proTeamSchedules', json=data['proTeamSchedules'])
+
+
+def league_server(data, year=2018, league_id=1234, **kwargs):
+    '''Builds a StubServer serving every view of a v3 fixture'''
+    league_path = '/apis/v3/games/ffl/seasons/%d/segments/0/leagues/%d' % (year, league_id)
+    season_path = '/apis/v3/games/ffl/seasons/%d/' % (year, )
+    server = StubServer(**kwargs)
+    server.route(season_path + 'players', 'players_wl', data['players_wl'])
+    server.route(season_path, 'proTeamSchedules', data['proTeamSchedules'])
+    for view in ('mTeam', 'mBoxscore', 'mDraftDetail', 'kona_playercard'):
+        server.route(league_path, view, data[view])
+    return server
+
+
+def point_at(league, server):
+    '''Points a league's endpoints at a stub server'''
+    base = server.url + '/apis/v3/games/ffl/seasons/%d/'
+    league.ENDPOINT = base + 'segments/0/leagues/%d'
+    league.PLAYER_ENDPOINT = base + 'players'
+    league.TEAM_ENDPOINT = base
+    return league
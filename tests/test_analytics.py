@@ -0,0 +1,86 @@
+import requests_mock
+import unittest
+import json
+
+
+from espnff.analytics import SeasonAnalytics, np
+from espnff.league import League
+from espnff.registry import player_registry, pro_team_registry
+from espnff.team import Team
+from tests.stub_server import LEAGUE_URL, mock_league
+
+
+SCORES = [[100, 90, 80, 70], [60, 120, 95, 95], [85, 110, 100, 75]]
+OPPONENTS = [[1, 0, 3, 2], [2, 3, 0, 1], [3, 2, 1, 0]]
+
+
+class TeamMovTestCase(unittest.TestCase):
+    '''Test Team margin of victory'''
+
+    def test_mov(self):
+        '''Is the margin of victory filled for every scheduled week?'''
+        data = json.loads(open('tests/test_league.json').read())
+        team = Team(data['leaguesettings']['teams']['1'])
+        self.assertEqual(len(team.mov), len(team.scores))
+        self.assertAlmostEqual(team.mov[0], 120.58 - 119.05)
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class SeasonAnalyticsTestCase(unittest.TestCase):
+    '''Test SeasonAnalytics class'''
+
+    def test_all_play(self):
+        '''Are all-play records counted against every team every week?'''
+        analytics = SeasonAnalytics(['A', 'B', 'C', 'D'], SCORES, OPPONENTS)
+        records = analytics.all_play()
+        self.assertEqual(records['A'], (4.0, 5.0, 0.0))
+        self.assertEqual(records['C'], (4.0, 4.0, 1.0))
+        self.assertEqual(sum(w for w, l, t in records.values()) * 2 +
+                         sum(t for w, l, t in records.values()), 3 * 4 * 3)
+
+    def test_head_to_head(self):
+        '''Do the win matrix, margins and luck follow the actual matchups?'''
+        analytics = SeasonAnalytics(['A', 'B', 'C', 'D'], SCORES, OPPONENTS)
+        self.assertEqual(analytics.win_matrix.tolist(),
+                         [[0, 1, 0, 1], [0, 0, 1, 1], [1, 0, 0, 1], [0, 0, 0, 0]])
+        self.assertEqual(analytics.mov()[1].tolist(), [-35, 25, 35, -25])
+        self.assertAlmostEqual(analytics.luck().sum(), 0)
+        self.assertAlmostEqual(analytics.luck()[0], 2 - 4 / 9.0 * 3)
+
+    def test_add_week(self):
+        '''Does adding weeks one at a time match building at once?'''
+        full = SeasonAnalytics(['A', 'B', 'C', 'D'], SCORES, OPPONENTS)
+        incremental = SeasonAnalytics(['A', 'B', 'C', 'D'], SCORES[:1], OPPONENTS[:1])
+        for scores, opponents in zip(SCORES[1:], OPPONENTS[1:]):
+            incremental.add_week(scores, opponents)
+        self.assertEqual(incremental.all_play(), full.all_play())
+        self.assertEqual(incremental.win_matrix.tolist(), full.win_matrix.tolist())
+        self.assertEqual(list(incremental.power_rankings().scores()), list(full.power_rankings().scores()))
+
+    def test_bye(self):
+        '''Does a bye count for all-play but not head to head?'''
+        analytics = SeasonAnalytics(['A', 'B', 'C'], [[100, 90, 80]], [[1, 0, -1]])
+        self.assertEqual(analytics.games.tolist(), [1, 1, 0])
+        self.assertEqual(analytics.mov()[0].tolist(), [10, -10, 0])
+        self.assertEqual(analytics.all_play()['C'], (0.0, 2.0, 0.0))
+
+    @requests_mock.Mocker()
+    def test_league_analytics(self, m):
+        '''Are the league's finished regular season weeks loaded?'''
+        data = json.loads(open('tests/test_league_v3.json').read())
+        player_registry.clear()
+        pro_team_registry.clear()
+        mock_league(m, data)
+        m.get(LEAGUE_URL + '?view=mSettings', json=data['mSettings'])
+        m.get(LEAGUE_URL + '?view=mMatchupScore', json=data['mMatchupScore'])
+        league = League(1234, 2018)
+        analytics = league.analytics()
+        finished = set(matchup['matchupPeriodId'] for matchup in data['mMatchupScore']['schedule']
+                       if matchup['winner'] != 'UNDECIDED')
+        self.assertEqual(analytics.weeks, len(finished))
+        self.assertEqual(analytics.teams, [1, 2, 3, 4])
+        self.assertEqual(analytics.games.tolist(), [len(finished)] * 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
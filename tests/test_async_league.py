@@ -0,0 +1,92 @@
+import asyncio
+import unittest
+import json
+import time
+
+
+from espnff.async_league import AsyncLeague
+from espnff.league import League
+from espnff.registry import player_registry, pro_team_registry
+from espnff.transport import AsyncTransport, Transport
+from tests.stub_server import league_server, point_at
+
+
+class AsyncLeagueTestCase(unittest.TestCase):
+    '''Test AsyncLeague class against a local stub server'''
+
+    def setUp(self):
+        self.data = json.loads(open('tests/test_league_v3.json').read())
+        player_registry.clear()
+        pro_team_registry.clear()
+
+    def load(self, server):
+        transport = AsyncTransport(Transport(retries=0))
+        league = point_at(AsyncLeague(1234, 2018, transport=transport), server)
+        asyncio.run(league.load())
+        return league
+
+    def test_load(self):
+        '''Are teams, players and pro teams parsed like League?'''
+        with league_server(self.data) as server:
+            league = self.load(server)
+        self.assertEqual(league.status, 200)
+        self.assertEqual(league.teams[1]['teamName'], 'Billy Smith')
+        self.assertEqual(len(league.players), len(self.data['players_wl']))
+        self.assertEqual(league.nflTeams['Atl']['id'], 1)
+
+    def test_concurrent_load(self):
+        '''Do the three construction requests overlap?'''
+        with league_server(self.data, delay=0.3) as server:
+            start = time.time()
+            self.load(server)
+            elapsed = time.time() - start
+        self.assertLess(elapsed, 0.8)
+
+    def test_shared_season_load(self):
+        '''Do leagues of one season loading together download players and pro teams once?'''
+        with league_server(self.data, delay=0.05) as server:
+            transport = AsyncTransport(Transport(retries=0))
+            leagues = [point_at(AsyncLeague(1234, 2018, transport=transport), server) for i in range(10)]
+
+            async def load():
+                await asyncio.gather(*[league.load() for league in leagues])
+            asyncio.run(load())
+        views = [query['view'][0] for path, query, headers in server.requests]
+        self.assertEqual(views.count('players_wl'), 1)
+        self.assertEqual(views.count('proTeamSchedules'), 1)
+        self.assertEqual(views.count('mTeam'), 10)
+        self.assertTrue(all(league.players is leagues[0].players for league in leagues))
+        self.assertTrue(all(league.nflTeams is leagues[0].nflTeams for league in leagues))
+
+    def test_async_methods(self):
+        '''Do boxscore, draftData and transactions await their requests?'''
+        with league_server(self.data) as server:
+            league = self.load(server)
+
+            async def fetch():
+                return await asyncio.gather(league.boxscore(1, 1),
+                                            league.draftData(),
+                                            league.transactions())
+            boxscore, draft, transactions = asyncio.run(fetch())
+        self.assertEqual(boxscore['teamId'], 1)
+        self.assertEqual(boxscore['opponentId'], 2)
+        self.assertEqual(len(draft), len(self.data['mDraftDetail']['draftDetail']['picks']))
+        self.assertEqual(len(transactions), 4)
+
+    def test_league_api(self):
+        '''Does AsyncLeague override every public League method that makes requests?'''
+        local = {'snapshot', 'stale_sections', 'ENDPOINT', 'PLAYER_ENDPOINT', 'TEAM_ENDPOINT',
+                 'player_registry', 'pro_team_registry'}
+        for name in dir(League):
+            if name.startswith('_') or name in local:
+                continue
+            self.assertIsNot(getattr(AsyncLeague, name), getattr(League, name), name)
+
+    def test_backfill_engine(self):
+        '''Does backfill_tasks refuse an engine that cannot await its tasks?'''
+        league = AsyncLeague(1234, 2018)
+        self.assertRaises(TypeError, league.backfill_tasks, None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+import asyncio
+import requests_mock
+import threading
+import time
+import unittest
+import json
+
+
+from espnff.async_league import AsyncLeague
+from espnff.backfill import Backfill, AsyncBackfill
+from espnff.client import ESPNFF, AsyncESPNFF
+from espnff.exception import PrivateLeagueException, InvalidLeagueException
+from espnff.league import League
+from espnff.registry import player_registry, pro_team_registry
+from tests.stub_server import LEAGUE_URL, PLAYERS_URL, PRO_TEAMS_URL, mock_league
+
+
+class BackfillTestCase(unittest.TestCase):
+    '''Test Backfill engine'''
+
+    def setUp(self):
+        self.data = json.loads(open('tests/test_league_v3.json').read())
+        player_registry.clear()
+        pro_team_registry.clear()
+
+    def test_host_limit(self):
+        '''Are tasks for one host capped at host_limit?'''
+        lock = threading.Lock()
+        state = {'running': 0, 'peak': 0}
+
+        def task(i):
+            with lock:
+                state['running'] += 1
+                state['peak'] = max(state['peak'], state['running'])
+            time.sleep(0.02)
+            with lock:
+                state['running'] -= 1
+            return i
+
+        engine = Backfill(max_workers=8, host_limit=2)
+        for i in range(10):
+            engine.add(i, 'example.com', task, i)
+        results = list(engine.run())
+        self.assertEqual(sorted(r.result for r in results), list(range(10)))
+        self.assertEqual(state['peak'], 2)
+
+    def test_async_host_limit(self):
+        '''Are async tasks for one host capped at host_limit and errors returned?'''
+        state = {'running': 0, 'peak': 0}
+
+        async def task(i):
+            state['running'] += 1
+            state['peak'] = max(state['peak'], state['running'])
+            await asyncio.sleep(0.01)
+            state['running'] -= 1
+            if i == 3:
+                raise ValueError('boom')
+            return i
+
+        async def run():
+            engine = AsyncBackfill(max_workers=8, host_limit=2)
+            for i in range(10):
+                engine.add(i, 'example.com', task, i)
+            return [r async for r in engine.run()]
+
+        results = {r.key: r for r in asyncio.run(run())}
+        self.assertEqual(sorted(results), list(range(10)))
+        self.assertIsInstance(results[3].error, ValueError)
+        self.assertEqual(results[9].result, 9)
+        self.assertEqual(state['peak'], 2)
+
+    def test_stop_early(self):
+        '''Are queued tasks cancelled when the caller stops reading results?'''
+        started = []
+
+        def task(i):
+            started.append(i)
+            time.sleep(0.2)
+            return i
+
+        engine = Backfill(max_workers=2, host_limit=2)
+        for i in range(10):
+            engine.add(i, 'example.com', task, i)
+        results = engine.run()
+        start = time.time()
+        next(results)
+        results.close()
+        self.assertLess(time.time() - start, 0.9)
+        self.assertLessEqual(len(started), 4)
+
+    def test_progress_and_errors(self):
+        '''Are progress callbacks made and errors returned rather than raised?'''
+        seen = []
+
+        def fail():
+            raise ValueError('boom')
+
+        engine = Backfill(progress=lambda done, total, result: seen.append((done, total)))
+        engine.add('ok', 'example.com', lambda: 1)
+        engine.add('fail', 'example.com', fail)
+        results = {r.key: r for r in engine.run()}
+        self.assertIsInstance(results['fail'].error, ValueError)
+        self.assertEqual(results['ok'].result, 1)
+        self.assertEqual(seen, [(1, 2), (2, 2)])
+
+    @requests_mock.Mocker()
+    def test_league_backfill(self, m):
+        '''Does League.backfill fetch every week, the draft and transactions?'''
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=mBoxscore', json=self.data['mBoxscore'])
+        m.get(LEAGUE_URL + '?view=mDraftDetail', json=self.data['mDraftDetail'])
+        m.get(LEAGUE_URL + '?view=kona_playercard', json=self.data['kona_playercard'])
+        league = League(1234, 2018)
+        results = {r.key: r.result for r in league.backfill()}
+        self.assertEqual(sorted(results), sorted([(1234, 2018, 'boxscore', 1), (1234, 2018, 'boxscore', 2),
+                                                  (1234, 2018, 'boxscore', 3), (1234, 2018, 'draft'),
+                                                  (1234, 2018, 'transactions')]))
+        self.assertEqual(len(results[(1234, 2018, 'boxscore', 2)]), 4)
+
+    @requests_mock.Mocker()
+    def test_async_backfill(self, m):
+        '''Do AsyncLeague.backfill and AsyncESPNFF.backfill await every fetch?'''
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=mBoxscore', json=self.data['mBoxscore'])
+        m.get(LEAGUE_URL + '?view=mDraftDetail', json=self.data['mDraftDetail'])
+        m.get(LEAGUE_URL + '?view=kona_playercard', json=self.data['kona_playercard'])
+
+        async def run():
+            league = await AsyncLeague.create(1234, 2018)
+            results = {r.key: r for r in [r async for r in league.backfill(weeks=[1, 2])]}
+            client = [r async for r in AsyncESPNFF().backfill(1234, [2018], include=('draft', ))]
+            return results, client
+
+        results, client = asyncio.run(run())
+        self.assertEqual(sorted(results), sorted([(1234, 2018, 'boxscore', 1), (1234, 2018, 'boxscore', 2),
+                                                  (1234, 2018, 'draft'), (1234, 2018, 'transactions')]))
+        self.assertEqual([r.error for r in results.values()], [None] * 4)
+        self.assertEqual(len(results[(1234, 2018, 'boxscore', 2)].result), 4)
+        self.assertEqual([r.key for r in client], [(1234, 2018, 'league'), (1234, 2018, 'draft')])
+        self.assertEqual(len(client[1].result), len(self.data['mDraftDetail']['draftDetail']['picks']))
+        self.assertRaises(TypeError, client[0].result.backfill_tasks, Backfill())
+
+    @requests_mock.Mocker()
+    def test_client_backfill(self, m):
+        '''Does ESPNFF.backfill build each season and queue its fetches?'''
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=mDraftDetail', json=self.data['mDraftDetail'])
+        results = list(ESPNFF().backfill(1234, [2018], include=('draft', )))
+        self.assertEqual([r.key for r in results], [(1234, 2018, 'league'), (1234, 2018, 'draft')])
+
+    @requests_mock.Mocker()
+    def test_get_leagues(self, m):
+        '''Are season fetches shared and league failures yielded without stopping the batch?'''
+        mock_league(m, self.data)
+        other = LEAGUE_URL.replace('1234', '%d')
+        m.get(other % 5678 + '?view=mTeam', json=self.data['mTeam'])
+        m.get(other % 401 + '?view=mTeam', status_code=401,
+              json={'error': [{'message': 'You are not authorized to view this League.'}]})
+        m.get(other % 404 + '?view=mTeam', status_code=404,
+              json={'error': [{'message': 'League not found'}]})
+        pairs = [(1234, 2018), (5678, 2018), (401, 2018), (404, 2018), (1234, 2018)]
+        results = {r.key: r for r in ESPNFF().get_leagues(pairs, max_workers=4)}
+        self.assertEqual(sorted(results), [(401, 2018), (404, 2018), (1234, 2018), (5678, 2018)])
+        self.assertIsInstance(results[(401, 2018)].error, PrivateLeagueException)
+        self.assertIsInstance(results[(404, 2018)].error, InvalidLeagueException)
+        self.assertIs(results[(1234, 2018)].result.players, results[(5678, 2018)].result.players)
+        self.assertIs(results[(1234, 2018)].result.nflTeams, results[(5678, 2018)].result.nflTeams)
+        self.assertEqual(len([r for r in m.request_history if r.url.startswith(PLAYERS_URL)]), 1)
+        self.assertEqual(len([r for r in m.request_history if r.url.startswith(PRO_TEAMS_URL + '?')]), 1)
+
+    @requests_mock.Mocker()
+    def test_async_get_leagues(self, m):
+        '''Does AsyncESPNFF.get_leagues await each league and yield its failures?'''
+        mock_league(m, self.data)
+        other = LEAGUE_URL.replace('1234', '%d')
+        m.get(other % 5678 + '?view=mTeam', json=self.data['mTeam'])
+        m.get(other % 401 + '?view=mTeam', status_code=401,
+              json={'error': [{'message': 'You are not authorized to view this League.'}]})
+        pairs = [(1234, 2018), (5678, 2018), (401, 2018), (1234, 2018)]
+        progress = []
+
+        async def build():
+            return [r async for r in AsyncESPNFF().get_leagues(
+                pairs, max_workers=2, progress=lambda done, total, result: progress.append((done, total)))]
+
+        results = {r.key: r for r in asyncio.run(build())}
+        self.assertEqual(sorted(results), [(401, 2018), (1234, 2018), (5678, 2018)])
+        self.assertIsInstance(results[(401, 2018)].error, PrivateLeagueException)
+        self.assertIsInstance(results[(1234, 2018)].result, AsyncLeague)
+        self.assertIs(results[(1234, 2018)].result.players, results[(5678, 2018)].result.players)
+        self.assertEqual(progress, [(1, 3), (2, 3), (3, 3)])
+        self.assertEqual(len([r for r in m.request_history if r.url.startswith(PLAYERS_URL)]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
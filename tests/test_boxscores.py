@@ -0,0 +1,53 @@
+import requests_mock
+import unittest
+import json
+
+
+from espnff.league import League
+from tests.stub_server import LEAGUE_URL, mock_league
+
+
+class BoxscoresTestCase(unittest.TestCase):
+    '''Test batch boxscore functions'''
+
+    def setUp(self):
+        self.data = json.loads(open('tests/test_league_v3.json').read())
+
+    @requests_mock.Mocker()
+    def test_boxscores(self, m):
+        '''Does one request return every team's boxscore for the week?'''
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=mBoxscore', json=self.data['mBoxscore'])
+        league = League(1234, 2018)
+        calls = m.call_count
+        boxscores = league.boxscores(2)
+        self.assertEqual(m.call_count, calls + 1)
+        self.assertEqual(sorted(boxscores), [1, 2, 3, 4])
+        self.assertEqual(boxscores[1]['opponentId'], 3)
+        self.assertEqual(boxscores[3]['opponentId'], 1)
+
+    @requests_mock.Mocker()
+    def test_boxscores_match_boxscore(self, m):
+        '''Is each batch boxscore the same as the single team boxscore?'''
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=mBoxscore', json=self.data['mBoxscore'])
+        league = League(1234, 2018)
+        boxscores = league.boxscores(1)
+        for team in (1, 2, 3, 4):
+            self.assertEqual(boxscores[team], league.boxscore(1, team))
+
+    @requests_mock.Mocker()
+    def test_season_boxscores(self, m):
+        '''Is there one request per week in a season range?'''
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=mBoxscore', json=self.data['mBoxscore'])
+        league = League(1234, 2018)
+        calls = m.call_count
+        season = league.season_boxscores(1, 3)
+        self.assertEqual(m.call_count, calls + 3)
+        self.assertEqual(sorted(season), [1, 2, 3])
+        self.assertEqual(season[3][2]['week'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import requests_mock
+import unittest
+import json
+
+
+from espnff.cache import ResponseCache, PERMANENT
+from espnff.league import League
+from espnff.registry import player_registry, pro_team_registry
+from espnff.transport import Transport
+from tests.stub_server import LEAGUE_URL, mock_league
+
+
+URL = 'https://fantasy.espn.com/apis/v3/games/ffl/seasons/2018/'
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+    '''Test ResponseCache class'''
+
+    def setUp(self):
+        self.data = json.loads(open('tests/test_league_v3.json').read())
+        player_registry.clear()
+        pro_team_registry.clear()
+
+    def test_key(self):
+        '''Does the key depend on params and the filter header but no other header?'''
+        cache = ResponseCache()
+        key = cache.key(URL, {'view': 'a', 'x': 1}, {'x-fantasy-filter': '{}', 'Accept': 'a'})
+        self.assertEqual(key, cache.key(URL, {'x': 1, 'view': 'a'}, {'x-fantasy-filter': '{}'}))
+        self.assertNotEqual(key, cache.key(URL, {'view': 'a', 'x': 1}, {'x-fantasy-filter': '[]'}))
+        self.assertNotEqual(key, cache.key(URL, {'view': 'b', 'x': 1}, {'x-fantasy-filter': '{}'}))
+
+    @requests_mock.Mocker()
+    def test_cookies(self, m):
+        '''Is a response cached with cookies only served to the same cookies?'''
+        m.get(URL, [{'json': {'private': 1}}, {'status_code': 401, 'json': {}}, {'json': {'other': 1}}])
+        transport = Transport(cache=ResponseCache(ttl=60))
+        cookies = {'espn_s2': 's2', 'SWID': '{swid}'}
+        transport.get(URL, cookies=cookies)
+        self.assertEqual(transport.get(URL).status_code, 401)
+        self.assertEqual(transport.get(URL, cookies={'espn_s2': 'x', 'SWID': '{y}'}).json(), {'other': 1})
+        self.assertEqual(transport.get(URL, cookies=dict(cookies)).json(), {'private': 1})
+        self.assertEqual(m.call_count, 3)
+
+    @requests_mock.Mocker()
+    def test_fresh_hit(self, m):
+        '''Is a fresh entry served without a request?'''
+        m.get(URL, json={'a': 1})
+        transport = Transport(cache=ResponseCache(ttl=60))
+        transport.get(URL, params={'view': 'x'})
+        r = transport.get(URL, params={'view': 'x'})
+        self.assertEqual(m.call_count, 1)
+        self.assertEqual(r.json(), {'a': 1})
+        self.assertTrue(r.from_cache)
+
+    @requests_mock.Mocker()
+    def test_revalidate(self, m):
+        '''Is a stale entry revalidated with its ETag?'''
+        m.get(URL, [{'json': {'a': 1}, 'headers': {'ETag': '"v1"'}},
+                    {'status_code': 304}])
+        transport = Transport(cache=ResponseCache(ttl=0))
+        transport.get(URL)
+        r = transport.get(URL)
+        self.assertEqual(m.request_history[1].headers['If-None-Match'], '"v1"')
+        self.assertEqual(r.json(), {'a': 1})
+
+    @requests_mock.Mocker()
+    def test_permanent(self, m):
+        '''Does a permanent entry outlive the default ttl?'''
+        m.get(URL, json={'a': 1})
+        transport = Transport(cache=ResponseCache(ttl=0))
+        transport.get(URL, ttl=PERMANENT)
+        transport.get(URL)
+        self.assertEqual(m.call_count, 1)
+
+    @requests_mock.Mocker()
+    def test_league_closed_weeks(self, m):
+        '''Are completed weeks and past seasons cached permanently?'''
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=mBoxscore', json=self.data['mBoxscore'])
+        transport = Transport(cache=ResponseCache(ttl=0))
+        league = League(1234, 2018, transport=transport)
+        pro_team_registry.clear()
+        League(1234, 2018, transport=transport)
+        league.boxscores(1)
+        league.boxscores(1)
+        pro_teams = [r for r in m.request_history if r.qs.get('view') == ['proteamschedules']]
+        boxscores = [r for r in m.request_history if r.qs.get('view') == ['mboxscore']]
+        self.assertEqual(len(pro_teams), 1)
+        self.assertEqual(len(boxscores), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
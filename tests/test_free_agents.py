@@ -0,0 +1,95 @@
+import asyncio
+import requests_mock
+import unittest
+import json
+
+
+from espnff.async_league import AsyncLeague
+from espnff.league import League
+from espnff.registry import player_registry, pro_team_registry
+from tests.stub_server import LEAGUE_URL, mock_league
+
+
+class FreeAgentsTestCase(unittest.TestCase):
+    '''Test free agent search'''
+
+    def setUp(self):
+        self.data = json.loads(open('tests/test_league_v3.json').read())
+        player_registry.clear()
+        pro_team_registry.clear()
+        self.filters = []
+
+    def page(self, request, context):
+        '''Serves players matching the filter header, most owned first'''
+        filters = json.loads(request.headers['x-fantasy-filter'])['players']
+        self.filters.append(filters)
+        players = self.data['players_wl']
+        if 'filterSlotIds' in filters:
+            slot = filters['filterSlotIds']['value'][0]
+            players = [p for p in players if slot in p['eligibleSlots']]
+        players = [{'player': dict(p, ownership={'percentOwned': p['id'] % 50}), 'status': 'FREEAGENT'}
+                   for p in players]
+        players.sort(key=lambda p: p['player']['ownership']['percentOwned'], reverse=True)
+        return {'players': players[filters['offset']:filters['offset'] + filters['limit']]}
+
+    @requests_mock.Mocker()
+    def test_limit(self, m):
+        '''Are pages no larger than needed and is paging stopped at the limit?'''
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=kona_player_info', json=self.page)
+        league = League(1234, 2018)
+        players = league.freeAgents(week=3, limit=7)
+        self.assertEqual(len(players), 7)
+        self.assertEqual([f['limit'] for f in self.filters], [7])
+        owned = [p['percentOwned'] for p in players]
+        self.assertEqual(owned, sorted(owned, reverse=True))
+
+    @requests_mock.Mocker()
+    def test_async(self, m):
+        '''Does AsyncLeague page free agents the same way?'''
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=kona_player_info', json=self.page)
+
+        async def fetch():
+            league = await AsyncLeague.create(1234, 2018)
+            players = await league.freeAgents(week=3, position='RB', limit=7)
+            lazy = []
+            async for player in league.iter_free_agents(page_size=5):
+                lazy.append(player)
+                if len(lazy) == 6:
+                    break
+            return players, lazy
+
+        players, lazy = asyncio.run(fetch())
+        self.assertEqual(len(players), 7)
+        self.assertEqual(set(p['playerPos'] for p in players), {'RB'})
+        self.assertEqual(len(lazy), 6)
+        self.assertEqual([(f['offset'], f['limit']) for f in self.filters], [(0, 7), (0, 5), (5, 5)])
+
+    @requests_mock.Mocker()
+    def test_lazy_pages(self, m):
+        '''Are pages only requested as the caller consumes players?'''
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=kona_player_info', json=self.page)
+        league = League(1234, 2018)
+        players = league.iter_free_agents(page_size=5)
+        self.assertEqual(self.filters, [])
+        for i in range(6):
+            next(players)
+        self.assertEqual([f['offset'] for f in self.filters], [0, 5])
+
+    @requests_mock.Mocker()
+    def test_filters(self, m):
+        '''Are position, status and sort pushed into the filter header?'''
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=kona_player_info', json=self.page)
+        league = League(1234, 2018)
+        players = league.freeAgents(week=3, position='QB', status=('FREEAGENT', ), sort='projectedPoints')
+        self.assertEqual(set(p['playerPos'] for p in players), set(['QB']))
+        self.assertEqual(self.filters[0]['filterSlotIds'], {'value': [0]})
+        self.assertEqual(self.filters[0]['filterStatus'], {'value': ['FREEAGENT']})
+        self.assertEqual(self.filters[0]['sortAppliedStatTotal']['value'], '1120183')
+
+
+if __name__ == '__main__':
+    unittest.main()
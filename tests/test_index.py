@@ -0,0 +1,64 @@
+import requests_mock
+import unittest
+import json
+
+
+from espnff.index import RecordIndex, ScheduleIndex
+from espnff.league import League
+from espnff.registry import player_registry, pro_team_registry
+from tests.stub_server import PRO_TEAMS_URL, mock_league
+
+
+class IndexTestCase(unittest.TestCase):
+    '''Test RecordIndex and ScheduleIndex'''
+
+    def setUp(self):
+        self.data = json.loads(open('tests/test_league_v3.json').read())
+        player_registry.clear()
+        pro_team_registry.clear()
+
+    def test_record_index(self):
+        '''Is a record stored once and found under each key?'''
+        index = RecordIndex()
+        record = index.add({'id': 1}, 1, 'one')
+        self.assertIs(index[1], record)
+        self.assertIs(index['one'], record)
+        self.assertEqual(sorted(index, key=str), [1, 'one'])
+        self.assertEqual(index.records(), [record])
+
+    @requests_mock.Mocker()
+    def test_refresh_shared(self, m):
+        '''Do leagues of a season keep sharing pro teams after one refreshes them?'''
+        mock_league(m, self.data)
+        first = League(1234, 2018)
+        second = League(1234, 2018)
+        held = first.nflTeams
+        changed = json.loads(json.dumps(self.data['proTeamSchedules']))
+        changed['settings']['proTeams'] = changed['settings']['proTeams'][:1]
+        m.get(PRO_TEAMS_URL + '?view=proTeamSchedules', json=changed)
+        first.refresh(['nflTeams'])
+        self.assertIs(first.nflTeams, held)
+        self.assertIs(second.nflTeams, held)
+        self.assertEqual(len(second.nflTeams.records()), 1)
+
+    def test_schedule_index(self):
+        '''Are matchups found by period and team?'''
+        schedule = ScheduleIndex(self.data['mBoxscore']['schedule'])
+        matchup = schedule.get(2, 3)
+        self.assertEqual(matchup['home']['teamId'], 1)
+        self.assertEqual(len(schedule.period(2)), 2)
+        self.assertEqual(schedule.periods(), [1, 2, 3])
+
+    @requests_mock.Mocker()
+    def test_league_indexes(self, m):
+        '''Are teams and pro teams shared between their keys?'''
+        mock_league(m, self.data)
+        league = League(1234, 2018)
+        self.assertIs(league.teams['{MEMBER-1}'], league.teams[1])
+        self.assertEqual(league.teams[1]['teamName'], 'Billy Smith')
+        self.assertEqual(league.teams[99]['teamName'], 'Bye')
+        self.assertIs(league.nflTeams['Atl'], league.nflTeams[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import asyncio
+import requests_mock
+import unittest
+import json
+from itertools import permutations
+
+
+from espnff.async_league import AsyncLeague
+from espnff.league import League
+from espnff.lineup import assign, lineup_slots, optimal_lineup
+from espnff.player import RosterEntry
+from espnff.registry import player_registry, pro_team_registry
+from tests.stub_server import LEAGUE_URL, mock_league
+
+
+def entry(player_id, slot, points, eligible):
+    return RosterEntry({'lineupSlotId': slot,
+                        'playerPoolEntry': {'appliedStatTotal': points,
+                                            'player': {'id': player_id,
+                                                       'fullName': 'Player %d' % player_id,
+                                                       'proTeamId': 1,
+                                                       'defaultPositionId': 2,
+                                                       'eligibleSlots': eligible,
+                                                       'stats': []}}})
+
+
+class LineupTestCase(unittest.TestCase):
+    '''Test optimal lineup solver'''
+
+    def test_assign(self):
+        '''Does the assignment match brute force over permutations?'''
+        cost = [[4, 1, 3, 7], [2, 0, 5, 1], [3, 2, 2, 6]]
+        best = min(permutations(range(4), 3), key=lambda cols: sum(cost[i][c] for i, c in enumerate(cols)))
+        result = assign(cost)
+        self.assertEqual(sum(cost[i][c] for i, c in enumerate(result)),
+                         sum(cost[i][c] for i, c in enumerate(best)))
+        self.assertEqual(len(set(result)), 3)
+        self.assertRaises(ValueError, assign, [[1], [2]])
+
+    def test_flex(self):
+        '''Is the flex slot filled by the best remaining eligible player?'''
+        roster = {2: 1, 4: 1, 23: 1, 20: 3, 21: 1}
+        self.assertEqual(lineup_slots(roster), [2, 4, 23])
+        entries = [entry(1, 2, 10, [2, 23, 20]),
+                   entry(2, 4, 5, [4, 23, 20]),
+                   entry(3, 23, 1, [6, 23, 20]),
+                   entry(4, 20, 12, [2, 23, 20]),
+                   entry(5, 20, 7, [4, 23, 20]),
+                   RosterEntry({'lineupSlotId': 20, 'playerPoolEntry': {}})]
+        points, lineup = optimal_lineup(entries, roster)
+        self.assertEqual(points, 29)
+        self.assertEqual(dict((slot, e.player_id) for slot, e in lineup),
+                         {'RB': 4, 'WR': 5, 'Flex': 1})
+
+    def test_unfilled_slot(self):
+        '''Are slots without an eligible player left empty?'''
+        points, lineup = optimal_lineup([entry(1, 2, 10, [2, 20])], {0: 1, 2: 1})
+        self.assertEqual(points, 10)
+        self.assertEqual([(slot, e and e.player_id) for slot, e in lineup], [('QB', None), ('RB', 1)])
+
+    @requests_mock.Mocker()
+    def test_league_efficiency(self, m):
+        '''Is bench efficiency computed for every team and week?'''
+        data = json.loads(open('tests/test_league_v3.json').read())
+        player_registry.clear()
+        pro_team_registry.clear()
+        mock_league(m, data)
+        m.get(LEAGUE_URL + '?view=mSettings', json=data['mSettings'])
+        m.get(LEAGUE_URL + '?view=mBoxscore', json=data['mBoxscore'])
+        league = League(1234, 2018)
+        season = league.lineup_efficiency(1, 2)
+        self.assertEqual(sorted(season), [1, 2])
+        for week, teams in season.items():
+            for team, result in teams.items():
+                self.assertEqual(result['week'], week)
+                self.assertGreaterEqual(result['optimalPoints'], result['points'] - 1e-9)
+                self.assertAlmostEqual(result['benchPointsLost'], result['optimalPoints'] - result['points'])
+                self.assertLessEqual(result['efficiency'], 1.0 + 1e-9)
+
+    @requests_mock.Mocker()
+    def test_async_efficiency(self, m):
+        '''Does AsyncLeague.lineup_efficiency await settings and boxscores?'''
+        data = json.loads(open('tests/test_league_v3.json').read())
+        player_registry.clear()
+        pro_team_registry.clear()
+        mock_league(m, data)
+        m.get(LEAGUE_URL + '?view=mSettings', json=data['mSettings'])
+        m.get(LEAGUE_URL + '?view=mBoxscore', json=data['mBoxscore'])
+
+        async def efficiency():
+            league = await AsyncLeague.create(1234, 2018)
+            return await league.lineup_efficiency(1, 2)
+
+        season = asyncio.run(efficiency())
+        player_registry.clear()
+        pro_team_registry.clear()
+        self.assertEqual(season, League(1234, 2018).lineup_efficiency(1, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import requests_mock
+import unittest
+import json
+import copy
+
+
+from espnff.exception import UnknownLeagueException
+from espnff.league import League
+from espnff.live import LiveScoreboard
+from espnff.registry import player_registry, pro_team_registry
+from espnff.transport import Transport
+from tests.stub_server import LEAGUE_URL, mock_league
+
+
+class LiveScoreboardTestCase(unittest.TestCase):
+    '''Test LiveScoreboard poller'''
+
+    def setUp(self):
+        self.data = json.loads(open('tests/test_league_v3.json').read())
+        player_registry.clear()
+        pro_team_registry.clear()
+        self.responses = []
+
+    def boxscore(self, request, context):
+        return self.responses[0] if len(self.responses) == 1 else self.responses.pop(0)
+
+    def league(self, m):
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=mBoxscore', json=self.boxscore)
+        return League(1234, 2018)
+
+    @requests_mock.Mocker()
+    def test_deltas(self, m):
+        '''Are only changed team and player points sent to subscribers?'''
+        league = self.league(m)
+        changed = copy.deepcopy(self.data['mBoxscore'])
+        matchup = [x for x in changed['schedule'] if x['matchupPeriodId'] == 3][0]
+        roster = matchup['home']['rosterForCurrentScoringPeriod']
+        roster['entries'][0]['playerPoolEntry']['appliedStatTotal'] += 6
+        roster['appliedStatTotal'] += 6
+        self.responses = [self.data['mBoxscore'], self.data['mBoxscore'], changed]
+
+        received = []
+        scoreboard = LiveScoreboard(league, 3)
+        scoreboard.subscribe(received.append)
+        first = scoreboard.poll()
+        self.assertTrue(first)
+        self.assertEqual(scoreboard.poll(), [])
+        deltas = scoreboard.poll()
+        team = matchup['home']['teamId']
+        self.assertEqual(set((d['teamId'], d['playerId'], d['delta']) for d in deltas),
+                         set([(team, None, 6), (team, roster['entries'][0]['playerId'], 6)]))
+        self.assertEqual(received, [first, deltas])
+        self.assertEqual(scoreboard.polls, 3)
+
+    @requests_mock.Mocker()
+    def test_error_body(self, m):
+        '''Does every poll of a repeated error body raise instead of returning no deltas?'''
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=mBoxscore', status_code=500, text='<html>')
+        league = League(1234, 2018, transport=Transport(retries=0))
+        scoreboard = LiveScoreboard(league, 3)
+        self.assertRaises(UnknownLeagueException, scoreboard.poll)
+        self.assertRaises(UnknownLeagueException, scoreboard.poll)
+        m.get(LEAGUE_URL + '?view=mBoxscore', json=self.data['mBoxscore'])
+        self.assertTrue(scoreboard.poll())
+        self.assertEqual(scoreboard.polls, 3)
+
+    @requests_mock.Mocker()
+    def test_interval(self, m):
+        '''Is polling fast during games, slow between them and over after the last one?'''
+        league = self.league(m)
+        scoreboard = LiveScoreboard(league, 3, fast=10, slow=600, game_length=3600)
+        kickoff = min(scoreboard._kickoffs)
+        last = max(scoreboard._kickoffs)
+        self.assertEqual(scoreboard.next_interval(kickoff + 60), 10)
+        self.assertEqual(scoreboard.next_interval(kickoff - 100), 100)
+        self.assertEqual(scoreboard.next_interval(kickoff - 86400), 600)
+        self.assertEqual(scoreboard.next_interval(kickoff - 5), 10)
+        self.assertIsNone(scoreboard.next_interval(last + 3600))
+
+    @requests_mock.Mocker()
+    def test_run(self, m):
+        '''Does run sleep between polls and stop when the games are over?'''
+        league = self.league(m)
+        self.responses = [self.data['mBoxscore']]
+        sleeps = []
+        now = [0]
+        scoreboard = LiveScoreboard(league, 3, fast=10, game_length=3600,
+                                    clock=lambda: now[0], sleep=sleeps.append)
+        now[0] = min(scoreboard._kickoffs) + 60
+        scoreboard.run(max_polls=3)
+        self.assertEqual(sleeps, [10, 10, 10])
+        now[0] = max(scoreboard._kickoffs) + 3600
+        scoreboard.run()
+        self.assertEqual(scoreboard.polls, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import requests_mock
+import unittest
+import json
+
+
+from espnff.league import League
+from espnff.player import Player, RosterEntry, StatLine
+from espnff.registry import player_registry, pro_team_registry
+from tests.stub_server import LEAGUE_URL, mock_league
+
+
+class PlayerTestCase(unittest.TestCase):
+    '''Test Player and RosterEntry records'''
+
+    def setUp(self):
+        self.data = json.loads(open('tests/test_league_v3.json').read())
+        player_registry.clear()
+        pro_team_registry.clear()
+
+    def test_player(self):
+        '''Are player fields read into slots and still reachable by key?'''
+        player = Player(self.data['players_wl'][0])
+        self.assertFalse(hasattr(player, '__dict__'))
+        self.assertEqual(player.player_id, 101)
+        self.assertEqual(player.name, 'Player O_101')
+        self.assertEqual(player['player'], player.name)
+        self.assertEqual(player['slots'], (0, 7, 20, 21))
+        self.assertEqual(dict(player), player.to_dict())
+
+    def test_empty_roster_entry(self):
+        '''Is an empty lineup slot read as an empty entry?'''
+        entry = RosterEntry({'lineupSlotId': 20, 'playerPoolEntry': {}})
+        self.assertEqual(entry.slot, 'Bench')
+        self.assertEqual(entry['playerName'], 'empty')
+        self.assertEqual(entry.points, 0)
+
+    @requests_mock.Mocker()
+    def test_league_records(self, m):
+        '''Do the player pool and boxscores hold records?'''
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=mBoxscore', json=self.data['mBoxscore'])
+        m.get(LEAGUE_URL + '?view=mDraftDetail', json=self.data['mDraftDetail'])
+        league = League(1234, 2018)
+        self.assertIsInstance(league.players[101], Player)
+        entry = league.boxscore(1, 1)['playerList'][0]
+        self.assertIsInstance(entry, RosterEntry)
+        self.assertEqual(entry['slot'], 'QB')
+        self.assertEqual(entry['playerPos'], 'QB')
+        pick = league.draftData()[0]
+        self.assertEqual(pick['playerName'], league.players[pick['playerId']].name)
+
+    def test_stat_line(self):
+        '''Are stats held in sorted arrays and still readable as a dict?'''
+        line = StatLine({'scoringPeriodId': 1, 'statSourceId': 0, 'statSplitTypeId': 1,
+                         'appliedTotal': 8.1, 'stats': {'53': 2.0, '3': 81.0, '24': 24.3}})
+        self.assertFalse(hasattr(line, '__dict__'))
+        self.assertEqual(list(line.stat_ids), [3, 24, 53])
+        self.assertEqual(line.get(24), 24.3)
+        self.assertEqual(line.get(4), 0)
+        self.assertEqual(line['stats'], {'3': 81.0, '24': 24.3, '53': 2.0})
+        self.assertEqual(line['appliedTotal'], 8.1)
+
+    @requests_mock.Mocker()
+    def test_lean_boxscore(self, m):
+        '''Does a lean boxscore keep only the week's actual stats of the requested ids?'''
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=mBoxscore', json=self.data['mBoxscore'])
+        league = League(1234, 2018)
+        full = league.boxscore(1, 1)['playerList'][0]
+        self.assertEqual(len(full.stats), 3)
+        lean = league.boxscore(1, 1, lean=True)['playerList'][0]
+        self.assertEqual([(line.period, line.source) for line in lean.stats], [(1, 0)])
+        self.assertEqual(lean.stats[0]['stats'], full.stats[0]['stats'])
+        narrow = league.boxscores(1, stats=[3])[1]['playerList'][0]
+        self.assertEqual(narrow.stats[0]['stats'], {'3': 81.0})
+        self.assertEqual(narrow.stats[0].applied_total, 8.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import requests_mock
+import unittest
+import json
+
+
+from espnff.league import League
+from espnff.query import Query
+from espnff.registry import player_registry, pro_team_registry
+from tests.stub_server import LEAGUE_URL, mock_league
+
+
+class QueryTestCase(unittest.TestCase):
+    '''Test x-fantasy-filter query building'''
+
+    def test_views(self):
+        '''Are unknown views rejected and repeated views sent once?'''
+        self.assertRaises(ValueError, Query, 'mTeams')
+        params, headers = Query('mTeam').build()
+        self.assertEqual(params, {'view': 'mTeam'})
+        self.assertIsNone(headers)
+        params, headers = Query('mTeam', 'mRoster', 'mTeam', scoringPeriodId=3, forTeamId=None).build()
+        self.assertEqual(params, {'view': ['mTeam', 'mRoster'], 'scoringPeriodId': 3})
+        self.assertRaises(ValueError, Query().build)
+
+    def test_filters(self):
+        '''Is the players filter nested and the top level filter merged in?'''
+        query = Query('kona_player_info')
+        query.players.status('FREEAGENT', 'WAIVERS').slots(2).page(25, 50)
+        query.filter.active()
+        params, headers = query.build()
+        self.assertEqual(json.loads(headers['x-fantasy-filter']), {
+            'filterActive': {'value': True},
+            'players': {'filterStatus': {'value': ['FREEAGENT', 'WAIVERS']},
+                        'filterSlotIds': {'value': [2]},
+                        'limit': 25,
+                        'offset': 50}})
+        self.assertRaises(ValueError, query.players.status, 'ROSTERED')
+        self.assertRaises(ValueError, query.players.page, -1)
+
+    def test_sorts(self):
+        '''Do repeated sorts get increasing priorities?'''
+        query = Query('kona_player_info')
+        query.players.sort('appliedTotal', value='102018').sort('percentOwned', ascending=True)
+        filters = json.loads(query.build()[1]['x-fantasy-filter'])['players']
+        self.assertEqual(filters['sortAppliedStatTotal'],
+                         {'sortPriority': 1, 'sortAsc': False, 'value': '102018'})
+        self.assertEqual(filters['sortPercOwned'], {'sortPriority': 2, 'sortAsc': True})
+        self.assertRaises(ValueError, query.players.sort, 'name')
+
+    @requests_mock.Mocker()
+    def test_league_fetch(self, m):
+        '''Does League.fetch send the query's views and header?'''
+        data = json.loads(open('tests/test_league_v3.json').read())
+        player_registry.clear()
+        pro_team_registry.clear()
+        mock_league(m, data)
+        m.get(LEAGUE_URL + '?view=mRoster', json={'teams': []})
+        league = League(1234, 2018)
+        query = Query('mRoster', scoringPeriodId=2)
+        query.players.ids(3139477)
+        self.assertEqual(league.fetch(query), {'teams': []})
+        request = m.request_history[-1]
+        self.assertEqual(request.qs['scoringperiodid'], ['2'])
+        self.assertEqual(json.loads(request.headers['x-fantasy-filter']),
+                         {'players': {'filterIds': {'value': [3139477]}}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+
+from espnff.utils import two_step_dominance as py_two_step_dominance
+from espnff.rankings import PowerRankings, two_step_dominance, np
+
+
+WINS = [[[0, 1, 0], [0, 0, 1], [1, 0, 0]],
+        [[0, 1, 1], [0, 0, 0], [0, 1, 0]],
+        [[0, 0, 0], [1, 0, 1], [1, 0, 0]]]
+SCORES = [[100, 90, 80], [110, 70, 95], [85, 120, 100]]
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class PowerRankingsTestCase(unittest.TestCase):
+    '''Test PowerRankings class'''
+
+    def test_two_step_dominance(self):
+        '''Does the vectorized dominance match utils.two_step_dominance?'''
+        matrix = [[0, 2, 1], [1, 0, 2], [2, 0, 0]]
+        self.assertEqual(list(two_step_dominance(matrix)), py_two_step_dominance(matrix))
+
+    def test_add_week(self):
+        '''Does adding a week match ranking all weeks at once?'''
+        full = PowerRankings(WINS, SCORES)
+        partial = PowerRankings(WINS[:2], SCORES[:2])
+        partial.add_week(WINS[2], SCORES[2])
+        self.assertTrue(np.allclose(full.scores(), partial.scores()))
+        self.assertTrue(np.allclose(full.by_week(), partial.by_week()))
+
+    def test_by_week(self):
+        '''Is each week's row the ranking through that week?'''
+        by_week = PowerRankings(WINS, SCORES).by_week()
+        for week in (1, 2, 3):
+            rankings = PowerRankings(WINS[:week], SCORES[:week])
+            self.assertTrue(np.allclose(by_week[week - 1], rankings.scores()))
+
+    def test_batched_leagues(self):
+        '''Are stacked leagues ranked independently?'''
+        batch = PowerRankings([WINS, WINS[::-1]], [SCORES, SCORES[::-1]])
+        self.assertTrue(np.allclose(batch.scores()[0], PowerRankings(WINS, SCORES).scores()))
+        self.assertEqual(batch.by_week().shape, (2, 3, 3))
+
+    def test_rank(self):
+        '''Are teams returned best first with numeric scores?'''
+        ranked = PowerRankings(WINS, SCORES).rank(['A', 'B', 'C'])
+        self.assertEqual([team for score, team in ranked], ['A', 'B', 'C'])
+        self.assertIsInstance(ranked[0][0], float)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import requests_mock
+import threading
+import unittest
+import json
+
+
+from espnff.exception import PrivateLeagueException, UnknownLeagueException
+from espnff.league import League
+from espnff.ratelimit import RateLimiter, TokenBucket, retry_after
+from espnff.registry import player_registry, pro_team_registry
+from espnff.transport import Transport
+from tests.stub_server import LEAGUE_URL, StubServer, mock_league
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class RateLimitTestCase(unittest.TestCase):
+    '''Test rate limiting and backoff'''
+
+    def setUp(self):
+        self.data = json.loads(open('tests/test_league_v3.json').read())
+        player_registry.clear()
+        pro_team_registry.clear()
+
+    def test_token_bucket(self):
+        '''Are requests beyond the burst spaced by the rate?'''
+        clock = FakeClock()
+        bucket = TokenBucket(rate=4, burst=2, clock=clock, sleep=clock.sleep)
+        waits = [bucket.reserve() for i in range(4)]
+        self.assertEqual(waits, [0, 0, 0.25, 0.5])
+        clock.now += 10
+        self.assertEqual(bucket.reserve(), 0)
+
+    def test_pause(self):
+        '''Does a pause hold back callers and release them one interval apart?'''
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2, burst=4, clock=clock, sleep=clock.sleep)
+        bucket.pause(3)
+        self.assertEqual([bucket.reserve() for i in range(3)], [3, 3.5, 4])
+
+    def test_threads(self):
+        '''Is one bucket shared safely by many threads?'''
+        clock = FakeClock()
+        sleeps = []
+        limiter = RateLimiter(rate=10, burst=1, clock=clock, sleep=sleeps.append)
+        threads = [threading.Thread(target=limiter.acquire, args=('http://a.com/x', )) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(round(s, 6) for s in sleeps), [round(i * 0.1, 6) for i in range(1, 20)])
+        self.assertIsNot(limiter.bucket('http://a.com/y'), limiter.bucket('http://b.com/y'))
+
+    def test_retry_after(self):
+        '''Are both Retry-After forms read?'''
+        class Response(object):
+            def __init__(self, value):
+                self.headers = {'Retry-After': value} if value else {}
+        self.assertEqual(retry_after(Response('7')), 7)
+        self.assertEqual(retry_after(Response('Wed, 21 Oct 2015 07:28:00 GMT')), 0)
+        self.assertIsNone(retry_after(Response(None)))
+
+    @requests_mock.Mocker()
+    def test_backoff(self, m):
+        '''Are 429s retried after Retry-After with every thread on the host held back?'''
+        clock = FakeClock()
+        limiter = RateLimiter(rate=100, clock=clock, sleep=clock.sleep)
+        m.get('http://example.com/a', [{'status_code': 429, 'headers': {'Retry-After': '2'}},
+                                       {'status_code': 503},
+                                       {'json': {'ok': True}}])
+        transport = Transport(rate_limiter=limiter, backoff_factor=0.5)
+        r = transport.get('http://example.com/a')
+        self.assertEqual(r.json(), {'ok': True})
+        self.assertEqual(m.call_count, 3)
+        self.assertEqual([round(s, 6) for s in clock.sleeps], [2.0, 1.0])
+
+    @requests_mock.Mocker()
+    def test_retries_exhausted(self, m):
+        '''Is the last throttled response returned once retries run out?'''
+        m.get('http://example.com/a', status_code=429, headers={'Retry-After': '0'})
+        r = Transport(retries=2).get('http://example.com/a')
+        self.assertEqual(r.status_code, 429)
+        self.assertEqual(m.call_count, 3)
+
+    def test_adapter_leaves_statuses(self):
+        '''Are throttled responses retried only by Transport, over a real connection?'''
+        clock = FakeClock()
+        limiter = RateLimiter(rate=100, clock=clock, sleep=clock.sleep)
+        with StubServer() as server:
+            server.route('/a', None, {}, status=429, headers={'Retry-After': '0.2'})
+            transport = Transport(retries=1, rate_limiter=limiter)
+            r = transport.get(server.url + '/a')
+            self.assertEqual(r.status_code, 429)
+            self.assertEqual(len(server.requests), 2)
+            self.assertEqual([round(s, 6) for s in clock.sleeps], [0.2])
+            transport.close()
+
+    @requests_mock.Mocker()
+    def test_response_status(self, m):
+        '''Are boxscore errors raised from the boxscore response's own status?'''
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=mBoxscore', status_code=401,
+              json={'error': [{'message': 'You are not authorized to view this League.'}]})
+        m.get(LEAGUE_URL + '?view=mDraftDetail', status_code=500, text='<html>')
+        league = League(1234, 2018, transport=Transport(retries=0))
+        self.assertRaises(PrivateLeagueException, league.boxscore, 1, 1)
+        self.assertRaises(UnknownLeagueException, league.draftData)
+
+
+if __name__ == '__main__':
+    unittest.main()
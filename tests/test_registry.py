@@ -0,0 +1,106 @@
+import asyncio
+import requests_mock
+import threading
+import unittest
+import json
+
+
+from espnff.league import League
+from espnff.registry import SeasonRegistry, player_registry, pro_team_registry
+from tests.stub_server import PLAYERS_URL, mock_league
+
+
+class SeasonRegistryTestCase(unittest.TestCase):
+    '''Test SeasonRegistry class'''
+
+    def setUp(self):
+        self.data = json.loads(open('tests/test_league_v3.json').read())
+        player_registry.clear()
+        pro_team_registry.clear()
+
+    def test_lru_eviction(self):
+        '''Is the least recently used season evicted?'''
+        registry = SeasonRegistry(maxsize=2)
+        registry.get(2016, dict)
+        registry.get(2017, dict)
+        registry.get(2016, dict)
+        registry.get(2018, dict)
+        self.assertIn(2016, registry)
+        self.assertNotIn(2017, registry)
+
+    def test_single_load(self):
+        '''Is a season loaded once when requested from many threads?'''
+        registry = SeasonRegistry()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return {}
+        threads = [threading.Thread(target=registry.get, args=(2018, loader)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+
+    def test_single_async_load(self):
+        '''Is a season loaded once by concurrent coroutines, and retried after a failure?'''
+        registry = SeasonRegistry()
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            if len(calls) == 1:
+                raise ValueError('boom')
+            return {'loaded': len(calls)}
+
+        async def load():
+            return await asyncio.gather(*[registry.get_async(2018, loader) for i in range(5)],
+                                        return_exceptions=True)
+        failed = asyncio.run(load())
+        self.assertTrue(all(isinstance(e, ValueError) for e in failed))
+        self.assertNotIn(2018, registry)
+        loaded = asyncio.run(load())
+        self.assertEqual(loaded, [{'loaded': 2}] * 5)
+        self.assertEqual(len(calls), 2)
+
+    def test_refresh_in_place(self):
+        '''Does a refresh update the object every holder references?'''
+        registry = SeasonRegistry()
+        held = registry.get(2018, lambda: {'a': 1})
+        registry.refresh(2018, lambda: {'b': 2})
+        self.assertEqual(held, {'b': 2})
+
+    def test_refresh_never_empty(self):
+        '''Is a refreshed entry never empty or missing a kept key for other threads?'''
+        sizes = []
+
+        class Pool(dict):
+            def update(self, other):
+                sizes.append(('kept' in self, len(self)))
+                dict.update(self, other)
+
+            def __delitem__(self, key):
+                dict.__delitem__(self, key)
+                sizes.append(('kept' in self, len(self)))
+
+        registry = SeasonRegistry()
+        held = registry.get(2018, lambda: Pool(kept=0, old=1, gone=2))
+        self.assertIs(registry.refresh(2018, lambda: {'kept': 1, 'new': 3}), held)
+        self.assertEqual(held, {'kept': 1, 'new': 3})
+        self.assertEqual(sizes, [(True, 3), (True, 3), (True, 2)])
+
+    @requests_mock.Mocker()
+    def test_leagues_share_players(self, m):
+        '''Do leagues of the same season share one player pool?'''
+        mock_league(m, self.data)
+        first = League(1234, 2018)
+        second = League(1234, 2018)
+        self.assertIs(first.players, second.players)
+        players = [r for r in m.request_history if r.url.startswith(PLAYERS_URL)]
+        self.assertEqual(len(players), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
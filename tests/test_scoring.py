@@ -0,0 +1,84 @@
+import asyncio
+import requests_mock
+import unittest
+import json
+
+
+from espnff.async_league import AsyncLeague
+from espnff.league import League
+from espnff.player import StatLine
+from espnff.registry import player_registry, pro_team_registry
+from espnff.scoring import ScoringEngine, np
+from tests.stub_server import LEAGUE_URL, mock_league
+
+
+ITEMS = [{'statId': 3, 'points': 0.04, 'pointsOverrides': {}},
+         {'statId': 24, 'points': 0.1},
+         {'statId': 53, 'points': 1.0, 'pointsOverrides': {'16': 2.0}}]
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class ScoringEngineTestCase(unittest.TestCase):
+    '''Test ScoringEngine class'''
+
+    def setUp(self):
+        self.data = json.loads(open('tests/test_league_v3.json').read())
+        player_registry.clear()
+        pro_team_registry.clear()
+
+    def test_score(self):
+        '''Are raw stats and StatLines scored alike, ignoring unscored stats?'''
+        engine = ScoringEngine(ITEMS)
+        line = {'scoringPeriodId': 1, 'statSourceId': 0, 'stats': {'3': 100.0, '24': 20.0, '53': 1.0, '99': 5.0}}
+        points = engine.score([line, StatLine(line), {'stats': {}}])
+        self.assertEqual([round(p, 6) for p in points], [7.0, 7.0, 0.0])
+
+    def test_overrides(self):
+        '''Are slot overrides applied to players eligible for the slot?'''
+        engine = ScoringEngine(ITEMS)
+        line = {'stats': {'53': 3.0}}
+        self.assertEqual(list(engine.score([line, line], eligible=[(16, 20), (2, 20)])), [6.0, 3.0])
+
+    def test_with_points(self):
+        '''Does a what-if engine change only the given rules?'''
+        engine = ScoringEngine(ITEMS).with_points({24: 0.2, 4: 4.0}, overrides={53: {'16': 3.0}})
+        line = {'stats': {'3': 100.0, '4': 1.0, '24': 20.0, '53': 1.0}}
+        self.assertEqual([round(p, 6) for p in engine.score([line, line], [(16, ), ()])], [15.0, 13.0])
+        self.assertEqual(list(ScoringEngine(ITEMS).stat_ids), [3, 24, 53])
+
+    @requests_mock.Mocker()
+    def test_score_boxscores(self, m):
+        '''Does rescoring a season match scoring each starter on its own?'''
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=mSettings', json=self.data['mSettings'])
+        m.get(LEAGUE_URL + '?view=mBoxscore', json=self.data['mBoxscore'])
+        league = League(1234, 2018)
+        engine = league.scoring_engine()
+        season = league.season_boxscores(1, 2, lean=True)
+        totals = engine.score_boxscores(season)
+        self.assertEqual(sorted(totals), [1, 2])
+        for week, teams in season.items():
+            for team, boxscore in teams.items():
+                starters = [e for e in boxscore['playerList'] if e.slot not in ('Bench', 'IR')]
+                expected = sum(engine.score_entries(starters, week))
+                self.assertAlmostEqual(totals[week][team], expected)
+        self.assertTrue(any(points > 0 for teams in totals.values() for points in teams.values()))
+
+    @requests_mock.Mocker()
+    def test_async_engine(self, m):
+        '''Does AsyncLeague.scoring_engine await the settings it is built from?'''
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=mSettings', json=self.data['mSettings'])
+
+        async def build():
+            league = await AsyncLeague.create(1234, 2018)
+            return await league.scoring_engine(), league
+
+        engine, league = asyncio.run(build())
+        expected = ScoringEngine.from_settings(league.settings)
+        self.assertEqual(list(engine.stat_ids), list(expected.stat_ids))
+        self.assertEqual(list(engine.points), list(expected.points))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import requests_mock
+import unittest
+import json
+
+
+from espnff.league import League
+from espnff.registry import player_registry, pro_team_registry
+from espnff.simulate import playoff_odds, np
+from tests.stub_server import LEAGUE_URL, mock_league
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class PlayoffOddsTestCase(unittest.TestCase):
+    '''Test playoff odds simulation'''
+
+    def setUp(self):
+        self.data = json.loads(open('tests/test_league_v3.json').read())
+        player_registry.clear()
+        pro_team_registry.clear()
+
+    def test_clinched(self):
+        '''Does a team that cannot be caught always make the playoffs?'''
+        played = [(1, 2, 100, 50), (3, 4, 100, 50), (1, 3, 100, 50), (2, 4, 100, 50)]
+        odds = playoff_odds([1, 2, 3, 4], played, [(1, 4)], 1, n_sims=500, seed=1)
+        self.assertEqual(odds[1]['playoffs'], 1.0)
+        self.assertEqual(odds[4]['playoffs'], 0.0)
+
+    def test_probabilities(self):
+        '''Do the seed probabilities sum to one for each seed?'''
+        played = [(1, 2, 110, 90), (3, 4, 95, 105)]
+        remaining = [(1, 3), (2, 4), (1, 4), (2, 3)]
+        for rule in ('Total Points For', 'Total Points Against', 'Head to Head Record'):
+            odds = playoff_odds([1, 2, 3, 4], played, remaining, 2, rule, n_sims=2000, seed=2)
+            self.assertAlmostEqual(sum(team['playoffs'] for team in odds.values()), 2.0)
+            for seed in (0, 1):
+                self.assertAlmostEqual(sum(team['seeds'][seed] for team in odds.values()), 1.0)
+
+    def test_seeded(self):
+        '''Is a seeded simulation reproducible across chunks and processes?'''
+        played = [(1, 2, 110, 90), (3, 4, 95, 105)]
+        remaining = [(1, 3), (2, 4)]
+        first = playoff_odds([1, 2, 3, 4], played, remaining, 2, n_sims=25000, seed=3)
+        second = playoff_odds([1, 2, 3, 4], played, remaining, 2, n_sims=25000, seed=3, processes=2)
+        self.assertEqual(first, second)
+
+    @requests_mock.Mocker()
+    def test_league_playoff_odds(self, m):
+        '''Does League.playoff_odds read settings and the schedule?'''
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=mSettings', json=self.data['mSettings'])
+        m.get(LEAGUE_URL + '?view=mMatchupScore', json=self.data['mMatchupScore'])
+        league = League(1234, 2018)
+        odds = league.playoff_odds(n_sims=1000, seed=4)
+        self.assertEqual(sorted(odds), [1, 2, 3, 4])
+        self.assertEqual(len(odds[1]['seeds']), league.settings.playoff_team_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
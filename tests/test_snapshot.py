@@ -0,0 +1,175 @@
+import asyncio
+import requests_mock
+import unittest
+import json
+import os
+import shutil
+import tempfile
+import time
+
+
+from espnff.async_league import AsyncLeague
+from espnff.exception import SnapshotException
+from espnff.league import League
+from espnff.registry import player_registry, pro_team_registry
+from espnff.snapshot import Snapshot
+from tests.stub_server import LEAGUE_URL, mock_league
+
+
+class CurrentLeague(League):
+    '''League of a season that is still being played'''
+    def _season_ttl(self):
+        return None
+
+
+class SnapshotTestCase(unittest.TestCase):
+    '''Test League snapshots'''
+
+    def setUp(self):
+        self.data = json.loads(open('tests/test_league_v3.json').read())
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'league.snap')
+        player_registry.clear()
+        pro_team_registry.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def _league(self, m, cls=League):
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=mSettings', json=self.data['mSettings'])
+        m.get(LEAGUE_URL + '?view=mBoxscore', json=self.data['mBoxscore'])
+        league = cls(1234, 2018, keep_boxscores=True)
+        league.settings
+        league.boxscores(1)
+        league.boxscores(3)
+        league.snapshot(self.path)
+        player_registry.clear()
+        pro_team_registry.clear()
+        return league
+
+    @requests_mock.Mocker()
+    def test_round_trip(self, m):
+        '''Is a league restored from its snapshot without any request?'''
+        league = self._league(m)
+        requests = m.call_count
+        for mmap in (False, True):
+            player_registry.clear()
+            pro_team_registry.clear()
+            restored = League.from_snapshot(self.path, mmap=mmap)
+            self.assertEqual((restored.league_id, restored.year, restored.current_week), (1234, 2018, 3))
+            self.assertEqual(restored.teams.records(), league.teams.records())
+            self.assertEqual(restored.players, league.players)
+            self.assertEqual(restored.nflTeams.records(), league.nflTeams.records())
+            self.assertEqual(vars(restored.settings), vars(league.settings))
+            self.assertTrue(restored.keep_boxscores)
+            self.assertEqual(restored.boxscores(1), league.boxscores(1))
+        self.assertEqual(m.call_count, requests)
+        self.assertIs(player_registry.peek(2018), restored.players)
+
+    @requests_mock.Mocker()
+    def test_cached_boxscores(self, m):
+        '''Are only weeks that were over when fetched served from the cache?'''
+        self._league(m)
+        restored = League.from_snapshot(self.path)
+        self.assertEqual(sorted(restored.boxscore_cache), [1, 3])
+        self.assertEqual([restored.boxscore_cache[week][0] for week in (1, 3)], [True, False])
+        requests = m.call_count
+        restored.boxscores(1)
+        self.assertEqual(m.call_count, requests)
+        restored.boxscores(3)
+        restored.boxscores(1, lean=True)
+        League.from_snapshot(self.path, keep_boxscores=False).boxscores(1)
+        self.assertEqual(m.call_count, requests + 3)
+
+    @requests_mock.Mocker()
+    def test_boxscores_not_kept(self, m):
+        '''Are boxscores only kept, and snapshotted, when the league asks for it?'''
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=mBoxscore', json=self.data['mBoxscore'])
+        league = League(1234, 2018)
+        league.boxscores(1)
+        league.boxscores(1)
+        self.assertEqual(league.boxscore_cache, {})
+        self.assertEqual(m.call_count, 5)
+        league.snapshot(self.path)
+        restored = League.from_snapshot(self.path)
+        self.assertEqual((restored.boxscore_cache, restored.keep_boxscores), ({}, False))
+
+    @requests_mock.Mocker()
+    def test_async(self, m):
+        '''Does AsyncLeague restore a snapshot and await its refresh?'''
+        self._league(m, CurrentLeague)
+        requests = m.call_count
+
+        async def restore():
+            restored = await AsyncLeague.from_snapshot(self.path)
+            self.assertEqual(m.call_count, requests)
+            self.assertEqual(len(await restored.boxscores(1)), 4)
+            self.assertEqual(m.call_count, requests)
+            restored._season_ttl = lambda: None
+            restored.fetched['settings'] -= 7200
+            return restored, await restored.refresh()
+
+        restored, refreshed = asyncio.run(restore())
+        self.assertIsInstance(restored, AsyncLeague)
+        self.assertEqual(refreshed, ['settings', 'boxscores'])
+        views = sorted(r.qs['view'][0] for r in m.request_history[requests:])
+        self.assertEqual(views, ['mboxscore', 'msettings'])
+        self.assertEqual(restored.stale_sections(), ['boxscores'])
+
+    @requests_mock.Mocker()
+    def test_stale_sections(self, m):
+        '''Are only old sections and unfinished weeks of a current season refreshed?'''
+        self._league(m, CurrentLeague)
+        restored = CurrentLeague.from_snapshot(self.path)
+        self.assertEqual(restored.stale_sections(), ['boxscores'])
+        restored.fetched['players'] -= 7200
+        self.assertEqual(restored.stale_sections(), ['players', 'boxscores'])
+
+        requests = m.call_count
+        self.assertEqual(restored.refresh(), ['players', 'boxscores'])
+        views = [r.qs['view'][0] for r in m.request_history[requests:]]
+        self.assertEqual(views, ['players_wl', 'mboxscore'])
+        self.assertGreater(restored.fetched['players'], time.time() - 60)
+
+        past = League.from_snapshot(self.path)
+        past.fetched['players'] -= 7200
+        self.assertEqual(past.stale_sections(), [])
+
+    @requests_mock.Mocker()
+    def test_refresh_on_load(self, m):
+        '''Does max_age refresh stale sections while restoring?'''
+        self._league(m, CurrentLeague)
+        requests = m.call_count
+        restored = CurrentLeague.from_snapshot(self.path, max_age=0)
+        views = sorted(r.qs['view'][0] for r in m.request_history[requests:])
+        self.assertEqual(views, ['mboxscore', 'msettings', 'mteam', 'players_wl', 'proteamschedules'])
+        self.assertEqual(restored.stale_sections(max_age=3600), ['boxscores'])
+
+    def test_sections(self):
+        '''Is the section table read before any section is loaded?'''
+        with requests_mock.Mocker() as m:
+            self._league(m)
+        snapshot = Snapshot(self.path, mmap=True)
+        self.assertEqual(sorted(snapshot.sections),
+                         ['boxscores', 'league', 'nflTeams', 'players', 'settings'])
+        self.assertEqual((snapshot.league_id, snapshot.year), (1234, 2018))
+        self.assertEqual(snapshot.load('league')['currentWeek'], 3)
+        snapshot.close()
+
+    def test_invalid_file(self):
+        '''Are other files and other format versions rejected?'''
+        with open(self.path, 'wb') as f:
+            f.write(b'not a snapshot')
+        self.assertRaises(SnapshotException, League.from_snapshot, self.path)
+        with requests_mock.Mocker() as m:
+            self._league(m)
+        with open(self.path, 'r+b') as f:
+            f.seek(8)
+            f.write(b'\xff\x00')
+        self.assertRaises(SnapshotException, League.from_snapshot, self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
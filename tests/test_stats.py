@@ -0,0 +1,78 @@
+import requests_mock
+import unittest
+import json
+
+
+from espnff.cache import ResponseCache
+from espnff.client import ESPNFF
+from espnff.league import League
+from espnff.registry import player_registry, pro_team_registry
+from espnff.stats import Stats, RequestTiming
+from espnff.transport import Transport
+from tests.stub_server import LEAGUE_URL, mock_league
+
+
+class StatsTestCase(unittest.TestCase):
+    '''Test request instrumentation'''
+
+    def setUp(self):
+        self.data = json.loads(open('tests/test_league_v3.json').read())
+        player_registry.clear()
+        pro_team_registry.clear()
+
+    @requests_mock.Mocker()
+    def test_league_hooks(self, m):
+        '''Does every construction request reach the hooks with its phases?'''
+        mock_league(m, self.data)
+        timings = []
+        stats = Stats()
+        league = League(1234, 2018, hooks=[timings.append], stats=stats)
+        self.assertIs(league.stats, stats)
+        self.assertEqual([t.view for t in timings], ['mTeam', 'players_wl', 'proTeamSchedules'])
+        self.assertEqual(stats.timings, timings)
+        for timing in timings:
+            self.assertEqual((timing.league_id, timing.year, timing.status), (1234, 2018, 200))
+            self.assertGreater(timing.bytes, 0)
+            self.assertGreater(timing.decode, 0)
+            self.assertGreaterEqual(timing.transform, 0)
+            self.assertFalse(timing.cache_hit)
+        players = stats.summary()['players_wl']
+        self.assertEqual(players['requests'], 1)
+        self.assertEqual(players['bytes'], timings[1].bytes)
+        self.assertAlmostEqual(players['total'], timings[1].total)
+
+    @requests_mock.Mocker()
+    def test_cache_and_retries(self, m):
+        '''Are cache hits and retries counted?'''
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=mBoxscore', [{'status_code': 503, 'headers': {'Retry-After': '0'}},
+                                               {'json': self.data['mBoxscore']}])
+        stats = Stats()
+        transport = Transport(cache=ResponseCache(), backoff_factor=0)
+        league = League(1234, 2018, transport=transport, stats=stats)
+        league.boxscores(1)
+        league.boxscores(1)
+        boxscores = [t for t in stats.timings if t.view == 'mBoxscore']
+        self.assertEqual([(t.retries, t.cache_hit) for t in boxscores], [(1, False), (0, True)])
+        self.assertEqual(boxscores[1].bytes, 0)
+        self.assertEqual(stats.summary()['mBoxscore']['cacheHits'], 1)
+
+    @requests_mock.Mocker()
+    def test_client_stats(self, m):
+        '''Do leagues from one client share its stats, grouped by league?'''
+        mock_league(m, self.data)
+        stats = Stats()
+        ESPNFF(stats=stats).get_league(1234, 2018)
+        self.assertEqual(list(stats.summary(by='league_id')), [1234])
+        self.assertEqual(stats.summary(by='league_id')[1234]['requests'], 3)
+
+    def test_timing(self):
+        '''Is the total the sum of the phases?'''
+        timing = RequestTiming('http://example.com', 'mTeam', connect=0.5, transfer=0.25)
+        timing.decode = 0.125
+        self.assertEqual(timing.total, 0.875)
+        self.assertEqual(timing.to_dict()['view'], 'mTeam')
+
+
+if __name__ == '__main__':
+    unittest.main()
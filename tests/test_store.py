@@ -0,0 +1,115 @@
+import requests_mock
+import unittest
+import json
+
+
+from espnff.league import League
+from espnff.registry import player_registry, pro_team_registry
+from espnff.store import LeagueStore
+from tests.stub_server import LEAGUE_URL, mock_league
+
+
+class LeagueStoreTestCase(unittest.TestCase):
+    '''Test LeagueStore class'''
+
+    def setUp(self):
+        self.data = json.loads(open('tests/test_league_v3.json').read())
+        player_registry.clear()
+        pro_team_registry.clear()
+        self.store = LeagueStore()
+
+    def tearDown(self):
+        self.store.close()
+
+    def page(self, request, context):
+        '''Serves the slice of players asked for in the filter header, sorted if asked'''
+        filters = json.loads(request.headers['x-fantasy-filter'])['players']
+        players = self.data['kona_playercard']['players']
+        if 'sortTransactionDate' in filters:
+            players = sorted(players, key=lambda player: max(t['proposedDate'] for t in player['transactions']),
+                             reverse=not filters['sortTransactionDate']['sortAsc'])
+        return {'players': players[filters['offset']:filters['offset'] + filters['limit']]}
+
+    def views(self, m, view):
+        return [r for r in m.request_history if r.qs.get('view') == [view.lower()]]
+
+    def mock(self, m):
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=mBoxscore', json=self.data['mBoxscore'])
+        m.get(LEAGUE_URL + '?view=mDraftDetail', json=self.data['mDraftDetail'])
+        m.get(LEAGUE_URL + '?view=kona_playercard', json=self.page)
+
+    @requests_mock.Mocker()
+    def test_sync(self, m):
+        '''Is every record of the league written on the first sync?'''
+        self.mock(m)
+        league = League(1234, 2018)
+        result = self.store.sync(league)
+        self.assertEqual(result['weeks'], [1, 2, 3])
+        self.assertEqual(result['transactions'], 4)
+        self.assertEqual(result['picks'], len(self.data['mDraftDetail']['draftDetail']['picks']))
+        boxscore = league.boxscore(1, 1)
+        stored = self.store.boxscore(1234, 2018, 1, 1)
+        self.assertEqual(sorted(row['playerId'] for row in stored),
+                         sorted(e.player_id for e in boxscore['playerList'] if e.player_id != 'empty'))
+        self.assertEqual(self.store.matchups(1234, 2018, 1)[0]['teamPoints'], boxscore['teamPoints'])
+        self.assertEqual([t['tranId'] for t in self.store.transactions(1234, 2018)],
+                         ['tran-3', 'tran-2', 'tran-1', 'tran-0'])
+
+    @requests_mock.Mocker()
+    def test_incremental_sync(self, m):
+        '''Does a second sync only fetch the open week and new transactions?'''
+        self.mock(m)
+        league = League(1234, 2018)
+        self.store.sync(league)
+        boxscore_requests = len(self.views(m, 'mBoxscore'))
+        draft_requests = len(self.views(m, 'mDraftDetail'))
+        result = self.store.sync(league)
+        self.assertEqual(result['weeks'], [3])
+        self.assertEqual(result['transactions'], 0)
+        self.assertEqual(len(self.views(m, 'mBoxscore')), boxscore_requests + 1)
+        self.assertEqual(len(self.views(m, 'mDraftDetail')), draft_requests)
+        self.assertEqual(len(self.store.boxscore(1234, 2018, 3, 1)),
+                         len([e for e in league.boxscore(3, 1)['playerList'] if e.player_id != 'empty']))
+
+    @requests_mock.Mocker()
+    def test_new_transaction_on_later_page(self, m):
+        '''Is a new transaction of a player served after the stored ones synced?'''
+        self.mock(m)
+        league = League(1234, 2018)
+        iter_transactions = league.iter_transactions
+        league.iter_transactions = lambda since=None: iter_transactions(since, page_size=1)
+        self.store.sync(league, include=('transactions', ))
+        # the player whose first transaction is the oldest stored makes a new one
+        player = self.data['kona_playercard']['players'][0]
+        player['transactions'].append(dict(player['transactions'][0], id='tran-4',
+                                           proposedDate=1537000004000, status='PENDING'))
+        self.assertEqual(self.store.sync(league, include=('transactions', ))['transactions'], 1)
+        player['transactions'][-1]['status'] = 'EXECUTED'
+        self.assertEqual(self.store.sync(league, include=('transactions', ))['transactions'], 1)
+        self.assertEqual([(t['tranId'], t['tranStatus']) for t in self.store.transactions(1234, 2018)][:2],
+                         [('tran-4', 'EXECUTED'), ('tran-3', 'EXECUTED')])
+        self.assertEqual(self.store.sync(league, include=('transactions', ))['transactions'], 0)
+
+    @requests_mock.Mocker()
+    def test_resume(self, m):
+        '''Does a sync interrupted mid-season resume at the first missing week?'''
+        self.mock(m)
+        league = League(1234, 2018)
+        boxscores = league.boxscores
+        calls = []
+
+        def failing(week, **kwargs):
+            calls.append(week)
+            if week == 2:
+                raise IOError('connection reset')
+            return boxscores(week, **kwargs)
+        league.boxscores = failing
+        self.assertRaises(IOError, self.store.sync, league)
+        league.boxscores = boxscores
+        self.assertEqual(self.store.missing_weeks(league), [2, 3])
+        self.assertEqual(self.store.sync(league)['weeks'], [2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
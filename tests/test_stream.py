@@ -0,0 +1,53 @@
+import requests_mock
+import unittest
+import json
+
+
+from espnff.league import League
+from espnff.registry import player_registry, pro_team_registry
+from espnff.stream import iter_json_array
+from tests.stub_server import mock_league
+
+
+def chunked(data, size):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+class StreamTestCase(unittest.TestCase):
+    '''Test streaming JSON parsing'''
+
+    def setUp(self):
+        self.data = json.loads(open('tests/test_league_v3.json').read())
+        player_registry.clear()
+        pro_team_registry.clear()
+
+    def test_chunk_boundaries(self):
+        '''Are elements decoded correctly however the bytes are split?'''
+        array = [{'id': i, 'name': u'José %d' % i, 'slots': [0, 20]} for i in range(20)] + [7, 1.5, None]
+        body = json.dumps(array).encode('utf-8')
+        for size in (1, 3, 17, len(body)):
+            self.assertEqual(list(iter_json_array(chunked(body, size))), array)
+
+    def test_empty_array(self):
+        '''Does an empty array yield nothing?'''
+        self.assertEqual(list(iter_json_array([b' [ ] '])), [])
+
+    def test_invalid(self):
+        '''Do truncated or non-array payloads raise ValueError?'''
+        for body in (b'[{"id": 1},', b'{"id": 1}', b'[1 2]'):
+            with self.assertRaises(ValueError):
+                list(iter_json_array([body]))
+
+    @requests_mock.Mocker()
+    def test_streamed_players(self, m):
+        '''Does the streamed player pool match the fully decoded one?'''
+        mock_league(m, self.data)
+        streamed = League(1234, 2018, stream_players=True).players
+        player_registry.clear()
+        pro_team_registry.clear()
+        decoded = League(1234, 2018).players
+        self.assertEqual(streamed, decoded)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import requests_mock
+import unittest
+import json
+
+
+from espnff.league import League
+from espnff.registry import player_registry, pro_team_registry
+from tests.stub_server import LEAGUE_URL, mock_league
+
+
+class TransactionsTestCase(unittest.TestCase):
+    '''Test paginated transactions'''
+
+    def setUp(self):
+        self.data = json.loads(open('tests/test_league_v3.json').read())
+        player_registry.clear()
+        pro_team_registry.clear()
+
+    def page(self, request, context):
+        '''Serves the slice of players asked for in the filter header, sorted if asked'''
+        filters = json.loads(request.headers['x-fantasy-filter'])['players']
+        players = self.data['kona_playercard']['players']
+        if 'sortTransactionDate' in filters:
+            players = sorted(players, key=lambda player: max(t['proposedDate'] for t in player['transactions']),
+                             reverse=not filters['sortTransactionDate']['sortAsc'])
+        return {'players': players[filters['offset']:filters['offset'] + filters['limit']]}
+
+    def pages(self, m):
+        return [r for r in m.request_history if r.qs.get('view') == ['kona_playercard']]
+
+    @requests_mock.Mocker()
+    def test_all_pages(self, m):
+        '''Are all pages fetched and every transaction returned?'''
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=kona_playercard', json=self.page)
+        league = League(1234, 2018)
+        transactions = list(league.iter_transactions(page_size=3))
+        self.assertEqual([t['tranId'] for t in transactions], ['tran-3', 'tran-2', 'tran-1', 'tran-0'])
+        self.assertEqual(len(self.pages(m)), 2)
+        self.assertEqual(transactions[0]['tranParts'][0]['toTeam'], 'Dana Park')
+
+    @requests_mock.Mocker()
+    def test_since(self, m):
+        '''Does iteration stop at a previously seen transaction?'''
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=kona_playercard', json=self.page)
+        league = League(1234, 2018)
+        transactions = list(league.iter_transactions(since=1537000002000, page_size=1))
+        self.assertEqual([t['tranId'] for t in transactions], ['tran-3'])
+        self.assertEqual(len(self.pages(m)), 2)
+
+    @requests_mock.Mocker()
+    def test_newer_on_later_page(self, m):
+        '''Are transactions sorted across pages and newer ones on later pages kept?'''
+        players = self.data['kona_playercard']['players']
+        # the first player to come back also holds the oldest transaction
+        late = dict(players[3]['transactions'][0], id='tran-4', proposedDate=1537000004000)
+        old = dict(players[3]['transactions'][0], id='tran-old', proposedDate=1536000000000)
+        players[3]['transactions'] = [late, old]
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=kona_playercard', json=self.page)
+        league = League(1234, 2018)
+        self.assertEqual([t['tranId'] for t in league.transactions()],
+                         ['tran-4', 'tran-2', 'tran-1', 'tran-0', 'tran-old'])
+        transactions = list(league.iter_transactions(since=1536000000000, page_size=1))
+        self.assertEqual([t['tranId'] for t in transactions], ['tran-4', 'tran-2', 'tran-1', 'tran-0'])
+        filters = json.loads(self.pages(m)[0].headers['x-fantasy-filter'])['players']
+        self.assertFalse(filters['sortTransactionDate']['sortAsc'])
+
+    @requests_mock.Mocker()
+    def test_transactions(self, m):
+        '''Does transactions() return the list?'''
+        mock_league(m, self.data)
+        m.get(LEAGUE_URL + '?view=kona_playercard', json=self.page)
+        league = League(1234, 2018)
+        self.assertEqual(len(league.transactions()), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import requests_mock
+import unittest
+import json
+
+
+from espnff.client import ESPNFF
+from espnff.league import League
+from espnff.registry import player_registry, pro_team_registry
+from espnff.transport import Transport
+from tests.stub_server import mock_league
+
+
+class TransportTestCase(unittest.TestCase):
+    '''Test Transport class'''
+
+    def setUp(self):
+        self.data = json.loads(open('tests/test_league_v3.json').read())
+        player_registry.clear()
+        pro_team_registry.clear()
+
+    def test_pool_settings(self):
+        '''Are the pool size and retry policy mounted on the session?'''
+        transport = Transport(pool_size=4, retries=2)
+        adapter = transport.session.get_adapter('https://fantasy.espn.com')
+        self.assertEqual(adapter._pool_maxsize, 4)
+        self.assertEqual(adapter.max_retries.total, 2)
+
+    def test_injected_session(self):
+        '''Is an injected session used as is?'''
+        session = object()
+        transport = Transport(session=session)
+        self.assertIs(transport.session, session)
+
+    @requests_mock.Mocker()
+    def test_league_transport(self, m):
+        '''Does a League send its requests through the given transport?'''
+        mock_league(m, self.data)
+        transport = Transport()
+        league = League(1234, 2018, transport=transport)
+        self.assertIs(league.transport, transport)
+        self.assertEqual(m.call_count, 3)
+
+    @requests_mock.Mocker()
+    def test_client_shares_transport(self, m):
+        '''Do all leagues from one client share the same transport?'''
+        mock_league(m, self.data)
+        client = ESPNFF(pool_size=2)
+        first = client.get_league(1234, 2018)
+        second = client.get_league(1234, 2018)
+        self.assertIs(first.transport, client.transport)
+        self.assertIs(second.transport, client.transport)
+
+
+if __name__ == '__main__':
+    unittest.main()